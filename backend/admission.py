@@ -0,0 +1,154 @@
+import os
+import time
+import asyncio
+import logging
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+
+import metrics
+import tracing
+
+logger = logging.getLogger("SkyDashboard.Admission")
+
+# Upstream calls allowed in flight across the whole process; 0 disables admission control
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", 16))
+
+# Highest priority first. A free slot always goes to the first lane with waiters.
+LANES = ("interactive", "prefetch", "background")
+# Lanes a client may ask for with the X-SkyDash-Priority header; it can only lower priority
+CLIENT_LANES = {"prefetch", "background"}
+
+# (lane, endpoint) for upstream calls made in the current context. The endpoint
+# is a label, or a request scope whose route is resolved once routing has run.
+_context = contextvars.ContextVar("skydash_lane", default=("background", "-"))
+
+
+@contextmanager
+def lane(name, endpoint="-"):
+    """Run a block's upstream calls in the given lane, queued under `endpoint`"""
+    token = _context.set((name, endpoint))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_lane():
+    """(lane, endpoint label) for the current context"""
+    name, endpoint = _context.get()
+    if isinstance(endpoint, dict):
+        # A request scope: label by route template to keep the label set bounded
+        route = endpoint.get("route")
+        endpoint = route.path if route else "unmatched"
+    return name, endpoint
+
+
+class AdmissionController:
+    """Process-wide concurrency cap for upstream calls with priority lanes.
+
+    Waiters queue per lane and, within a lane, per endpoint. A released slot
+    goes straight to the next waiter: the highest lane with anyone waiting,
+    round-robin over that lane's endpoints, so one board fan-out of 20 calls
+    cannot hold up every other endpoint's single call.
+    """
+
+    def __init__(self, limit=UPSTREAM_MAX_CONCURRENCY):
+        self.limit = limit
+        self.active = 0
+        self._queues = {name: OrderedDict() for name in LANES}  # lane -> endpoint -> deque of futures
+
+    def waiting(self):
+        return sum(len(q) for queues in self._queues.values() for q in queues.values())
+
+    def _enqueue(self, name, endpoint):
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[name].setdefault(endpoint, deque()).append(waiter)
+        metrics.upstream_queue_depth.inc(name, endpoint)
+        return waiter
+
+    def _dequeue(self, name, endpoint, waiter):
+        queue = self._queues[name].get(endpoint)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[name][endpoint]
+        metrics.upstream_queue_depth.dec(name, endpoint)
+
+    def _hand_over(self):
+        """Give a free slot to the next waiter; False if nobody is waiting"""
+        for name in LANES:
+            queues = self._queues[name]
+            while queues:
+                endpoint, queue = next(iter(queues.items()))
+                waiter = queue.popleft()
+                metrics.upstream_queue_depth.dec(name, endpoint)
+                # Rotate the endpoint to the back of its lane
+                del queues[endpoint]
+                if queue:
+                    queues[endpoint] = queue
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return True
+        return False
+
+    async def acquire(self, name="background", endpoint="-"):
+        if name not in self._queues:
+            name = "background"
+        if self.active < self.limit and not self.waiting():
+            self.active += 1
+            return
+        waiter = self._enqueue(name, endpoint)
+        started = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us just as we were cancelled; pass it on
+                self.release()
+            else:
+                self._dequeue(name, endpoint, waiter)
+            raise
+        waited = time.perf_counter() - started
+        metrics.upstream_queue_wait.observe(waited, name)
+        tracing.record("queue", waited * 1000, f"{name} {endpoint}")
+
+    def release(self):
+        # The slot passes to the next waiter as is; only free it when nobody wants it
+        if not self._hand_over():
+            self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, name="background", endpoint="-"):
+        await self.acquire(name, endpoint)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class AdmissionTransport(httpx.AsyncBaseTransport):
+    """Admits each upstream request through the controller in its context's lane.
+
+    The slot is held until the response headers arrive; bodies are read right
+    after by the client and Jira pages are small, so that is close enough.
+    """
+
+    def __init__(self, transport, controller):
+        self._transport = transport
+        self.controller = controller
+
+    async def handle_async_request(self, request):
+        if self.controller.limit <= 0:
+            return await self._transport.handle_async_request(request)
+        async with self.controller.slot(*current_lane()):
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+controller = AdmissionController()
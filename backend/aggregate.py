@@ -0,0 +1,84 @@
+import heapq
+
+
+class Count:
+    """Issues counted per group key.
+
+    `key(issue)` names the issue's group; `keys(issue)` instead returns several
+    (one issue, many components). `where(issue)` limits which issues count.
+    Groups keep the order they were first seen in.
+    """
+
+    def __init__(self, key=None, keys=None, where=None):
+        if (key is None) == (keys is None):
+            raise ValueError("Pass exactly one of key or keys")
+        self.key = key
+        self.keys = keys
+        self.where = where
+        self.counts = {}
+
+    def add(self, issue):
+        if self.where is not None and not self.where(issue):
+            return
+        counts = self.counts
+        if self.key is not None:
+            group = self.key(issue)
+            counts[group] = counts.get(group, 0) + 1
+        else:
+            for group in self.keys(issue):
+                counts[group] = counts.get(group, 0) + 1
+
+    def result(self):
+        """[(group, count), ...] in first-seen order"""
+        return list(self.counts.items())
+
+
+class TopK(Count):
+    """The k largest groups of a Count, largest first; ties keep first-seen order"""
+
+    def __init__(self, k, key=None, keys=None, where=None):
+        super().__init__(key, keys, where)
+        self.k = k
+
+    def result(self):
+        return heapq.nlargest(self.k, self.counts.items(), key=lambda item: item[1])
+
+
+class Sum(Count):
+    """`value(issue)` summed per group key instead of counting; a None value adds nothing"""
+
+    def __init__(self, value, key=None, keys=None, where=None):
+        super().__init__(key, keys, where)
+        self.value = value
+
+    def add(self, issue):
+        if self.where is not None and not self.where(issue):
+            return
+        amount = self.value(issue)
+        if amount is None:
+            return
+        totals = self.counts
+        for group in (self.key(issue),) if self.key is not None else self.keys(issue):
+            totals[group] = totals.get(group, 0) + amount
+
+
+class Aggregation:
+    """Several named aggregates computed in one pass over streamed pages of issues.
+
+    Only the group counts are kept, never the issues, so memory depends on the
+    number of groups rather than the number of issues fetched.
+    """
+
+    def __init__(self, **aggregates):
+        self.aggregates = aggregates
+        self.issues = 0
+
+    def add_page(self, issues):
+        aggregates = self.aggregates.values()
+        for issue in issues:
+            for aggregate in aggregates:
+                aggregate.add(issue)
+        self.issues += len(issues)
+
+    def results(self):
+        return {name: aggregate.result() for name, aggregate in self.aggregates.items()}
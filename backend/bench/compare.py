@@ -0,0 +1,61 @@
+"""Compare two bench/run.py result files, e.g. from two commits.
+
+Usage (from backend/):
+    python -m bench.compare baseline.json candidate.json [--threshold 10]
+
+Exits non-zero when any endpoint's cold or warm p50 regressed by more than
+--threshold percent, or when it makes more upstream calls than before.
+"""
+import argparse
+import json
+import sys
+
+
+def _change(old, new):
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p50 regression in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"baseline {baseline.get('commit')}  ->  candidate {candidate.get('commit')}")
+    print(f"{'endpoint':50} {'cold p50':>18} {'warm p50':>18} {'upstream calls':>16}")
+
+    regressions = []
+    for path, new in candidate["endpoints"].items():
+        old = baseline["endpoints"].get(path)
+        if not old:
+            print(f"{path:50} (new)")
+            continue
+        cold = _change(old["cold"]["p50"], new["cold"]["p50"])
+        warm = _change(old["warm"]["p50"], new["warm"]["p50"])
+        calls = f"{old['upstream_calls_cold']} -> {new['upstream_calls_cold']}"
+        print(f"{path:50} {new['cold']['p50']:9.1f}ms {cold:+6.1f}% {new['warm']['p50']:9.2f}ms {warm:+6.1f}% {calls:>16}")
+
+        if cold > args.threshold:
+            regressions.append(f"{path}: cold p50 {cold:+.1f}%")
+        if warm > args.threshold:
+            regressions.append(f"{path}: warm p50 {warm:+.1f}%")
+        if new["upstream_calls_cold"] > old["upstream_calls_cold"]:
+            regressions.append(f"{path}: upstream calls {calls}")
+
+    if regressions:
+        print("\nRegressions:")
+        for r in regressions:
+            print(f"  {r}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
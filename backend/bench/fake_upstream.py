@@ -0,0 +1,465 @@
+"""Local stand-in for the Jira Cloud and Google Sheets APIs used by the backend.
+
+Serves a deterministic synthetic dataset with configurable size and injected
+latency, and counts every call so benchmarks can report upstream load.
+
+Usage (from backend/):
+    python -m bench.fake_upstream --port 8765 --issues 2000 --latency-ms 80
+"""
+import argparse
+import asyncio
+import random
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+STATUSES = [
+    ("10000", "To Do", "To Do"),
+    ("3", "In Progress", "In Progress"),
+    ("10101", "In QA", "In Progress"),
+    ("10001", "Done", "Done"),
+]
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+RESOLUTIONS = ["Done", "Done", "Done", "Invalid", "Duplicate", "Won't Fix"]
+COMPONENTS = ["Firmware", "Portal", "Mobile", "API", "Billing"]
+EPIC_IDS = [84757, 84760, 84756, 84759, 84758, 84793]
+PROJECTS = [("84742", "SSSS", "Sky Smart Solar"), ("84743", "JI", "JI Platform")]
+PAGE_LIMIT = 100
+# Histories a search embeds per issue with expand=changelog, as on Jira Cloud
+CHANGELOG_EMBED_LIMIT = 100
+SPRINT_FIELD = "customfield_10020"
+
+
+def _person(name):
+    slug = name.lower().replace(" ", ".")
+    return {
+        "self": f"https://example.atlassian.net/rest/api/3/user?accountId={slug}",
+        "accountId": slug,
+        "displayName": name,
+        "emailAddress": f"{slug}@example.com",
+        "avatarUrls": {size: f"https://avatar.example.com/{slug}/{size}.png" for size in ("16x16", "24x24", "32x32", "48x48")},
+        "active": True,
+        "timeZone": "Asia/Karachi",
+    }
+
+
+def _adf(text):
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]}],
+    }
+
+
+class Dataset:
+    """Synthetic projects, boards, sprints and issues shaped like Jira Cloud responses"""
+
+    def __init__(self, issues=2000, boards=4, sprints_per_board=6, people=25, seed=42):
+        rng = random.Random(seed)
+        now = self.now = datetime(2026, 10, 1, 12, 0, 0)
+        people_list = [_person(f"Person {i}") for i in range(people)]
+
+        self.boards = [{"id": 50 + i * 45, "name": name, "type": "scrum"}
+                       for i, name in enumerate(["Software Engineering board", "JI board", "QA board", "Ops board"][:boards])]
+        self.sprints = {}
+        sprint_id = 1000
+        for board in self.boards:
+            sprints = []
+            for n in range(sprints_per_board):
+                start = now - timedelta(days=14 * (sprints_per_board - n))
+                state = "closed" if n < sprints_per_board - 2 else ("active" if n == sprints_per_board - 2 else "future")
+                sprints.append({
+                    "id": sprint_id,
+                    "self": f"https://example.atlassian.net/rest/agile/1.0/sprint/{sprint_id}",
+                    "state": state,
+                    "name": f"{board['name'].split()[0]} Sprint {n + 1}",
+                    "startDate": start.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                    "endDate": (start + timedelta(days=14)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                    "originBoardId": board["id"],
+                })
+                sprint_id += 1
+            self.sprints[board["id"]] = sprints
+
+        all_sprints = [s for sprints in self.sprints.values() for s in sprints]
+        boards_by_id = {b["id"]: b for b in self.boards}
+        self.issues = []
+        for i in range(issues):
+            project_id, project_key, project_name = PROJECTS[i % len(PROJECTS)]
+            status_id, status_name, category = rng.choice(STATUSES)
+            created = now - timedelta(days=rng.randint(0, 400), hours=rng.randint(0, 23))
+            done = category == "Done"
+            resolved = created + timedelta(hours=rng.randint(2, 400)) if done else None
+            issue_type = "Bug" if rng.random() < 0.55 else rng.choice(["Story", "Task"])
+            epic = rng.choice(EPIC_IDS)
+            priority = rng.choice(PRIORITIES)
+            sprint = rng.choice(all_sprints)
+            board = boards_by_id[sprint["originBoardId"]]
+            self.issues.append({
+                "expand": "renderedFields,names,schema,operations,editmeta,changelog,versionedRepresentations",
+                "id": str(100000 + i),
+                "self": f"https://example.atlassian.net/rest/api/3/issue/{100000 + i}",
+                "key": f"{project_key}-{i + 1}",
+                "_sprint": sprint["id"],
+                "_created": created,
+                "_board": board["id"],
+                "_updated": resolved or created,
+                "fields": {
+                    "summary": f"Synthetic issue {i + 1} for {project_key}",
+                    "description": _adf(f"Steps to reproduce issue {i + 1}. " * rng.randint(1, 8)),
+                    "issuetype": {"id": "1", "name": issue_type, "subtask": False,
+                                  "iconUrl": "https://example.atlassian.net/images/icons/issuetypes/bug.svg"},
+                    "status": {
+                        "self": f"https://example.atlassian.net/rest/api/3/status/{status_id}",
+                        "id": status_id,
+                        "name": status_name,
+                        "statusCategory": {"id": 3 if done else 4, "key": "done" if done else "indeterminate",
+                                           "colorName": "green" if done else "yellow", "name": category},
+                    },
+                    "priority": {"id": str(PRIORITIES.index(priority) + 1), "name": priority,
+                                 "iconUrl": f"https://example.atlassian.net/images/icons/priorities/{priority.lower()}.svg"},
+                    "assignee": rng.choice(people_list) if rng.random() < 0.85 else None,
+                    "reporter": rng.choice(people_list),
+                    "created": created.strftime("%Y-%m-%dT%H:%M:%S.000+0500"),
+                    "updated": (resolved or created).strftime("%Y-%m-%dT%H:%M:%S.000+0500"),
+                    "resolutiondate": resolved.strftime("%Y-%m-%dT%H:%M:%S.000+0500") if resolved else None,
+                    "resolution": {"name": rng.choice(RESOLUTIONS)} if done else None,
+                    "duedate": (created + timedelta(days=21)).strftime("%Y-%m-%d") if rng.random() < 0.4 else None,
+                    "parent": {"id": str(epic), "key": f"{project_key}-E{epic}"},
+                    "project": {"id": project_id, "key": project_key, "name": project_name},
+                    "components": [{"name": rng.choice(COMPONENTS)}] if rng.random() < 0.7 else [],
+                    SPRINT_FIELD: [{"id": sprint["id"], "name": sprint["name"], "state": sprint["state"],
+                                    "boardId": sprint["originBoardId"]}],
+                },
+            })
+        # Separate generator so the fields above stay the same with or without histories
+        history_rng = random.Random(seed + 1)
+        sprints_by_id = {s["id"]: s for s in all_sprints}
+        for issue in self.issues:
+            self._add_changelog(issue, sprints_by_id[issue["_sprint"]], history_rng)
+
+    def _add_changelog(self, issue, sprint, rng):
+        """Status walk (and sometimes a mid-sprint add) inside the sprint, as Jira changelog histories"""
+        fields = issue["fields"]
+        created = issue["_created"]
+        start = max(created, datetime.strptime(sprint["startDate"], "%Y-%m-%dT%H:%M:%S.000Z"))
+        end = min(self.now, datetime.strptime(sprint["endDate"], "%Y-%m-%dT%H:%M:%S.000Z"))
+        if end <= start:
+            end = min(self.now, start + timedelta(days=3))
+        span = max(1, int((end - start).total_seconds()))
+
+        def at():
+            return start + timedelta(seconds=rng.randint(0, span))
+
+        changes = []
+        if rng.random() < 0.2 and created < start:
+            changes.append((at(), {"field": "Sprint", "fieldtype": "custom", "fieldId": SPRINT_FIELD,
+                                   "from": "", "fromString": "", "to": str(sprint["id"]), "toString": sprint["name"]}))
+        target = next(n for n, s in enumerate(STATUSES) if s[0] == fields["status"]["id"])
+        times = sorted(at() for _ in range(target))
+        for (from_id, from_name, _), (to_id, to_name, _), when in zip(STATUSES, STATUSES[1:target + 1], times):
+            changes.append((when, {"field": "status", "fieldtype": "jira", "fieldId": "status",
+                                   "from": from_id, "fromString": from_name, "to": to_id, "toString": to_name}))
+        changes.sort(key=lambda change: change[0])
+        issue["_changelog"] = {
+            "startAt": 0,
+            "maxResults": len(changes),
+            "total": len(changes),
+            "histories": [
+                {"id": str(n), "created": when.strftime("%Y-%m-%dT%H:%M:%S.000+0000"), "items": [item]}
+                for n, (when, item) in enumerate(changes)
+            ],
+        }
+        if changes and changes[-1][0] > issue["_updated"]:
+            issue["_updated"] = changes[-1][0]
+            fields["updated"] = issue["_updated"].strftime("%Y-%m-%dT%H:%M:%S.000+0500")
+
+
+def _jql_filter(jql, now):
+    """Tiny JQL subset, enough for the filters the backend actually sends, parsed once into a predicate"""
+    jql_lower = jql.lower()
+    checks = []
+
+    created = re.search(r"created\s*>=\s*-(\d+)d", jql_lower)
+    if created:
+        since = now - timedelta(days=int(created.group(1)))
+        checks.append(lambda i: i["_created"] >= since)
+    for op, day in re.findall(r"created(?:date)?\s*(>=|<)\s*'(\d{4}-\d{2}-\d{2})'", jql_lower):
+        bound = datetime.strptime(day, "%Y-%m-%d")
+        if op == ">=":
+            checks.append(lambda i, bound=bound: i["_created"] >= bound)
+        else:
+            checks.append(lambda i, bound=bound: i["_created"] < bound)
+    updated = re.search(r"updated\s*>=\s*-(\d+)([dm])", jql_lower)
+    if updated:
+        amount = int(updated.group(1))
+        since = now - (timedelta(days=amount) if updated.group(2) == "d" else timedelta(minutes=amount))
+        checks.append(lambda i: i["_updated"] >= since)
+    if re.search(r"issuetype\s*=\s*'?bug'?", jql_lower):
+        checks.append(lambda i: i["fields"]["issuetype"]["name"] == "Bug")
+    if "statuscategory != done" in jql_lower:
+        checks.append(lambda i: i["fields"]["status"]["statusCategory"]["name"] != "Done")
+    if "resolution = unresolved" in jql_lower:
+        checks.append(lambda i: not i["fields"]["resolution"])
+    keys = re.search(r"\bkey in \(([^)]*)\)", jql_lower)
+    if keys:
+        wanted_keys = {k.strip() for k in keys.group(1).split(",")}
+        checks.append(lambda i: i["key"].lower() in wanted_keys)
+    parents = re.search(r"parent in \(([^)]*)\)", jql_lower)
+    if parents:
+        wanted_parents = {p.strip() for p in parents.group(1).split(",")}
+        checks.append(lambda i: i["fields"]["parent"]["id"] in wanted_parents)
+    sprint = re.search(r"sprint\s*=\s*(\d+)", jql_lower)
+    if sprint:
+        sprint_id = int(sprint.group(1))
+        checks.append(lambda i: i["_sprint"] == sprint_id)
+    projects = re.search(r"project in \(([^)]*)\)", jql_lower)
+    if projects:
+        project_keys = {p.strip(" '\"").upper() for p in projects.group(1).split(",")}
+        checks.append(lambda i: i["fields"]["project"]["key"] in project_keys)
+    else:
+        project = re.search(r"project\s*=\s*'?([\w-]+)'?", jql_lower)
+        if project:
+            wanted = project.group(1).upper()
+            checks.append(lambda i: wanted in (i["fields"]["project"]["key"], i["fields"]["project"]["id"]))
+    return lambda issue: all(check(issue) for check in checks)
+
+
+def _project(issue, fields, expand=None):
+    """Return only the requested fields, like Jira does"""
+    if not fields or "*all" in fields:
+        selected = issue["fields"]
+    else:
+        selected = {f: issue["fields"].get(f) for f in fields if f in issue["fields"]}
+    projected = {k: v for k, v in issue.items() if not k.startswith("_") and k != "fields"} | {"fields": selected}
+    if expand and "changelog" in expand:
+        changelog = issue["_changelog"]
+        histories = changelog["histories"][:CHANGELOG_EMBED_LIMIT]
+        projected["changelog"] = {**changelog, "maxResults": len(histories), "histories": histories}
+    return projected
+
+
+def _field_list(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [f.strip() for f in value.split(",") if f.strip()]
+    return list(value)
+
+
+def create_app(dataset, latency_ms=0.0, jitter_ms=0.0, sheet_rows=None):
+    app = FastAPI(title="Fake Jira + Sheets upstream")
+    stats = Counter()
+    rng = random.Random(7)
+
+    @app.middleware("http")
+    async def latency_and_counting(request: Request, call_next):
+        if not request.url.path.startswith("/__"):
+            # Count by route shape so numeric IDs do not explode the key space
+            route = re.sub(r"/\d+", "/{id}", request.url.path)
+            stats[f"{request.method} {route}"] += 1
+            delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+        return await call_next(request)
+
+    @app.get("/__stats")
+    async def get_stats():
+        return {"calls": dict(stats), "total": sum(stats.values())}
+
+    @app.post("/__reset")
+    async def reset_stats():
+        stats.clear()
+        return {"ok": True}
+
+    matched_by_jql = {}
+
+    def matching(jql):
+        """Issues matching a JQL filter, computed once per distinct query (the dataset never changes)"""
+        jql = jql or ""
+        if jql not in matched_by_jql:
+            predicate = _jql_filter(jql, dataset.now)
+            matched = [i for i in dataset.issues if predicate(i)]
+            order = re.search(r"order by (created|updated) (asc|desc)", jql.lower())
+            if order:
+                field = f"_{order.group(1)}"
+                matched.sort(key=lambda i: (i[field], i["key"]), reverse=order.group(2) == "desc")
+            matched_by_jql[jql] = matched
+        return matched_by_jql[jql]
+
+    issue_keys = {i["key"] for i in dataset.issues}
+
+    def unknown_keys(jql):
+        """Like Jira, a `key in (...)` naming a missing issue fails the whole query"""
+        keys = re.search(r"\bkey in \(([^)]*)\)", jql or "", re.IGNORECASE)
+        missing = [k.strip() for k in keys.group(1).split(",") if k.strip() not in issue_keys] if keys else []
+        if missing:
+            return JSONResponse({"errorMessages": [f"An issue with key '{k}' does not exist for field 'key'." for k in missing],
+                                 "warningMessages": []}, status_code=400)
+        return None
+
+    def search(jql, fields, max_results, start=0, expand=None):
+        matched = matching(jql)
+        page = matched[start:start + min(max_results, PAGE_LIMIT)]
+        next_start = start + len(page)
+        is_last = next_start >= len(matched)
+        body = {"issues": [_project(i, fields, expand) for i in page], "isLast": is_last}
+        if not is_last:
+            body["nextPageToken"] = str(next_start)
+        return body, matched
+
+    @app.post("/rest/api/3/search/approximate-count")
+    async def approximate_count(request: Request):
+        payload = await request.json()
+        return {"count": len(matching(payload.get("jql")))}
+
+    @app.post("/rest/api/3/search/jql")
+    async def search_jql_post(request: Request):
+        payload = await request.json()
+        rejected = unknown_keys(payload.get("jql"))
+        if rejected:
+            return rejected
+        body, _ = search(payload.get("jql"), _field_list(payload.get("fields")), int(payload.get("maxResults", 50)),
+                         int(payload.get("nextPageToken") or 0), payload.get("expand"))
+        return body
+
+    @app.get("/rest/api/3/search/jql")
+    async def search_jql_get(jql: str = "", fields: str = None, maxResults: int = 50, nextPageToken: str = None,
+                             expand: str = None):
+        rejected = unknown_keys(jql)
+        if rejected:
+            return rejected
+        body, _ = search(jql, _field_list(fields), maxResults, int(nextPageToken or 0), expand)
+        return body
+
+    @app.get("/rest/api/3/issue/{key}/changelog")
+    async def issue_changelog(key: str, startAt: int = 0, maxResults: int = 100):
+        issue = next((i for i in dataset.issues if i["key"] == key), None)
+        if issue is None:
+            return JSONResponse({"errorMessages": ["Issue does not exist"]}, status_code=404)
+        histories = issue["_changelog"]["histories"]
+        values = histories[startAt:startAt + min(maxResults, PAGE_LIMIT)]
+        return {"startAt": startAt, "maxResults": maxResults, "total": len(histories),
+                "isLast": startAt + len(values) >= len(histories), "values": values}
+
+    @app.get("/rest/api/3/project")
+    async def projects():
+        return [{"id": pid, "key": key, "name": name} for pid, key, name in PROJECTS]
+
+    @app.get("/rest/api/3/project/{key}")
+    async def project(key: str):
+        for pid, pkey, name in PROJECTS:
+            if key in (pid, pkey):
+                return {"id": pid, "key": pkey, "name": name}
+        return JSONResponse({"errorMessages": ["No project could be found"]}, status_code=404)
+
+    @app.get("/rest/agile/1.0/board")
+    async def boards(projectKeyOrId: str = None):
+        return {"maxResults": 50, "startAt": 0, "isLast": True, "values": dataset.boards}
+
+    @app.get("/rest/agile/1.0/board/{board_id}")
+    async def board(board_id: int):
+        for b in dataset.boards:
+            if b["id"] == board_id:
+                return b
+        return JSONResponse({"errorMessages": ["Board does not exist"]}, status_code=404)
+
+    @app.get("/rest/agile/1.0/board/{board_id}/configuration")
+    async def board_configuration(board_id: int):
+        columns = [{"name": name, "statuses": [{"id": sid}]} for sid, name, _ in STATUSES]
+        return {"id": board_id, "columnConfig": {"columns": columns}}
+
+    @app.get("/rest/agile/1.0/board/{board_id}/sprint")
+    async def board_sprints(board_id: int, state: str = "active,future,closed", maxResults: int = 50):
+        states = set(state.split(","))
+        values = [s for s in dataset.sprints.get(board_id, []) if s["state"] in states][:maxResults]
+        return {"maxResults": maxResults, "startAt": 0, "isLast": True, "values": values}
+
+    @app.get("/rest/agile/1.0/board/{board_id}/issue")
+    async def board_issues(board_id: int, jql: str = "", fields: str = None, maxResults: int = 50, startAt: int = 0):
+        matched = [i for i in matching(jql) if i["_board"] == board_id]
+        page = matched[startAt:startAt + min(maxResults, PAGE_LIMIT)]
+        return {"startAt": startAt, "maxResults": maxResults, "total": len(matched),
+                "issues": [_project(i, _field_list(fields)) for i in page]}
+
+    @app.get("/rest/agile/1.0/sprint/{sprint_id}")
+    async def sprint(sprint_id: int):
+        for sprints in dataset.sprints.values():
+            for s in sprints:
+                if s["id"] == sprint_id:
+                    return s
+        return JSONResponse({"errorMessages": ["Sprint does not exist"]}, status_code=404)
+
+    @app.get("/rest/agile/1.0/sprint/{sprint_id}/issue")
+    async def sprint_issues(sprint_id: int, fields: str = None, maxResults: int = 50, startAt: int = 0):
+        matched = [i for i in dataset.issues if i["_sprint"] == sprint_id]
+        page = matched[startAt:startAt + min(maxResults, PAGE_LIMIT)]
+        return {"startAt": startAt, "maxResults": maxResults, "total": len(matched),
+                "issues": [_project(i, _field_list(fields)) for i in page]}
+
+    # --- Google OAuth, Drive and Sheets ---
+
+    @app.post("/token")
+    async def token():
+        return {"access_token": "fake-access-token", "expires_in": 3600, "token_type": "Bearer"}
+
+    @app.get("/drive/v3/files")
+    async def drive_lookup():
+        return {"files": [{"id": "fake-sheet"}]}
+
+    @app.get("/drive/v3/files/{file_id}")
+    async def drive_metadata(file_id: str):
+        return {"id": file_id, "modifiedTime": "2026-10-01T09:00:00.000Z"}
+
+    @app.get("/v4/spreadsheets/{spreadsheet_id}/values:batchGet")
+    async def values_batch_get(spreadsheet_id: str, request: Request):
+        ranges = request.query_params.getlist("ranges")
+        rows = sheet_rows or default_sheet_rows()
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "valueRanges": [{"range": r, "majorDimension": "ROWS", "values": rows.get(r.split("!")[0], [])} for r in ranges],
+        }
+
+    return app
+
+
+def default_sheet_rows(modules_per_section=40):
+    progress = []
+    for section in ("PCS", "Cloud", "APP"):
+        progress.append([section, "", ""])
+        progress.append(["Module", "Development", "QA"])
+        for m in range(modules_per_section):
+            progress.append([f"{section} module {m}", str(50 + m % 50), str(30 + m % 70)])
+        progress.append(["Average", "74.5", "64.5"])
+        progress.append(["", "", ""])
+    coverage = [
+        ["Test Type", "PCS", "Cloud", "APP", "", "", ""],
+        ["Unit", "61%", "72%", "55%", "", "QA", "18 days"],
+        ["Integration", "40%", "51%", "33%", "", "APP", "9 days"],
+        ["E2E", "22%", "35%", "28%", "", "PCS", "12 days"],
+    ]
+    return {"Sheet1": progress, "Sheet2": coverage}
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the fake Jira + Sheets upstream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--sprints-per-board", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    dataset = Dataset(issues=args.issues, boards=args.boards, sprints_per_board=args.sprints_per_board)
+    app = create_app(dataset, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
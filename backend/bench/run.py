@@ -0,0 +1,306 @@
+"""Offline benchmark for the dashboard API.
+
+Starts the fake Jira + Sheets upstream (bench/fake_upstream.py) in a
+subprocess, points the backend at it and drives every dashboard endpoint
+in-process. For each endpoint it records cold- and warm-cache latency
+distributions, warm throughput, upstream call counts and allocation peaks,
+then writes one JSON document that bench/compare.py can diff across commits.
+
+Usage (from backend/):
+    python -m bench.run --issues 2000 --latency-ms 80 --output bench_results.json
+
+With --replay it skips the fake and serves upstream calls from a cassette
+recorded with HTTP_CASSETTE_MODE=record, e.g. against production Jira.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_ENDPOINTS = [
+    "/api/dashboard/progress",
+    "/api/dashboard/phase-status?board_id=50",
+    "/api/dashboard/summary",
+    "/api/dashboard/bugs-by-component",
+    "/api/dashboard/open-issues",
+    "/api/dashboard/developer-stats",
+    "/api/project/SSSS/id",
+    "/api/sprint/1004/issues",
+    "/api/sprint/1004/burndown",
+    "/api/issues/recent?project_id=84742&days=90",
+    "/api/bugs/severity-stats?project_id=84742",
+    "/api/issues/details?keys=SSSS-1,SSSS-3,SSSS-5,SSSS-7,SSSS-9,SSSS-11,SSSS-13,SSSS-15,SSSS-17,SSSS-19",
+    "/api/dashboard/board-quality?project_id=84742",
+    "/api/dashboard/bug-flow?project_id=84742",
+    "/api/dashboard/sprint-timeline",
+    "/api/bugs/epic-stats",
+    "/api/dashboard/sheet-progress",
+    "/api/dashboard/test-coverage",
+]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _fake_service_account(upstream_url):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    creds = {
+        "type": "service_account",
+        "client_email": "bench@example.iam.gserviceaccount.com",
+        "private_key": pem.decode("utf-8"),
+        "token_uri": f"{upstream_url}/token",
+    }
+    return base64.b64encode(json.dumps(creds).encode("utf-8")).decode("ascii")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(latencies_ms):
+    return {
+        "n": len(latencies_ms),
+        "mean": round(statistics.fmean(latencies_ms), 2),
+        "p50": round(_percentile(latencies_ms, 50), 2),
+        "p95": round(_percentile(latencies_ms, 95), 2),
+        "p99": round(_percentile(latencies_ms, 99), 2),
+        "max": round(max(latencies_ms), 2),
+    }
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def reset_caches():
+    """Drop every in-process cache so the next request is fully cold"""
+    import cache
+    import gsheets_client
+
+    cache.clear()
+    if gsheets_client._gsheets is not None:
+        gsheets_client._gsheets.invalidate_snapshot()
+
+
+_replay_baseline = {}
+
+
+def _replayed_calls():
+    import metrics
+
+    calls = {}
+    for (service, method, path, _status), count in metrics.upstream_requests.values.items():
+        route = f"{service} {method} {path}"
+        calls[route] = calls.get(route, 0) + int(count)
+    return calls
+
+
+async def _upstream_stats(upstream, reset=False):
+    if upstream is None:
+        # Replaying a cassette: count the calls the instrumented transport saw instead
+        global _replay_baseline
+        if reset:
+            _replay_baseline = _replayed_calls()
+            return None
+        calls = {route: count - _replay_baseline.get(route, 0) for route, count in _replayed_calls().items()}
+        calls = {route: count for route, count in calls.items() if count}
+        return {"total": sum(calls.values()), "calls": calls}
+    if reset:
+        await upstream.post("/__reset")
+        return None
+    return (await upstream.get("/__stats")).json()
+
+
+async def bench_endpoint(client, upstream, path, cold_runs, warm_requests, concurrency):
+    # Cold: every request misses every cache
+    cold_latencies = []
+    upstream_calls = None
+    alloc_peak_kb = 0
+    for i in range(cold_runs):
+        reset_caches()
+        await _upstream_stats(upstream, reset=True)
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = await client.get(path)
+        cold_latencies.append((time.perf_counter() - started) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        alloc_peak_kb = max(alloc_peak_kb, peak // 1024)
+        response.raise_for_status()
+        if i == 0:
+            upstream_calls = await _upstream_stats(upstream)
+
+    # Warm: the entry is cached, many concurrent pollers
+    await _upstream_stats(upstream, reset=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    warm_latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            r = await client.get(path)
+            warm_latencies.append((time.perf_counter() - started) * 1000)
+            r.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(warm_requests)))
+    elapsed = time.perf_counter() - started
+    warm_upstream = await _upstream_stats(upstream)
+
+    return {
+        "cold": _summary(cold_latencies),
+        "warm": _summary(warm_latencies),
+        "warm_throughput_rps": round(warm_requests / elapsed, 1),
+        "upstream_calls_cold": upstream_calls["total"],
+        "upstream_calls_cold_by_route": upstream_calls["calls"],
+        "upstream_calls_warm": warm_upstream["total"],
+        "cold_alloc_peak_kb": alloc_peak_kb,
+        "response_bytes": len(response.content),
+    }
+
+
+async def run(args, upstream_url):
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client, \
+            httpx.AsyncClient(base_url=upstream_url or "http://unused", timeout=30.0) as upstream:
+        for path in args.endpoints:
+            print(f"  {path} ...", file=sys.stderr)
+            results[path] = await bench_endpoint(client, upstream if upstream_url else None, path,
+                                                 args.cold_runs, args.warm_requests, args.concurrency)
+    # ASGITransport skips the lifespan; close the pool here so a recording cassette is written
+    from http_client import close_http_client
+    await close_http_client()
+    return results
+
+
+def _wait_for(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{url}/__stats", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Fake upstream did not start at {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard API against a local fake upstream")
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--sprints-per-board", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--warm-requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--endpoints", nargs="*", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--replay", metavar="CASSETTE",
+                        help="Serve upstream calls from a recorded cassette (HTTP_CASSETTE_MODE=record) instead of the fake")
+    args = parser.parse_args()
+
+    if args.replay:
+        os.environ.update({
+            "HTTP_CASSETTE_MODE": "replay",
+            "HTTP_CASSETTE_PATH": os.path.abspath(args.replay),
+            "CACHE_WARM_ENABLED": "false",
+        })
+        sys.path.insert(0, BACKEND_DIR)
+        import logging
+        logging.disable(logging.INFO)
+        started = time.time()
+        endpoints = asyncio.run(run(args, None))
+        _write_report(args, started, endpoints)
+        return
+
+    port = _free_port()
+    upstream_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_upstream", "--port", str(port), "--issues", str(args.issues),
+         "--boards", str(args.boards), "--sprints-per-board", str(args.sprints_per_board),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms)],
+        cwd=BACKEND_DIR
+    )
+    try:
+        _wait_for(upstream_url)
+
+        # Point the backend at the fake before it is imported
+        os.environ.update({
+            "JIRA_DOMAIN": "bench.atlassian.net",
+            "JIRA_EMAIL": "bench@example.com",
+            "JIRA_API_TOKEN": "bench-token",
+            "JIRA_BASE_URL": upstream_url,
+            "GSHEETS_JSON": _fake_service_account(upstream_url),
+            "GSHEETS_API_URL": upstream_url,
+            "GDRIVE_API_URL": upstream_url,
+            "CACHE_WARM_ENABLED": "false",
+        })
+        sys.path.insert(0, BACKEND_DIR)
+        import logging
+        logging.disable(logging.INFO)
+
+        started = time.time()
+        endpoints = asyncio.run(run(args, upstream_url))
+    finally:
+        server.terminate()
+        server.wait()
+    _write_report(args, started, endpoints)
+
+
+def _write_report(args, started, endpoints):
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started)),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k not in ("endpoints", "output")},
+        "process_rss_mb": _rss_mb(),
+        "endpoints": endpoints,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    for path, r in endpoints.items():
+        print(f"{path:50} cold p50 {r['cold']['p50']:8.1f}ms  warm p50 {r['warm']['p50']:6.2f}ms  "
+              f"{r['warm_throughput_rps']:8.1f} rps  upstream {r['upstream_calls_cold']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Startup-time budget for the backend.
+
+Imports `main` in fresh interpreters and reports import time and resident set
+size, so cold-start regressions are caught before they reach autoscaling.
+
+Usage (from backend/):
+    python -m bench.startup --runs 5 --max-import-ms 1500 --max-rss-mb 120
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must stay off the import path and load only on first use
+LAZY_MODULES = ["pandas", "gspread", "google.auth", "cryptography"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - start) * 1000
+
+rss_kb = None
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+
+print(json.dumps({
+    "import_ms": import_ms,
+    "rss_mb": rss_kb / 1024 if rss_kb else None,
+    "modules": sorted(m for m in sys.modules if m.split(".")[0] in %r),
+}))
+"""
+
+
+def run_probe():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % sorted({m.split(".")[0] for m in LAZY_MODULES})],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend import time and RSS")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=float(os.getenv("STARTUP_MAX_IMPORT_MS", 0)))
+    parser.add_argument("--max-rss-mb", type=float, default=float(os.getenv("STARTUP_MAX_RSS_MB", 0)))
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    import_ms = [s["import_ms"] for s in samples]
+    rss_mb = [s["rss_mb"] for s in samples if s["rss_mb"] is not None]
+    loaded = sorted({m for s in samples for m in s["modules"]})
+    eager = [m for m in LAZY_MODULES if any(l == m or l.startswith(m + ".") for l in loaded)]
+
+    report = {
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "import_ms": {
+            "median": round(statistics.median(import_ms), 1),
+            "min": round(min(import_ms), 1),
+            "max": round(max(import_ms), 1)
+        },
+        "rss_mb": {
+            "median": round(statistics.median(rss_mb), 1),
+            "max": round(max(rss_mb), 1)
+        } if rss_mb else None,
+        "eager_heavy_modules": eager
+    }
+
+    failures = []
+    if eager:
+        failures.append(f"heavy modules imported at startup: {', '.join(eager)}")
+    if args.max_import_ms and report["import_ms"]["median"] > args.max_import_ms:
+        failures.append(f"median import time {report['import_ms']['median']}ms exceeds {args.max_import_ms}ms")
+    if args.max_rss_mb and report["rss_mb"] and report["rss_mb"]["median"] > args.max_rss_mb:
+        failures.append(f"median RSS {report['rss_mb']['median']}MB exceeds {args.max_rss_mb}MB")
+    report["failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
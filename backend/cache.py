@@ -0,0 +1,335 @@
+import os
+import json
+import time
+import string
+import hashlib
+import asyncio
+import inspect
+import logging
+import contextvars
+from functools import wraps
+from collections import defaultdict
+
+import metrics
+import tracing
+import http_client
+
+logger = logging.getLogger("SkyDashboard.Cache")
+
+# Simple In-Memory Cache
+_cache = {}  # cache key -> (timestamp, result)
+CACHE_TTL = int(os.getenv("CACHE_TTL", 300)) # Default 5 minutes
+# Upper bound on entries; the least recently refreshed ones are evicted first
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1000))
+
+# Adaptive TTLs: each refresh hashes the result; an unchanged result stretches
+# that key's TTL, a changed one halves it, within [ttl * MIN, ttl * MAX]
+CACHE_ADAPTIVE_TTL = os.getenv("CACHE_ADAPTIVE_TTL", "true").lower() == "true"
+CACHE_TTL_MIN_FACTOR = float(os.getenv("CACHE_TTL_MIN_FACTOR", 0.5))
+CACHE_TTL_MAX_FACTOR = float(os.getenv("CACHE_TTL_MAX_FACTOR", 4))
+TTL_GROWTH = 1.5
+# Jira calls per minute we aim to stay under; 0 means no budget. Past
+# BUDGET_HEADROOM of it every TTL is stretched, up to CACHE_TTL_MAX_STRETCH times.
+JIRA_CALL_BUDGET = int(os.getenv("JIRA_CALL_BUDGET", 0))
+BUDGET_HEADROOM = 0.8
+CACHE_TTL_MAX_STRETCH = float(os.getenv("CACHE_TTL_MAX_STRETCH", 4))
+
+_ttls = {}  # cache key -> current adaptive TTL
+_digests = {}  # cache key -> hash of the last result stored
+
+# Every @async_cache function by name, so background jobs can refresh them
+cached_functions = {}
+
+# Tags say which project/board/sprint/sheet an entry was built from, so a known
+# upstream change can drop or rebuild exactly the entries that depend on it
+_tag_index = defaultdict(set)  # tag -> cache keys
+_entry_calls = {}  # cache key -> (function name, args, kwargs, tags)
+
+# Called as listener(function name, bound arguments, result) whenever refresh() stores a result
+_refresh_listeners = []
+
+# When the refresh() running in this context started. cached_batch items stored
+# before it are refetched, so a per-item cache under a cached function never
+# makes its result older than its own TTL or a refresh_tags() of its tags
+_refresh_started = contextvars.ContextVar("cache_refresh_started", default=None)
+
+
+def _forget(key):
+    _cache.pop(key, None)
+    _ttls.pop(key, None)
+    _digests.pop(key, None)
+    call = _entry_calls.pop(key, None)
+    if call:
+        for tag in call[3]:
+            keys = _tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del _tag_index[tag]
+
+
+def _store(key, result, call=None):
+    # Re-insert so dict order follows refresh time, then trim the oldest entries
+    _cache.pop(key, None)
+    _cache[key] = (time.time(), result)
+    if call:
+        _entry_calls[key] = call
+        for tag in call[3]:
+            _tag_index[tag].add(key)
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        oldest = next(iter(_cache))
+        _forget(oldest)
+        metrics.cache_events.inc(oldest.split(":", 1)[0], "eviction")
+
+
+def _digest(result):
+    try:
+        payload = json.dumps(result, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        payload = repr(result)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+def _adapt_ttl(name, key, result, ttl, min_ttl, max_ttl):
+    """Lengthen or shorten a key's TTL by whether its refreshed result changed"""
+    digest = _digest(result)
+    previous = _digests.get(key)
+    current = _ttls.get(key, ttl)
+    if previous is None:
+        current = ttl
+    elif previous == digest:
+        current = min(max_ttl, current * TTL_GROWTH)
+        metrics.cache_events.inc(name, "unchanged")
+    else:
+        current = max(min_ttl, current / 2)
+        metrics.cache_events.inc(name, "changed")
+    _digests[key] = digest
+    _ttls[key] = current
+    metrics.cache_ttl.set(name, value=current)
+
+
+def budget_stretch():
+    """How much to stretch every TTL given the recent Jira call rate (1.0 = not at all)"""
+    if JIRA_CALL_BUDGET <= 0:
+        return 1.0
+    threshold = JIRA_CALL_BUDGET * BUDGET_HEADROOM
+    rate = http_client.upstream_call_rate("jira")
+    if rate <= threshold:
+        return 1.0
+    # Linear from 1x at the headroom mark to the full stretch at the budget
+    pressure = min(1.0, (rate - threshold) / (JIRA_CALL_BUDGET - threshold))
+    return 1.0 + pressure * (CACHE_TTL_MAX_STRETCH - 1.0)
+
+
+def current_ttl(key, ttl):
+    """Effective TTL of a cache key whose function declared `ttl`"""
+    return _ttls.get(key, ttl) * budget_stretch()
+
+
+def _render_tags(name, templates, arguments):
+    """Fill tag templates like "board:{board_id}" from the call's arguments.
+
+    Templates whose argument is None are skipped, and comma-separated values
+    ("SSSS,JI", "50,140") produce one tag per item. Every entry is also tagged
+    "fn:<function name>".
+    """
+    tags = {f"fn:{name}"}
+    for template in templates:
+        fields = [field for _, field, _, _ in string.Formatter().parse(template) if field]
+        if not fields:
+            tags.add(template)
+            continue
+        value = arguments.get(fields[0])
+        if value is None:
+            continue
+        for item in str(value).split(","):
+            if item.strip():
+                tags.add(template.format(**{fields[0]: item.strip()}))
+    return frozenset(tags)
+
+
+def clear():
+    """Drop every entry, e.g. to start a benchmark fully cold"""
+    _cache.clear()
+    _ttls.clear()
+    _digests.clear()
+    _tag_index.clear()
+    _entry_calls.clear()
+
+
+def on_refresh(listener):
+    """Register listener(name, arguments, result) to see every freshly fetched result"""
+    _refresh_listeners.append(listener)
+    return listener
+
+
+def keys_for_tags(tags):
+    """Cache keys of every live entry carrying any of the given tags"""
+    keys = set()
+    for tag in tags:
+        keys.update(key for key in _tag_index.get(tag, ()) if key in _cache)
+    return keys
+
+
+def invalidate(tags):
+    """Drop every entry carrying any of the tags; returns how many were dropped"""
+    keys = keys_for_tags(tags)
+    for key in keys:
+        _forget(key)
+        metrics.cache_events.inc(key.split(":", 1)[0], "invalidation")
+    logger.info(f"Invalidated {len(keys)} cache entries for tags {sorted(tags)}")
+    return len(keys)
+
+
+async def refresh_tags(tags):
+    """Rebuild every entry carrying any of the tags in place.
+
+    Readers keep getting the old value until its replacement is stored, and an
+    entry whose refresh fails is left as it was. Returns (refreshed, failed).
+    """
+    calls = []
+    for key in keys_for_tags(tags):
+        call = _entry_calls.get(key)
+        if call and call[0] in cached_functions:
+            calls.append(call)
+        else:
+            # Per-item entries from cached_batch have no call to replay; the next lookup refetches them
+            _forget(key)
+    results = await asyncio.gather(
+        *(cached_functions[name].refresh(*args, **kwargs) for name, args, kwargs, _ in calls),
+        return_exceptions=True
+    )
+    failed = 0
+    for (name, _, _, _), result in zip(calls, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning(f"Refreshing {name} by tag failed: {result}")
+    logger.info(f"Refreshed {len(calls) - failed} cache entries for tags {sorted(tags)}")
+    return len(calls) - failed, failed
+
+
+def async_cache(ttl=CACHE_TTL, tags=(), min_ttl=None, max_ttl=None):
+    """Cache an async function's results per argument set for `ttl` seconds.
+
+    `tags` are templates such as "project:{project}" or "sheet:progress" naming
+    what the result depends on, for invalidate() and refresh_tags().
+    With CACHE_ADAPTIVE_TTL each entry's TTL then moves between `min_ttl` and
+    `max_ttl` (by default ttl * CACHE_TTL_MIN_FACTOR / CACHE_TTL_MAX_FACTOR)
+    depending on how often its result actually changes.
+    """
+    min_ttl = ttl * CACHE_TTL_MIN_FACTOR if min_ttl is None else min_ttl
+    max_ttl = ttl * CACHE_TTL_MAX_FACTOR if max_ttl is None else max_ttl
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def bind(*args, **kwargs):
+            # Bind defaults so f() and f(project="SSSS,JI") share one entry
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+
+        def cache_key(*args, **kwargs):
+            return f"{func.__name__}:{dict(bind(*args, **kwargs))}"
+
+        async def refresh(*args, **kwargs):
+            """Fetch fresh data and store it, whether or not the entry expired"""
+            logger.info(f"Fetching fresh data for {func.__name__}")
+            started = _refresh_started.set(time.time())
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                _refresh_started.reset(started)
+            key = cache_key(*args, **kwargs)
+            arguments = bind(*args, **kwargs)
+            call = (func.__name__, args, kwargs, _render_tags(func.__name__, tags, arguments))
+            if CACHE_ADAPTIVE_TTL:
+                _adapt_ttl(func.__name__, key, result, ttl, min_ttl, max_ttl)
+            _store(key, result, call)
+            for listener in _refresh_listeners:
+                try:
+                    listener(func.__name__, arguments, result)
+                except Exception as e:
+                    logger.warning(f"Refresh listener failed for {func.__name__}: {e}")
+            return result
+
+        def expires_at(*args, **kwargs):
+            """When the entry for these arguments goes stale (0 if it is not cached)"""
+            key = cache_key(*args, **kwargs)
+            entry = _cache.get(key)
+            return entry[0] + current_ttl(key, ttl) if entry else 0.0
+
+        def peek(*args, **kwargs):
+            """The fresh cached result for these arguments, or None, without fetching"""
+            key = cache_key(*args, **kwargs)
+            entry = _cache.get(key)
+            return entry[1] if entry and time.time() - entry[0] < current_ttl(key, ttl) else None
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = cache_key(*args, **kwargs)
+            entry = _cache.get(key)
+            if entry and time.time() - entry[0] < current_ttl(key, ttl):
+                logger.debug(f"Cache hit for {func.__name__}")
+                metrics.cache_events.inc(func.__name__, "hit")
+                tracing.record("cache", 0.0, f"hit {func.__name__}")
+                return entry[1]
+
+            metrics.cache_events.inc(func.__name__, "miss")
+            try:
+                with tracing.span("cache", f"miss {func.__name__}"):
+                    return await refresh(*args, **kwargs)
+            except Exception as e:
+                if not entry:
+                    raise
+                # Better an expired answer than an error while upstream is failing
+                logger.warning(f"Serving stale {func.__name__} after refresh failed: {e}")
+                metrics.cache_events.inc(func.__name__, "stale")
+                return entry[1]
+
+        wrapper.ttl = ttl
+        wrapper.cache_key = cache_key
+        wrapper.refresh = refresh
+        wrapper.expires_at = expires_at
+        wrapper.peek = peek
+        wrapper.tags = tuple(tags)
+        cached_functions[func.__name__] = wrapper
+        return wrapper
+    return decorator
+
+
+async def cached_batch(name, item_ids, fetch, ttl=CACHE_TTL, tags=None):
+    """Cache a batch lookup per item.
+
+    Returns {item id: value} for item_ids. Cached items are served as they are
+    and the rest come from a single `await fetch(missing_ids)` call, which
+    returns {item id: value}; items it omits are not cached. `tags(item_id,
+    value)` names the tags for each stored item. Within a refresh() only
+    items stored since it started count as cached.
+    """
+    now = time.time()
+    ttl *= budget_stretch()
+    since = _refresh_started.get() or 0.0
+    found = {}
+    missing = []
+    for item_id in item_ids:
+        entry = _cache.get(f"{name}:{item_id}")
+        if entry and now - entry[0] < ttl and entry[0] >= since:
+            found[item_id] = entry[1]
+        else:
+            missing.append(item_id)
+
+    if found:
+        metrics.cache_events.inc(name, "hit", amount=len(found))
+        tracing.record("cache", 0.0, f"hit {name} x{len(found)}")
+    if not missing:
+        return found
+
+    metrics.cache_events.inc(name, "miss", amount=len(missing))
+    with tracing.span("cache", f"miss {name} x{len(missing)}"):
+        fetched = await fetch(missing)
+    for item_id, value in fetched.items():
+        item_tags = frozenset({f"fn:{name}", *(tags(item_id, value) if tags else ())})
+        _store(f"{name}:{item_id}", value, (name, (item_id,), {}, item_tags))
+        found[item_id] = value
+    return found
@@ -0,0 +1,159 @@
+import os
+import json
+import gzip
+import base64
+import hashlib
+import logging
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+logger = logging.getLogger("SkyDashboard.Cassette")
+
+# Record every upstream response to a cassette, or replay them with no network:
+#   HTTP_CASSETTE_MODE=record  -> call Jira/Google as usual and save what they return
+#   HTTP_CASSETTE_MODE=replay  -> serve only from the cassette; unknown requests fail
+CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "off").lower()
+CASSETTE_PATH = os.getenv(
+    "HTTP_CASSETTE_PATH",
+    os.path.join(os.path.dirname(__file__), "cassettes", "upstream.json.gz")
+)
+
+# Only these response headers are worth keeping; the rest is per-request noise
+KEPT_HEADERS = ("content-type",)
+# Never write credentials to disk
+REDACTED_QUERY_PARAMS = {"key", "access_token"}
+TOKEN_PATH = "/token"
+
+
+class CassetteMiss(httpx.TransportError):
+    """A replayed request that was never recorded"""
+
+
+def replaying():
+    return CASSETTE_MODE == "replay"
+
+
+def request_key(request):
+    """Normalize a request to 'METHOD path?sorted-query [body hash]'.
+
+    The host is left out so a cassette recorded against production replays
+    against any JIRA_BASE_URL/GSHEETS_API_URL, and auth headers never take part.
+    JSON bodies are hashed with sorted keys so dict ordering does not matter.
+    """
+    path = request.url.path
+    query = sorted((k, v) for k, v in parse_qsl(request.url.query.decode("ascii")) if k not in REDACTED_QUERY_PARAMS)
+    key = f"{request.method} {path}"
+    if query:
+        key += "?" + urlencode(query)
+
+    # The OAuth assertion is signed with the current time; one token exchange is as good as another
+    body = request.content
+    if body and path != TOKEN_PATH:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+        key += " " + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+def _encode_body(content):
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry):
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+def _redact_token(content):
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    if isinstance(data, dict) and "access_token" in data:
+        data["access_token"] = "recorded-token"
+    return json.dumps(data).encode("utf-8")
+
+
+def load(path):
+    """Read a cassette file into {request key: recorded response}"""
+    if not os.path.exists(path):
+        return {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path, entries):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(entries, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """Records upstream responses to a gzipped JSON cassette, or replays them.
+
+    In record mode each response is read fully, stored under its request key
+    and handed back unchanged; the cassette is written when the client closes.
+    In replay mode the wrapped transport is never used.
+    """
+
+    def __init__(self, transport, mode=CASSETTE_MODE, path=CASSETTE_PATH):
+        self._transport = transport
+        self.mode = mode
+        self.path = path
+        # Recording extends an existing cassette so partial runs accumulate
+        self.entries = load(path)
+        self._dirty = False
+        logger.info(f"Cassette {mode} mode: {len(self.entries)} recorded responses in {path}")
+
+    async def handle_async_request(self, request):
+        await request.aread()
+        key = request_key(request)
+
+        if self.mode == "replay":
+            entry = self.entries.get(key)
+            if entry is None:
+                raise CassetteMiss(f"No recorded response for {key}", request=request)
+            return httpx.Response(
+                entry["status"],
+                headers=entry.get("headers", {}),
+                content=_decode_body(entry),
+                request=request
+            )
+
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        stored = _redact_token(content) if request.url.path == TOKEN_PATH else content
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        self.entries[key] = {"status": response.status_code, "headers": headers, **_encode_body(stored)}
+        self._dirty = True
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def flush(self):
+        if self._dirty:
+            save(self.path, self.entries)
+            self._dirty = False
+            logger.info(f"Wrote {len(self.entries)} recorded responses to {self.path}")
+
+    async def aclose(self):
+        self.flush()
+        await self._transport.aclose()
+
+
+def wrap(transport):
+    """Wrap the upstream transport when HTTP_CASSETTE_MODE is record or replay"""
+    if CASSETTE_MODE in ("record", "replay"):
+        return CassetteTransport(transport)
+    return transport
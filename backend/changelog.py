@@ -0,0 +1,190 @@
+import os
+import math
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+import admission
+import tracing
+from issues import timestamp
+
+logger = logging.getLogger("SkyDashboard.Changelog")
+
+# Projects whose issue histories are kept locally for burndown charts
+CHANGELOG_PROJECTS = [p.strip() for p in os.getenv("CHANGELOG_PROJECTS", "SSSS,JI").split(",") if p.strip()]
+# How far back (by last update) the first sync reaches
+CHANGELOG_BACKFILL_DAYS = int(os.getenv("CHANGELOG_BACKFILL_DAYS", 120))
+# A sync requested within this many seconds of the last one is skipped
+CHANGELOG_SYNC_INTERVAL = int(os.getenv("CHANGELOG_SYNC_INTERVAL", 60))
+# Sync from a background task started with the app (every CHANGELOG_SYNC_INTERVAL),
+# so no request waits for the backfill
+CHANGELOG_SYNC_ENABLED = os.getenv("CHANGELOG_SYNC_ENABLED", "true").lower() == "true"
+# Extra minutes each incremental sync reaches back, for clock skew between us and Jira
+CURSOR_OVERLAP_MINUTES = 2
+DONE_CATEGORY = "Done"
+
+
+class History:
+    """One issue's status and sprint changes, as compact (time, field, from, to) events"""
+
+    __slots__ = ("created", "initial_status", "initial_sprints", "events")
+
+    def __init__(self, issue):
+        events = issue.changelog or ()
+        self.created = timestamp(issue.created)
+        # Before its first change an issue had the "from" side of it; with no changes, what it has now
+        self.initial_status = next((e[2] for e in events if e[1] == "status"), issue.status_id)
+        self.initial_sprints = next((e[2] for e in events if e[1] == "sprint"), issue.sprint_ids or ())
+        self.events = events
+
+    def sprints_ever(self):
+        sprints = set(self.initial_sprints)
+        for _, field, _, to in self.events:
+            if field == "sprint":
+                sprints.update(to)
+        return sprints
+
+    def state_at(self, at):
+        """(status id, sprint ids) as of epoch `at`, or None before the issue was created"""
+        if at < self.created:
+            return None
+        status, sprints = self.initial_status, self.initial_sprints
+        for when, field, _, to in self.events:
+            if when > at:
+                break
+            if field == "status":
+                status = to
+            else:
+                sprints = to
+        return status, sprints
+
+
+class ChangelogStore:
+    """Issue histories for CHANGELOG_PROJECTS, kept in memory and synced incrementally.
+
+    The cursor is when the last complete sync started. The next sync asks
+    Jira only for issues updated since then, as a relative "-Nm" JQL time so
+    it does not depend on the Jira user's timezone. Re-ingesting an issue
+    replaces its history, so overlapping syncs are harmless; a failed sync
+    keeps what it got, leaves the cursor where it was and raises, so a
+    burndown is not built from a partial sync.
+    """
+
+    def __init__(self, projects=None):
+        self.projects = projects or CHANGELOG_PROJECTS
+        self.histories = {}  # issue key -> History
+        self.status_categories = {}  # status id -> status category name
+        self.cursor = None
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    def start(self, jira):
+        """Keep the store synced from a background task, beginning with the backfill"""
+        self._task = asyncio.create_task(self._keep_synced(jira))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def backfilling(self):
+        """True while the background task has not finished its first sync"""
+        return self._task is not None and self.cursor is None
+
+    async def _keep_synced(self, jira):
+        while True:
+            try:
+                with admission.lane("background", "changelog_sync"):
+                    await self.sync(jira)
+            except Exception:
+                pass  # sync logged it; the next round retries from the same cursor
+            await asyncio.sleep(CHANGELOG_SYNC_INTERVAL)
+
+    def add(self, issue):
+        self.histories[issue.key] = History(issue)
+        if issue.status_id:
+            self.status_categories[issue.status_id] = issue.status_category
+
+    def sync_jql(self, now=None):
+        projects = ",".join(f"'{p}'" for p in self.projects)
+        if self.cursor is None:
+            since = f"-{CHANGELOG_BACKFILL_DAYS}d"
+        else:
+            since = f"-{math.ceil(((now or time.time()) - self.cursor) / 60) + CURSOR_OVERLAP_MINUTES}m"
+        return f"project in ({projects}) AND updated >= {since} ORDER BY updated ASC"
+
+    async def sync(self, jira):
+        """Ingest the issues updated since the cursor, unless the last sync was moments ago; errors are raised"""
+        async with self._lock:
+            started = time.time()
+            if self.cursor is not None and started - self.cursor < CHANGELOG_SYNC_INTERVAL:
+                return
+            jql = self.sync_jql(started)
+            ingested = 0
+            with tracing.span("changelog_sync", jql):
+                try:
+                    async for page in jira.iter_issue_changelogs(jql):
+                        for issue in page:
+                            self.add(issue)
+                        ingested += len(page)
+                except Exception as e:
+                    logger.warning("Changelog sync stopped after %d issues: %s", ingested, e)
+                    raise
+            self.cursor = started
+            logger.info("Changelog sync ingested %d issues (%d kept)", ingested, len(self.histories))
+
+    def burndown(self, sprint, now=None):
+        """Daily scope and remaining issue counts for a sprint, from the stored histories only.
+
+        Counts issues, measured at the end of each day (or now, for today).
+        `added` and `removed` are issues that joined or left the sprint that
+        day; `ideal` runs from the scope at the start down to zero at the end.
+        """
+        if not sprint.get("startDate") or not sprint.get("endDate"):
+            return {"sprint": sprint, "days": []}
+        sprint_id = sprint["id"]
+        start = timestamp(sprint["startDate"])
+        end = timestamp(sprint.get("completeDate") or sprint["endDate"])
+        now = now or time.time()
+        histories = [h for h in self.histories.values() if sprint_id in h.sprints_ever()]
+
+        def members_at(at):
+            """{index in histories: done} for the issues in the sprint at `at`"""
+            members = {}
+            for n, history in enumerate(histories):
+                state = history.state_at(at)
+                if state and sprint_id in state[1]:
+                    members[n] = self.status_categories.get(state[0]) == DONE_CATEGORY
+            return members
+
+        previous = members_at(start)
+        initial_scope = len(previous)
+        duration = max(1.0, end - start)
+        day = datetime.fromtimestamp(start, timezone.utc).date()
+        last_day = datetime.fromtimestamp(min(end, now), timezone.utc).date()
+
+        days = []
+        with tracing.span("aggregate", f"burndown {sprint_id}"):
+            while day <= last_day:
+                day_end = datetime.combine(day + timedelta(days=1), datetime.min.time(), timezone.utc).timestamp()
+                at = min(day_end, end, now)
+                members = members_at(at)
+                completed = sum(members.values())
+                days.append({
+                    "date": day.isoformat(),
+                    "scope": len(members),
+                    "completed": completed,
+                    "remaining": len(members) - completed,
+                    "added": len(members.keys() - previous.keys()),
+                    "removed": len(previous.keys() - members.keys()),
+                    "ideal": round(initial_scope * max(0.0, 1 - (at - start) / duration), 1),
+                })
+                previous = members
+                day += timedelta(days=1)
+        return {"sprint": sprint, "days": days}
+
+
+store = ChangelogStore()
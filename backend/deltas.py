@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+from collections import deque
+
+import metrics
+
+# Versions kept per document; a client further behind than this gets the full document
+DELTA_HISTORY = int(os.getenv("DELTA_HISTORY", 8))
+# Keys whose history is kept; the least recently updated are dropped first
+DELTA_MAX_KEYS = int(os.getenv("DELTA_MAX_KEYS", 500))
+
+_history = {}  # document key -> deque of (version, document), newest last
+
+
+def _canonical(document):
+    return json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _pointer(path):
+    """RFC 6901 JSON Pointer for a list of keys/indices"""
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in path)
+
+
+def json_patch(old, new, path=()):
+    """RFC 6902 operations (add/remove/replace) turning `old` into `new`.
+
+    Dicts are diffed key by key and lists index by index, so one changed day
+    in a 90-point timeline is one "replace". Anything else is replaced whole.
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": _pointer(path), "value": new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path + (key,))})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path + (key,)), "value": value})
+            else:
+                ops.extend(json_patch(old[key], value, path + (key,)))
+        return ops
+
+    if isinstance(old, list):
+        ops = []
+        common = min(len(old), len(new))
+        for index in range(common):
+            ops.extend(json_patch(old[index], new[index], path + (index,)))
+        # Remove from the end first so earlier indices stay valid
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": _pointer(path + (index,))})
+        for value in new[common:]:
+            ops.append({"op": "add", "path": _pointer(path + ("-",)), "value": value})
+        return ops
+
+    if old != new:
+        return [{"op": "replace", "path": _pointer(path), "value": new}]
+    return []
+
+
+def _remember(key, document):
+    """Version ID of the document, adding it to the key's history if it is new"""
+    versions = _history.get(key)
+    # The cache hands out the same object until it refreshes, so skip hashing in the common case
+    if versions and versions[-1][1] is document:
+        return versions[-1][0]
+
+    canonical = _canonical(document)
+    version = hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+    if versions is None:
+        versions = deque(maxlen=DELTA_HISTORY)
+    else:
+        del _history[key]
+    _history[key] = versions  # re-insert so dict order follows update time
+    if not versions or versions[-1][0] != version:
+        versions.append((version, document))
+    else:
+        versions[-1] = (version, document)
+    while len(_history) > DELTA_MAX_KEYS:
+        del _history[next(iter(_history))]
+    return version
+
+
+def respond(key, document, since):
+    """The document for a polling client that last saw version `since`.
+
+    Returns {"version", "patch"} when `since` is still in the key's history and
+    the patch is smaller than the document, else {"version", "document"}.
+    """
+    version = _remember(key, document)
+    if since == version:
+        metrics.delta_responses.inc("unchanged")
+        return {"version": version, "patch": []}
+
+    base = next((doc for v, doc in _history[key] if v == since), None) if since else None
+    if base is not None:
+        patch = json_patch(base, document)
+        if len(_canonical(patch)) < len(_canonical(document)):
+            metrics.delta_responses.inc("patch")
+            return {"version": version, "patch": patch}
+
+    metrics.delta_responses.inc("full" if not since else "full_fallback")
+    return {"version": version, "document": document}
@@ -1,23 +1,128 @@
-import gspread
-import pandas as pd
 import os
 import logging
 import asyncio
 import json
 import base64
 import datetime
+import time
+
+from http_client import get_http_client
+import cassette
+import tracing
 
 logger = logging.getLogger("SkyDashboard.GSheets")
 
+# How long one batched read of the spreadsheet is reused across endpoints
+SNAPSHOT_TTL = int(os.getenv("GSHEETS_SNAPSHOT_TTL", 60))
+
+# Sheets/Drive requests allowed in flight at once from this process
+MAX_CONCURRENCY = int(os.getenv("GSHEETS_MAX_CONCURRENCY", 4))
+
+SCOPES = "https://www.googleapis.com/auth/spreadsheets.readonly https://www.googleapis.com/auth/drive.metadata.readonly"
+DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+SHEETS_API = os.getenv("GSHEETS_API_URL", "https://sheets.googleapis.com") + "/v4/spreadsheets"
+DRIVE_API = os.getenv("GDRIVE_API_URL", "https://www.googleapis.com") + "/drive/v3/files"
+
+# Refresh the access token this long before Google says it expires
+TOKEN_EXPIRY_MARGIN = 60
+
+PROGRESS_SECTIONS = ("PCS", "Cloud", "APP")
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _fill_gaps(rows):
+    """Pad ragged rows to a rectangle, like gspread's worksheet.get_all_values()"""
+    if not rows:
+        return [[]]
+    width = max(len(row) for row in rows)
+    return [row + [""] * (width - len(row)) for row in rows]
+
+
+def parse_section_averages(rows, section_names=PROGRESS_SECTIONS):
+    """Find every section's "Average" row in a single pass over the raw sheet rows.
+
+    A section starts at the row whose first cell is its name and ends at the next
+    blank row; its Average row is looked up from two rows below the header.
+    Returns {section_name: (dev_avg, qa_avg)}, using (0.0, 0.0) when a section
+    or its Average row is missing.
+    """
+    wanted = set(section_names)
+    open_sections = {}  # section name -> rows seen since its header
+    average_rows = {}
+    found = set()
+
+    for row in rows:
+        first_cell = (row[0] or "").strip() if row else ""
+
+        if not any(row):
+            open_sections.clear()
+            continue
+
+        for name in open_sections:
+            open_sections[name] += 1
+            if open_sections[name] >= 2 and name not in average_rows and "Average" in first_cell:
+                average_rows[name] = row
+
+        if first_cell in wanted and first_cell not in found:
+            found.add(first_cell)
+            open_sections[first_cell] = 0
+
+    result = {}
+    for name in section_names:
+        if name not in found:
+            logger.warning(f"Section {name} not found in sheet")
+            result[name] = (0.0, 0.0)
+            continue
+        if name not in average_rows:
+            logger.warning(f"Average row not found in section {name}")
+            result[name] = (0.0, 0.0)
+            continue
+
+        row = average_rows[name]
+        dev_cell = row[1] if len(row) > 1 else ""
+        qa_cell = row[2] if len(row) > 2 else ""
+        try:
+            result[name] = (float(dev_cell) if dev_cell else 0.0, float(qa_cell) if qa_cell else 0.0)
+        except ValueError as e:
+            logger.error(f"Error parsing section {name}: {e}")
+            result[name] = (0.0, 0.0)
+    return result
+
 class GSheetsClient:
-    def __init__(self):
+    def __init__(self, http_client=None):
         self.json_path = os.path.join(os.path.dirname(__file__), "indigo-coder-466609-a0-903d80189cd0.json")
         self.sheet_name = "Progress_check"
         self.tab_name = "Sheet1"
-        self.gc = None
+        self.coverage_tab_name = "Sheet2"
+        # Every range the dashboard reads, fetched together in one values_batchGet call.
+        # Sheet2 only needs the coverage table (A-D) and the QA timeline (G2:G4).
+        self.ranges = {
+            "progress": self.tab_name,
+            "coverage": f"{self.coverage_tab_name}!A1:G7",
+        }
+        self.spreadsheet_id = os.getenv("GSHEETS_SPREADSHEET_ID")
+        self.creds = None
+        self.http_client = http_client
+
+        self._signing_key = None
+        self._token = None
+        self._token_expiry = 0.0
+        self._token_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._snapshot_version = None
+        self._snapshot_lock = asyncio.Lock()
+        # Parsed views of the current snapshot, dropped whenever a new one is downloaded
+        self._parsed = {}
 
-    def _connect(self):
-        if not self.gc:
+    def _load_credentials(self):
+        """Parse the service account JSON once; later calls reuse the result"""
+        if not self.creds:
             env_json = os.getenv("GSHEETS_JSON")
             env_path = os.getenv("GSHEETS_JSON_PATH")
             
@@ -92,76 +197,187 @@ class GSheetsClient:
                             pk_lines = creds_dict['private_key'].count("\n")
                             logger.info(f"Processed private key. Len: {pk_len}, Lines: {pk_lines}")
                         
-                    try:
-                        logger.info(f"Initializing GSpread (v{gspread.__version__})...")
-                        self.gc = gspread.service_account_from_dict(creds_dict)
-                        logger.info("GSpread initialized successfully")
-                    except Exception as sa_err:
-                        logger.error(f"GSpread init error: {sa_err}")
-                        raise ValueError(f"Google Auth Initialization Error: {str(sa_err)}")
+                    self.creds = creds_dict
                 else:
                     target_path = env_path if env_path else self.json_path
                     logger.info(f"GSHEETS_JSON not found. Falling back to: {target_path}")
-                    self.gc = gspread.service_account(filename=target_path)
-                    logger.info(f"GSpread connected successfully via file: {target_path}")
+                    with open(target_path, "r") as f:
+                        self.creds = json.load(f)
+                    logger.info(f"Service account loaded successfully from file: {target_path}")
             except Exception as e:
                 logger.error(f"CRITICAL Authentication Error: {str(e)}")
                 import traceback
                 logger.error(traceback.format_exc())
                 raise e
                 
-        return self.gc
+        return self.creds
+
+    def _sign_assertion(self):
+        """Build the RS256-signed JWT that is exchanged for an OAuth access token"""
+        creds = self._load_credentials()
+        if self._signing_key is None:
+            from cryptography.hazmat.primitives import serialization
+            self._signing_key = serialization.load_pem_private_key(creds["private_key"].encode("utf-8"), password=None)
+
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
 
-    def _get_all_values_sync(self, tab_name):
-        gc = self._connect()
-        sh = gc.open(self.sheet_name)
-        worksheet = sh.worksheet(tab_name)
-        return worksheet.get_all_values()
+        now = int(time.time())
+        header = {"alg": "RS256", "typ": "JWT"}
+        if creds.get("private_key_id"):
+            header["kid"] = creds["private_key_id"]
+        claims = {
+            "iss": creds["client_email"],
+            "scope": SCOPES,
+            "aud": creds.get("token_uri", DEFAULT_TOKEN_URI),
+            "iat": now,
+            "exp": now + 3600
+        }
+        signing_input = _b64url(json.dumps(header, separators=(",", ":")).encode()) + "." + _b64url(json.dumps(claims, separators=(",", ":")).encode())
+        signature = self._signing_key.sign(signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256())
+        return signing_input + "." + _b64url(signature)
 
-    def get_section_average(self, df, section_name):
+    async def _get_access_token(self):
+        """Return a cached access token, fetching a new one shortly before it expires"""
+        async with self._token_lock:
+            if self._token and time.time() < self._token_expiry - TOKEN_EXPIRY_MARGIN:
+                return self._token
+            if cassette.replaying():
+                # Replayed requests are matched without their auth header, so no service account is needed
+                return "replay-token"
+
+            creds = self._load_credentials()
+            client = self.http_client or get_http_client()
+            response = await client.post(
+                creds.get("token_uri", DEFAULT_TOKEN_URI),
+                data={
+                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                    "assertion": self._sign_assertion()
+                },
+                timeout=15.0
+            )
+            if response.status_code != 200:
+                raise ValueError(f"Google Auth Error ({response.status_code}): {response.text}")
+
+            data = response.json()
+            self._token = data["access_token"]
+            self._token_expiry = time.time() + int(data.get("expires_in", 3600))
+            return self._token
+
+    async def _api_get(self, url, params=None):
+        """GET a Sheets/Drive URL with the cached bearer token under the concurrency limit"""
+        client = self.http_client or get_http_client()
+        async with self._semaphore:
+            for attempt in range(2):
+                token = await self._get_access_token()
+                response = await client.get(
+                    url,
+                    params=params,
+                    headers={"Authorization": f"Bearer {token}"},
+                    timeout=15.0
+                )
+                # A revoked or expired token: drop it and retry once with a fresh one
+                if response.status_code == 401 and attempt == 0:
+                    self._token = None
+                    continue
+                response.raise_for_status()
+                return response.json()
+
+    async def _get_spreadsheet_id(self):
+        # Looking the spreadsheet up by name is a Drive query, so resolve it only once
+        if not self.spreadsheet_id:
+            data = await self._api_get(DRIVE_API, params={
+                "q": f"name = '{self.sheet_name}' and mimeType = 'application/vnd.google-apps.spreadsheet' and trashed = false",
+                "fields": "files(id)",
+                "pageSize": 1,
+                "supportsAllDrives": "true",
+                "includeItemsFromAllDrives": "true"
+            })
+            files = data.get("files", [])
+            if not files:
+                raise ValueError(f"Spreadsheet {self.sheet_name} not found or not shared with the service account")
+            self.spreadsheet_id = files[0]["id"]
+        return self.spreadsheet_id
+
+    async def _batch_get(self):
+        """Download every configured range in a single values:batchGet call"""
+        spreadsheet_id = await self._get_spreadsheet_id()
+        params = [("ranges", r) for r in self.ranges.values()]
+        params.append(("majorDimension", "ROWS"))
         try:
-            # Strip whitespace from first column to avoid index issues
-            df[0] = df[0].str.strip()
-            
-            # Find the section start
-            matches = df[df[0] == section_name].index
-            if len(matches) == 0:
-                logger.warning(f"Section {section_name} not found in sheet")
-                return 0.0, 0.0
-            
-            start_idx = matches[0]
-            
-            # Find end of section
-            end_idx = start_idx + 1
-            while end_idx < len(df) and any(df.iloc[end_idx]):
-                end_idx += 1
-            
-            # Extract rows of the section (skip header)
-            section_rows = df.iloc[start_idx+2:end_idx]
-            
-            # Find Average row
-            avg_row = section_rows[section_rows[0].str.contains("Average", na=False)]
-            
-            if avg_row.empty:
-                logger.warning(f"Average row not found in section {section_name}")
-                return 0.0, 0.0
-                
-            dev_avg = float(avg_row[1].values[0]) if avg_row[1].values[0] else 0.0
-            qa_avg = float(avg_row[2].values[0]) if avg_row[2].values[0] else 0.0
-            
-            return dev_avg, qa_avg
+            response = await self._api_get(f"{SHEETS_API}/{spreadsheet_id}/values:batchGet", params=params)
+        except Exception:
+            # Re-resolve the spreadsheet by name next time in case it was replaced
+            if not os.getenv("GSHEETS_SPREADSHEET_ID"):
+                self.spreadsheet_id = None
+            raise
+
+        # valueRanges come back in the same order as the requested ranges
+        value_ranges = response.get("valueRanges", [])
+        snapshot = {}
+        for i, name in enumerate(self.ranges):
+            values = value_ranges[i].get("values", []) if i < len(value_ranges) else []
+            snapshot[name] = _fill_gaps(values)
+        return snapshot
+
+    async def _get_version(self):
+        """Cheap change signal: the Drive modifiedTime of the spreadsheet"""
+        try:
+            spreadsheet_id = await self._get_spreadsheet_id()
+            data = await self._api_get(f"{DRIVE_API}/{spreadsheet_id}", params={
+                "fields": "modifiedTime",
+                "supportsAllDrives": "true"
+            })
+            return data.get("modifiedTime")
         except Exception as e:
-            logger.error(f"Error parsing section {section_name}: {e}")
-            return 0.0, 0.0
+            # Without a version we cannot prove the sheet is unchanged, so re-download
+            logger.warning(f"Could not read spreadsheet modifiedTime: {e}")
+            return None
+
+    async def _get_snapshot(self):
+        """Return the cached batch read, revalidating it once per SNAPSHOT_TTL.
+
+        On expiry only the Drive modifiedTime is fetched; the full tabs are
+        downloaded again only when it changed. The lock makes concurrent
+        dashboard requests share a single check and download.
+        """
+        async with self._snapshot_lock:
+            if self._snapshot is not None and time.time() - self._snapshot_at < SNAPSHOT_TTL:
+                return self._snapshot
+
+            version = await self._get_version()
+            if self._snapshot is not None and version is not None and version == self._snapshot_version:
+                logger.debug(f"Spreadsheet unchanged since {version}, reusing snapshot")
+                self._snapshot_at = time.time()
+                return self._snapshot
+
+            self._snapshot = await self._batch_get()
+            self._snapshot_at = time.time()
+            self._snapshot_version = version
+            self._parsed = {}
+            return self._snapshot
+
+    def invalidate_snapshot(self):
+        """Forget the batch read so the next request downloads the tabs again"""
+        self._snapshot = None
+        self._snapshot_version = None
+        self._parsed = {}
+
+    async def _get_parsed(self, name, parser):
+        """Run parser over the current snapshot, reusing the result until the sheet changes"""
+        snapshot = await self._get_snapshot()
+        if name not in self._parsed:
+            with tracing.span("parse", name):
+                self._parsed[name] = parser(snapshot)
+        return self._parsed[name]
 
     async def get_sheet_data(self):
         try:
-            all_values = await asyncio.to_thread(self._get_all_values_sync, self.tab_name)
-            df = pd.DataFrame(all_values)
+            sections = await self._get_parsed("sections", lambda snapshot: parse_section_averages(snapshot["progress"]))
 
-            pcs_dev, pcs_qa = self.get_section_average(df, "PCS")
-            cloud_dev, cloud_qa = self.get_section_average(df, "Cloud")
-            app_dev, app_qa = self.get_section_average(df, "APP")
+            pcs_dev, pcs_qa = sections["PCS"]
+            cloud_dev, cloud_qa = sections["Cloud"]
+            app_dev, app_qa = sections["APP"]
 
             return {
                 "pcs": {"development": pcs_dev, "qa": pcs_qa},
@@ -178,7 +394,8 @@ class GSheetsClient:
 
     async def get_test_coverage(self):
         try:
-            all_values = await asyncio.to_thread(self._get_all_values_sync, "Sheet2")
+            snapshot = await self._get_snapshot()
+            all_values = snapshot["coverage"]
             if not all_values:
                 return {"status": "success", "data": [], "timeline": {}}
             
@@ -218,7 +435,8 @@ class GSheetsClient:
     async def get_qa_timeline(self):
         """Specifically fetch the QA timeline data from Sheet2"""
         try:
-            all_values = await asyncio.to_thread(self._get_all_values_sync, "Sheet2")
+            snapshot = await self._get_snapshot()
+            all_values = snapshot["coverage"]
             if not all_values or len(all_values) < 4:
                 return {}
             
@@ -234,4 +452,12 @@ class GSheetsClient:
             logger.error(f"Failed to fetch QA timeline: {e}")
             return {}
 
-gsheets = GSheetsClient()
+_gsheets = None
+
+
+def get_gsheets():
+    """Shared GSheetsClient, created on first use rather than at import time"""
+    global _gsheets
+    if _gsheets is None:
+        _gsheets = GSheetsClient()
+    return _gsheets
@@ -0,0 +1,119 @@
+import os
+import re
+import time
+import httpx
+from collections import deque
+
+import admission
+import cassette
+import metrics
+import tracing
+
+# Shared connection pool for upstream APIs. Creating an AsyncClient per call pays
+# a fresh TCP + TLS handshake every time; one process-wide client keeps them alive.
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+
+_client = None
+
+# Start times of recent upstream calls per service, for the cache's call budget
+RATE_WINDOW = 60.0
+_recent_calls = {}  # upstream -> deque of monotonic timestamps
+
+# Collapse IDs and keys in upstream paths so metric label sets stay small
+_PATH_PATTERNS = [
+    (re.compile(r"/spreadsheets/[^/]+"), "/spreadsheets/{id}"),
+    (re.compile(r"/files/[^/]+"), "/files/{id}"),
+    (re.compile(r"/project/[^/]+"), "/project/{key}"),
+    (re.compile(r"/issue/[^/]+"), "/issue/{key}"),
+    # Numeric IDs, but not the API version in /rest/api/3
+    (re.compile(r"(?<!/api)/\d+(?=/|$)"), "/{id}"),
+]
+
+
+def upstream_label(path):
+    """(service, normalized path) for an upstream URL path"""
+    for pattern, replacement in _PATH_PATTERNS:
+        path = pattern.sub(replacement, path)
+    if path.startswith("/rest/"):
+        return "jira", path
+    if path.startswith("/v4/spreadsheets"):
+        return "sheets", path
+    if path.startswith("/drive/"):
+        return "drive", path
+    if path == "/token":
+        return "google-oauth", path
+    return "other", path
+
+
+def _count_call(upstream):
+    calls = _recent_calls.setdefault(upstream, deque())
+    calls.append(time.monotonic())
+    # Trim on write too, so an unread service does not grow without bound
+    while calls[0] < calls[-1] - RATE_WINDOW:
+        calls.popleft()
+
+
+def upstream_call_rate(upstream):
+    """Calls to an upstream service over the last minute"""
+    calls = _recent_calls.get(upstream)
+    if not calls:
+        return 0
+    cutoff = time.monotonic() - RATE_WINDOW
+    while calls and calls[0] < cutoff:
+        calls.popleft()
+    return len(calls)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Records count, latency and in-flight gauge for every upstream call"""
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    async def handle_async_request(self, request):
+        upstream, path = upstream_label(request.url.path)
+        metrics.upstream_in_flight.inc(upstream)
+        _count_call(upstream)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.upstream_in_flight.dec(upstream)
+            metrics.upstream_request_duration.observe(elapsed, upstream, request.method, path)
+            metrics.upstream_requests.inc(upstream, request.method, path, status)
+            tracing.record(upstream, elapsed * 1000, f"{request.method} {path} {status}")
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        # Cassette record/replay sits under the instrumentation so replays still show up in metrics and traces.
+        # Admission control sits on top so time spent queued is not counted as upstream latency.
+        _client = httpx.AsyncClient(
+            transport=admission.AdmissionTransport(InstrumentedTransport(cassette.wrap(transport)), admission.controller),
+            timeout=15.0
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared AsyncClient (called on application shutdown)"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,141 @@
+import os
+import sys
+from datetime import datetime
+
+# Jira Cloud's sprint custom field
+SPRINT_FIELD = os.getenv("JIRA_SPRINT_FIELD", "customfield_10020")
+
+
+def _name(value, attribute="name"):
+    """Interned name of a nested Jira object ({"name": ...}), or None"""
+    if not value:
+        return None
+    name = value.get(attribute)
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def adf_to_text(node):
+    """Plain text of an Atlassian Document Format node (or a plain string description)"""
+    if not node:
+        return ""
+    if isinstance(node, str):
+        return node
+    if node.get("type") == "text":
+        return node.get("text", "")
+    if node.get("type") == "hardBreak":
+        return "\n"
+    parts = [adf_to_text(child) for child in node.get("content", [])]
+    # Text runs join up within a paragraph or heading; block nodes each get their own line
+    separator = "" if node.get("type") in ("paragraph", "heading") else "\n"
+    return separator.join(part for part in parts if part)
+
+
+def timestamp(value):
+    """Epoch seconds of a Jira timestamp such as "2025-03-01T10:00:00.000+0500" """
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z").timestamp()
+
+
+def _sprint_ids(value):
+    """Sprint IDs from a Sprint changelog value such as "1003, 1004" """
+    return tuple(int(item) for item in (value or "").split(",") if item.strip())
+
+
+def transitions(changelog):
+    """Status and sprint changes in an expanded changelog, oldest first.
+
+    Each is (epoch seconds, "status", from status id, to status id) or
+    (epoch seconds, "sprint", from sprint ids, to sprint ids); every other
+    field change is dropped. None if the changelog was cut short: a search
+    embeds at most 100 histories per issue and says how many there are in
+    `total`.
+    """
+    histories = changelog.get("histories") or []
+    if changelog.get("total", len(histories)) > len(histories):
+        return None
+    events = []
+    for history in histories:
+        at = timestamp(history["created"])
+        for item in history.get("items") or []:
+            field = item.get("field")
+            if field == "status":
+                events.append((at, "status", _name(item, "from"), _name(item, "to")))
+            elif field == "Sprint":
+                events.append((at, "sprint", _sprint_ids(item.get("from")), _sprint_ids(item.get("to"))))
+    events.sort(key=lambda event: event[0])
+    return tuple(events)
+
+
+class Issue:
+    """One Jira issue flattened to the fields the dashboard reads.
+
+    Jira returns every issue as nested JSON with self links, avatar URLs and
+    icon URLs; kept as is, that is a few KB per issue. Issues are converted
+    with from_jira() as each page arrives and the raw dict is dropped.
+    Statuses, priorities, people and project names repeat across thousands
+    of issues, so they are interned and share one string object each.
+    Fields the search did not ask for are None, as is `changelog` unless
+    the search expanded it.
+    """
+
+    __slots__ = (
+        "key", "id", "summary", "issuetype",
+        "status", "status_id", "status_category",
+        "priority", "resolution", "assignee", "reporter",
+        "project_key", "project_id", "project_name", "parent_id",
+        "created", "updated", "resolutiondate", "duedate",
+        "components", "labels", "fix_versions", "description", "environment",
+        "sprint_ids", "changelog",
+    )
+
+    # Jira field names (as used in ORDER BY) -> attribute
+    FIELD_ATTRIBUTES = {"issuekey": "key", "project": "project_key", "parent": "parent_id"}
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_jira(cls, raw):
+        fields = raw.get("fields") or {}
+        status = fields.get("status") or {}
+        project = fields.get("project") or {}
+        parent = fields.get("parent") or {}
+        issue = cls.__new__(cls)
+        issue.key = raw.get("key")
+        issue.id = raw.get("id")
+        issue.summary = fields.get("summary")
+        issue.issuetype = _name(fields.get("issuetype"))
+        issue.status = _name(status)
+        issue.status_id = _name(status, "id")
+        issue.status_category = _name(status.get("statusCategory"))
+        issue.priority = _name(fields.get("priority"))
+        issue.resolution = _name(fields.get("resolution"))
+        issue.assignee = _name(fields.get("assignee"), "displayName")
+        issue.reporter = _name(fields.get("reporter"), "displayName")
+        issue.project_key = _name(project, "key")
+        issue.project_id = _name(project, "id")
+        issue.project_name = _name(project)
+        issue.parent_id = _name(parent, "id")
+        issue.created = fields.get("created")
+        issue.updated = fields.get("updated")
+        issue.resolutiondate = fields.get("resolutiondate")
+        issue.duedate = fields.get("duedate")
+        components = fields.get("components")
+        issue.components = tuple(_name(c) for c in components) if components is not None else None
+        labels = fields.get("labels")
+        issue.labels = tuple(sys.intern(label) for label in labels) if labels is not None else None
+        versions = fields.get("fixVersions")
+        issue.fix_versions = tuple(_name(v) for v in versions) if versions is not None else None
+        issue.description = adf_to_text(fields["description"]) if "description" in fields else None
+        issue.environment = adf_to_text(fields["environment"]) if "environment" in fields else None
+        sprints = fields.get(SPRINT_FIELD)
+        issue.sprint_ids = tuple(s["id"] for s in sprints if isinstance(s, dict)) if sprints is not None else None
+        issue.changelog = transitions(raw["changelog"]) if "changelog" in raw else None
+        return issue
+
+    def field(self, name):
+        """Value of a Jira field by its JQL name, e.g. for re-applying an ORDER BY"""
+        return getattr(self, self.FIELD_ATTRIBUTES.get(name.lower(), name.lower()), None)
+
+    def __repr__(self):
+        return f"Issue({self.key!r}, status={self.status!r})"
@@ -1,57 +1,438 @@
 import os
+import re
+import asyncio
+from datetime import date, timedelta
+from contextlib import asynccontextmanager
 import httpx
 from dotenv import load_dotenv
 
+import cache
+import cassette
+import metrics
+import tracing
+from aggregate import Aggregation, Count, Sum, TopK
+from http_client import get_http_client
+from issues import Issue, SPRINT_FIELD, adf_to_text, transitions
+
 load_dotenv()
 
+# Upper bound on issues fetched for one list view; pages of it are served with cursors
+MAX_LIST_ISSUES = int(os.getenv("JIRA_MAX_LIST_ISSUES", 5000))
+# Upper bound on issues streamed through one aggregation (counted, never held)
+AGGREGATE_MAX_ISSUES = int(os.getenv("JIRA_AGGREGATE_MAX_ISSUES", 20000))
+
+# Split "project = SSSS,JI" searches into concurrent per-project queries cached per project
+SPLIT_PROJECT_QUERIES = os.getenv("JIRA_SPLIT_PROJECT_QUERIES", "true").lower() == "true"
+PROJECT_SEARCH_TTL = int(os.getenv("JIRA_PROJECT_SEARCH_TTL", 60))
+
+# Large searches can be split into created-date windows paged concurrently
+PARTITIONED_SEARCH = os.getenv("JIRA_PARTITIONED_SEARCH", "true").lower() == "true"
+SEARCH_PARTITIONS = int(os.getenv("JIRA_SEARCH_PARTITIONS", 8))
+PARTITION_CONCURRENCY = int(os.getenv("JIRA_PARTITION_CONCURRENCY", 4))
+PARTITION_REFINE_ROUNDS = 2
+# Partition grids are counted from here, so window bounds do not move with today's date
+GRID_EPOCH = date(2000, 1, 1)
+SEARCH_PAGE_SIZE = 100
+
+# Fields too heavy to ship with every list response; fetched per issue on demand
+DETAIL_FIELDS = ["description", "environment", "labels", "components", "fixVersions", "assignee", "reporter", "project"]
+
+
+def _project_list(jql):
+    """(clause, [project, ...]) for a comma-separated `project = A,B` clause, else None"""
+    match = re.search(r"project\s*=\s*(['\"]?)([^'\"\s&]+)\1", jql)
+    if not match or "," not in match.group(2):
+        return None
+    return match.group(0), [p.strip() for p in match.group(2).split(",")]
+
+
+def _project_in(projects):
+    return "project in (" + ",".join(f"'{p}'" for p in projects) + ")"
+
+
+def _severity(issue):
+    return issue.priority or "Medium"
+
+
+def _merge_ordered(issues, order):
+    """Re-apply a JQL `ORDER BY field [ASC|DESC]` match to issues merged from several searches"""
+    if not order:
+        return issues
+    field = order.group(1)
+    descending = (order.group(2) or "ASC").upper() == "DESC"
+    present = [i for i in issues if i.field(field) is not None]
+    missing = [i for i in issues if i.field(field) is None]
+    # sort() is stable, so equal values keep their merged order; Jira puts empty values last
+    present.sort(key=lambda i: i.field(field), reverse=descending)
+    return present + missing
+
+
+def _created_lower_bound(jql):
+    """Earliest created date a JQL filter allows (created >= 'YYYY-MM-DD' or -Nd), if it says"""
+    absolute = re.search(r"created(?:Date)?\s*>=\s*['\"]?(\d{4}-\d{2}-\d{2})", jql, re.IGNORECASE)
+    if absolute:
+        return date.fromisoformat(absolute.group(1))
+    relative = re.search(r"created(?:Date)?\s*>=\s*-(\d+)d", jql, re.IGNORECASE)
+    if relative:
+        return date.today() - timedelta(days=int(relative.group(1)))
+    return None
+
+
+def _rejected_keys(response, issue_keys):
+    """Keys among issue_keys that a failed Jira search names in its error messages"""
+    try:
+        messages = response.json().get("errorMessages") or []
+    except ValueError:
+        return set()
+    named = {key for message in messages for key in re.findall(r"'([A-Za-z][A-Za-z0-9_]*-\d+)'", message)}
+    return named & set(issue_keys)
+
+
+def _window_jql(filter_jql, start, end):
+    """Restrict a JQL filter to created in [start, end); None leaves that side open"""
+    clauses = [f"({filter_jql})"]
+    if start is not None:
+        clauses.append(f"created >= '{start.isoformat()}'")
+    if end is not None:
+        clauses.append(f"created < '{end.isoformat()}'")
+    return " AND ".join(clauses)
+
+
 class JiraClient:
+    # Epic mappings based on user info
+    EPIC_MAP = {
+        "APP": [84757, 84760],
+        "CLOUD": [84756, 84759],
+        "PCS": [84758, 84793]
+    }
+
     def __init__(self):
         self.domain = os.getenv("JIRA_DOMAIN")
         self.email = os.getenv("JIRA_EMAIL")
         self.token = os.getenv("JIRA_API_TOKEN")
+        if cassette.replaying():
+            # Replayed responses are matched without auth, but requests still need credentials to be built
+            self.email = self.email or "replay@example.com"
+            self.token = self.token or "replay-token"
         
         if not all([self.domain, self.email, self.token]):
             print("Warning: JIRA credentials not set in .env")
 
-        self.base_url = f"https://{self.domain}/rest/api/2"
+        # JIRA_BASE_URL overrides the site, e.g. to point at the local benchmark stand-in
+        self.site_url = os.getenv("JIRA_BASE_URL") or f"https://{self.domain}"
+        self.base_url = f"{self.site_url}/rest/api/2"
         self.auth = (self.email, self.token)
         self.headers = {"Accept": "application/json"}
 
+    @asynccontextmanager
+    async def _client(self):
+        # Borrow the shared pooled client; it is closed on app shutdown, not per call
+        yield get_http_client()
+
+    async def _iter_issue_pages(self, client, url, params, page_size=100, max_issues=None):
+        """Yield each page of an issue listing, as Issue records, as soon as it arrives.
+
+        Handles both the nextPageToken paging of /search/jql and the startAt
+        paging of the Agile board and sprint issue APIs.
+        """
+        fetched = 0
+        params = {**params, "maxResults": page_size}
+        while max_issues is None or fetched < max_issues:
+            response = await client.get(url, auth=self.auth, params=params, headers=self.headers, timeout=20.0)
+            if response.status_code != 200:
+                print(f"Jira API Error ({response.status_code}): {response.text}")
+                response.raise_for_status()
+            data = response.json()
+            page = [Issue.from_jira(issue) for issue in data.pop("issues", [])]
+            fetched += len(page)
+            yield page
+
+            if data.get("nextPageToken"):
+                params["nextPageToken"] = data["nextPageToken"]
+            elif "startAt" in data and not data.get("isLast") and page and data.get("startAt", 0) + len(page) < data.get("total", 0):
+                params["startAt"] = data.get("startAt", 0) + len(page)
+            else:
+                break
+
+    async def _get_all_issues(self, client, url, params, page_size=100):
+        """GET every page of an issue listing, up to MAX_LIST_ISSUES"""
+        issues = []
+        async for page in self._iter_issue_pages(client, url, params, page_size, MAX_LIST_ISSUES):
+            issues.extend(page)
+        return issues[:MAX_LIST_ISSUES]
+
+    async def _search_jql_per_project(self, jql: str, project_clause: str, projects: list, fields: list, max_results: int):
+        """Run a multi-project search as one concurrent query per project and merge them.
+
+        Each project's result is cached on its own (tagged project:<key>), so a
+        change in one project only refetches that project. Inside a cache
+        refresh only results fetched during that refresh are reused, and a
+        failed project search raises rather than being cached as a short result.
+
+        With an ORDER BY every project is fetched up to max_results, and the
+        merge re-applies the ordering (ties keep project order) before cutting,
+        which is what the combined `project in (...)` query would return.
+        Without one any max_results issues are a correct answer, so projects
+        share the budget and only projects that filled their share are topped
+        up when the others came back short.
+        """
+        order = re.search(r"ORDER BY\s+(\w+)(?:\s+(ASC|DESC))?", jql, re.IGNORECASE)
+        if order and fields and order.group(1) not in fields:
+            # The merge needs the sort field even if the caller does not
+            fields = list(fields) + [order.group(1)]
+        field_key = tuple(fields or ())
+        project_jql = {project: jql.replace(project_clause, f"project = '{project}'") for project in projects}
+
+        async def fetch(missing):
+            results = await asyncio.gather(
+                *(self._search_jql(query, list(query_fields) or None, limit, raise_errors=True)
+                  for _, query, query_fields, limit in missing)
+            )
+            return dict(zip(missing, results))
+
+        async def search(budgets):
+            queries = [(project, project_jql[project], field_key, limit) for project, limit in budgets.items()]
+            partials = await cache.cached_batch(
+                "jira_project_search",
+                queries,
+                fetch,
+                ttl=PROJECT_SEARCH_TTL,
+                tags=lambda query, result: (f"project:{query[0]}",)
+            )
+            return {query[0]: partials[query]["issues"] for query in queries}
+
+        if order:
+            results = await search({project: max_results for project in projects})
+        else:
+            budget = -(-max_results // len(projects))
+            results = await search({project: budget for project in projects})
+            # Projects that filled their share may have more; give them what the short ones left over
+            while True:
+                full = [p for p in projects if len(results[p]) >= budget]
+                shortfall = max_results - sum(len(issues) for issues in results.values())
+                if not full or shortfall <= 0:
+                    break
+                budget += -(-shortfall // len(full))
+                results.update(await search({project: budget for project in full}))
+
+        issues = _merge_ordered([issue for project in projects for issue in results[project]], order)[:max_results]
+        return {"issues": issues, "total": len(issues)}
+
+    async def _approximate_count(self, jql: str):
+        """Jira's approximate match count for a JQL filter, or None if it is unavailable"""
+        async with self._client() as client:
+            try:
+                response = await client.post(
+                    f"{self.site_url}/rest/api/3/search/approximate-count",
+                    auth=self.auth,
+                    json={"jql": jql},
+                    headers=self.headers,
+                    timeout=15.0
+                )
+                if response.status_code != 200:
+                    return None
+                return int(response.json().get("count", 0))
+            except Exception as e:
+                print(f"Approximate count error: {e}")
+                return None
+
+    async def _plan_partitions(self, filter_jql: str, start: date, total: int):
+        """Cut the created dates from `start` on into windows of roughly equal issue counts.
+
+        Windows are cells of a fixed grid: a power-of-two number of days
+        wide, counted from GRID_EPOCH, so the same filter plans the same
+        JQL from one day to the next and recorded cassettes keep matching.
+        Begins with about SEARCH_PARTITIONS cells, halves the ones holding
+        more than twice their share, then joins neighbours that together
+        still fit in one share. Only one half of a split cell and all but
+        the newest cell are counted; the rest is derived from the counts
+        already known. Returns a list of (from_date or None, to_date or
+        None, count), oldest first, with both outer windows left open, or
+        None if a count failed.
+        """
+        target = max(SEARCH_PAGE_SIZE, -(-total // SEARCH_PARTITIONS))
+        today = date.today()
+        span = max(1, (today - start).days + 1)
+        step = 1
+        while step * SEARCH_PARTITIONS < span:
+            step *= 2
+        first = GRID_EPOCH + timedelta(days=(start - GRID_EPOCH).days // step * step)
+        windows = []
+        lo = first
+        while lo <= today:
+            windows.append((lo, lo + timedelta(days=step)))
+            lo += timedelta(days=step)
+        last = windows[-1][1]
+
+        async def count(window):
+            lo, hi = window
+            return await self._approximate_count(
+                _window_jql(filter_jql, None if lo == first else lo, None if hi == last else hi))
+
+        counts = list(await asyncio.gather(*(count(w) for w in windows[:-1])))
+        if None in counts:
+            return None
+        counts.append(max(0, total - sum(counts)))
+        for _ in range(PARTITION_REFINE_ROUNDS):
+            heavy = [i for i, (w, c) in enumerate(zip(windows, counts)) if c > 2 * target and (w[1] - w[0]).days > 1]
+            if not heavy:
+                break
+            halves = {i: (windows[i][0], windows[i][0] + (windows[i][1] - windows[i][0]) / 2) for i in heavy}
+            lower_counts = await asyncio.gather(*(count(halves[i]) for i in heavy))
+            if None in lower_counts:
+                return None
+            lower_counts = dict(zip(heavy, lower_counts))
+            refined_windows, refined_counts = [], []
+            for i, (window, c) in enumerate(zip(windows, counts)):
+                if i in halves:
+                    lower = min(c, lower_counts[i])
+                    refined_windows += [halves[i], (halves[i][1], window[1])]
+                    refined_counts += [lower, c - lower]
+                else:
+                    refined_windows.append(window)
+                    refined_counts.append(c)
+            windows, counts = refined_windows, refined_counts
+
+        planned = []
+        for (lo, hi), c in zip(windows, counts):
+            if planned and planned[-1][2] + c <= target:
+                planned[-1] = (planned[-1][0], hi, planned[-1][2] + c)
+            else:
+                planned.append((lo, hi, c))
+        # Open both ends: the filter bounds the start, and the newest window runs on past today
+        planned[0] = (None, planned[0][1], planned[0][2])
+        planned[-1] = (planned[-1][0], None, planned[-1][2])
+        return planned
+
+    async def _partition_windows(self, filter_jql: str, max_results: int):
+        """Planned windows (see _plan_partitions) for a filter worth partitioning, or None to search serially.
+
+        A filter needs a created lower bound to cut from, and more matches (and
+        max_results) than SEARCH_PARTITIONS pages; the count API must answer.
+        """
+        start = _created_lower_bound(filter_jql)
+        if start is None or start >= date.today():
+            return None
+        total = await self._approximate_count(filter_jql)
+        if total is None or min(total, max_results) <= SEARCH_PAGE_SIZE * SEARCH_PARTITIONS:
+            return None
+        return await self._plan_partitions(filter_jql, start, total)
+
+    async def _search_jql_partitioned(self, jql: str, fields: list, max_results: int, raise_errors: bool = False):
+        """Search by disjoint created-date windows whose pages are fetched concurrently.
+
+        Token paging is serial, so a 2000-issue pull is 20 round trips in a row;
+        split into N windows it is about 20/N round trips deep. Searches that
+        fit in SEARCH_PARTITIONS pages stay serial, since planning costs a
+        round of count calls. Windows are fetched newest or oldest first to
+        match a created ordering and stop once max_results is covered; the
+        merge deduplicates by key and re-applies the ORDER BY. A failed
+        window raises, as the merge would otherwise be silently short.
+        """
+        order = re.search(r"ORDER BY\s+(\w+)(?:\s+(ASC|DESC))?", jql, re.IGNORECASE)
+        filter_jql = jql[:order.start()].strip() if order else jql
+        order_clause = jql[order.start():] if order else ""
+        if order and fields and order.group(1) not in fields:
+            fields = list(fields) + [order.group(1)]
+
+        windows = await self._partition_windows(filter_jql, max_results)
+        if windows is None:
+            return await self._search_jql(jql, fields, max_results, raise_errors=raise_errors)
+
+        newest_first = bool(order) and order.group(1).lower() == "created" and (order.group(2) or "ASC").upper() == "DESC"
+        if newest_first:
+            windows.reverse()
+        # Only a created ordering (or none) lets us skip windows past max_results
+        can_stop_early = not order or order.group(1).lower() == "created"
+
+        semaphore = asyncio.Semaphore(PARTITION_CONCURRENCY)
+
+        async def fetch(window):
+            async with semaphore:
+                query = _window_jql(filter_jql, window[0], window[1]) + (f" {order_clause}" if order_clause else "")
+                return await self._search_jql(query, fields, max_results, raise_errors=True)
+
+        results = []
+        remaining = list(windows)
+        with tracing.span("partitioned_search", f"{len(windows)} windows"):
+            while remaining:
+                batch = remaining
+                if can_stop_early:
+                    # Take windows until their (approximate) counts cover max_results, then check
+                    covered, cut = sum(len(r["issues"]) for r in results), 0
+                    while cut < len(remaining) and covered < max_results:
+                        covered += remaining[cut][2] or 1
+                        cut += 1
+                    batch = remaining[:max(cut, 1)]
+                remaining = remaining[len(batch):]
+                results.extend(await asyncio.gather(*(fetch(w) for w in batch)))
+                if sum(len(r["issues"]) for r in results) >= max_results:
+                    break
+
+        seen = set()
+        issues = []
+        for result in results:
+            for issue in result["issues"]:
+                if issue.key not in seen:
+                    seen.add(issue.key)
+                    issues.append(issue)
+        issues = _merge_ordered(issues, order)[:max_results]
+        return {"issues": issues, "total": len(issues)}
+
     async def _search_jql(self, jql: str, fields: list = None, max_results: int = 50):
         if not self.token:
             return {"issues": []}
 
-    async def _search_jql(self, jql: str, fields: list = None, max_results: int = 50):
+    async def _search_jql(self, jql: str, fields: list = None, max_results: int = 50, partitioned: bool = False, raise_errors: bool = False):
+        """Search issues by JQL. An API error ends the search with what was fetched so far, or is raised with raise_errors."""
         if not self.token:
             return {"issues": [], "total": 0}
 
+        if partitioned and PARTITIONED_SEARCH and max_results > SEARCH_PAGE_SIZE * SEARCH_PARTITIONS:
+            return await self._search_jql_partitioned(jql, fields, max_results, raise_errors)
+
+        # Handle comma-separated projects
+        projects = _project_list(jql)
+        if projects:
+            clause, p_list = projects
+            if SPLIT_PROJECT_QUERIES:
+                return await self._search_jql_per_project(jql, clause, p_list, fields, max_results)
+            jql = jql.replace(clause, _project_in(p_list))
+
         all_issues = []
+        try:
+            async for page in self._iter_search_pages(jql, fields, max_results):
+                all_issues.extend(page)
+        except Exception as e:
+            print(f"Jira API Error: {e}")
+            if raise_errors:
+                raise
+        return {"issues": all_issues, "total": len(all_issues)}
+
+    async def _iter_search_pages(self, jql: str, fields: list = None, max_results: int = None, expand: str = None):
+        """Yield each page of a /search/jql search, as Issue records, as soon as it arrives.
+
+        An API error is raised after the pages already yielded; callers that
+        can use a partial result catch it.
+        """
+        fetched = 0
         next_token = None
-        page_size = 100
+        pages = 0
 
-        # Handle comma-separated projects
-        if "project =" in jql:
-            import re
-            match = re.search(r"project\s*=\s*(['\"]?)([^'\"\s&]+)\1", jql)
-            if match:
-                p_val = match.group(2)
-                if "," in p_val:
-                    p_list = [p.strip() for p in p_val.split(",")]
-                    p_in = "project in (" + ",".join([f"'{p}'" for p in p_list]) + ")"
-                    jql = jql.replace(match.group(0), p_in)
-
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
                 url = self.base_url.replace("/api/2", "/api/3") + "/search/jql"
                 
-                while len(all_issues) < max_results:
+                while max_results is None or fetched < max_results:
                     payload = {
                         "jql": jql,
                         "fields": fields or ["summary", "status", "assignee", "priority", "created", "resolutiondate", "parent", "project"],
-                        "maxResults": min(page_size, max_results - len(all_issues))
+                        "maxResults": SEARCH_PAGE_SIZE if max_results is None else min(SEARCH_PAGE_SIZE, max_results - fetched)
                     }
                     if next_token:
                         payload["nextPageToken"] = next_token
+                    if expand:
+                        payload["expand"] = expand
 
                     response = await client.post(
                         url,
@@ -64,16 +445,19 @@ class JiraClient:
                     if response.status_code >= 400:
                         print(f"DEBUG: {response.status_code} ERROR for JQL: {jql}")
                         print(f"DEBUG: Response: {response.text}")
-                        break
                     
                     response.raise_for_status()
                     data = response.json()
+                    pages += 1
                     
-                    issues = data.get("issues", [])
+                    issues = data.pop("issues", [])
                     if not issues:
                         break
                         
-                    all_issues.extend(issues)
+                    # Flatten each page on arrival so raw Jira JSON never piles up
+                    page = [Issue.from_jira(issue) for issue in issues]
+                    fetched += len(page)
+                    yield page
                     
                     if data.get("isLast") is True:
                         break
@@ -81,15 +465,65 @@ class JiraClient:
                     next_token = data.get("nextPageToken")
                     if not next_token:
                         break
+            finally:
+                metrics.jira_search_pages.observe(pages)
 
-                return {"issues": all_issues, "total": len(all_issues)}
-            except Exception as e:
-                print(f"Jira API Error: {e}")
-                return {"issues": all_issues, "total": len(all_issues)}
+    async def aggregate_search(self, jql: str, fields: list, max_results: int = AGGREGATE_MAX_ISSUES,
+                               partitioned: bool = False, **aggregates):
+        """Run a search through several aggregates in one pass as its pages stream in.
+
+        `aggregates` are aggregate.Count / TopK / Sum instances by name; returns
+        {name: result}. Issues are dropped once counted, so the cap can be far
+        above what a materialized list could afford. Comma-separated projects
+        are streamed one after another, in the order a split search merges them.
+        With `partitioned`, a large search is fetched in concurrent created-date
+        windows (see _search_jql_partitioned) that are counted in window order.
+        An API error is raised: partial counts would look like a complete answer.
+        """
+        aggregation = Aggregation(**aggregates)
+        if not self.token:
+            return aggregation.results()
+
+        projects = _project_list(jql)
+        queries = [jql.replace(projects[0], f"project = '{p}'") for p in projects[1]] if projects else [jql]
+        with tracing.span("aggregate", ", ".join(aggregates)):
+            windows = None
+            if partitioned and PARTITIONED_SEARCH and not projects:
+                windows = await self._partition_windows(jql, max_results)
+            if windows:
+                await self._aggregate_windows(aggregation, jql, fields, max_results, windows)
+                return aggregation.results()
+            for query in queries:
+                async for page in self._iter_search_pages(query, fields, max_results - aggregation.issues):
+                    aggregation.add_page(page)
+        return aggregation.results()
+
+    async def _aggregate_windows(self, aggregation, jql, fields, max_results, windows):
+        """Fetch windows concurrently and feed them to the aggregation oldest first, so group order is stable"""
+        semaphore = asyncio.Semaphore(PARTITION_CONCURRENCY)
+
+        async def collect(window):
+            async with semaphore:
+                issues = []
+                async for page in self._iter_search_pages(_window_jql(jql, window[0], window[1]), fields, max_results):
+                    issues.extend(page)
+                return issues
+
+        tasks = [asyncio.create_task(collect(window)) for window in windows]
+        try:
+            for task in tasks:
+                if aggregation.issues >= max_results:
+                    break
+                aggregation.add_page((await task)[:max_results - aggregation.issues])
+        finally:
+            # Windows past max_results, or left behind by an error, are not needed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def get_projects(self):
         if not self.token: return []
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
                 # Explicitly try v3 for projects
                 url = self.base_url.replace("/api/2", "/api/3") + "/project"
@@ -110,10 +544,10 @@ class JiraClient:
 
     async def get_boards(self, project_key: str):
         if not self.token: return []
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
                 # 1. Try strict filter
-                url = f"https://{self.domain}/rest/agile/1.0/board"
+                url = f"{self.site_url}/rest/agile/1.0/board"
                 try:
                     response = await client.get(
                         url,
@@ -163,9 +597,9 @@ class JiraClient:
                 
     async def get_board_columns(self, board_id: int):
         if not board_id: return []
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
-                url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/configuration"
+                url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/configuration"
                 response = await client.get(url, auth=self.auth, headers=self.headers, timeout=10.0)
                 if response.status_code == 200:
                    data = response.json()
@@ -192,9 +626,9 @@ class JiraClient:
         if not self.token:
             return {"id": None, "key": project_key}
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
-                url = f"https://{self.domain}/rest/api/3/project/{project_key}"
+                url = f"{self.site_url}/rest/api/3/project/{project_key}"
                 response = await client.get(
                     url,
                     auth=self.auth,
@@ -218,9 +652,9 @@ class JiraClient:
         if not project_id:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
-                url = f"https://{self.domain}/rest/agile/1.0/board"
+                url = f"{self.site_url}/rest/agile/1.0/board"
                 response = await client.get(
                     url,
                     auth=self.auth,
@@ -248,9 +682,9 @@ class JiraClient:
         if not board_id:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
-                url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/sprint"
+                url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/sprint"
                 response = await client.get(
                     url,
                     auth=self.auth,
@@ -275,42 +709,147 @@ class JiraClient:
                 print(f"Sprints by Board Error: {e}")
                 return []
 
-    async def get_sprint_issues_detailed(self, sprint_id: int) -> list:
-        """Fetch all issues in a specific sprint with full details"""
-        if not sprint_id:
-            return []
-        
-        async with httpx.AsyncClient() as client:
+    async def get_sprint(self, sprint_id: int) -> dict:
+        """One sprint's name, state and dates, or None if Jira does not know it"""
+        if not sprint_id or not self.token:
+            return None
+
+        async with self._client() as client:
             try:
-                url = f"https://{self.domain}/rest/agile/1.0/sprint/{sprint_id}/issue"
                 response = await client.get(
-                    url,
+                    f"{self.site_url}/rest/agile/1.0/sprint/{sprint_id}",
                     auth=self.auth,
-                    params={"maxResults": 100},
                     headers=self.headers,
                     timeout=10.0
                 )
-                if response.status_code == 200:
-                    data = response.json()
-                    issues = []
-                    for issue in data.get("issues", []):
-                        fields = issue.get("fields", {})
-                        issues.append({
-                            "key": issue.get("key"),
-                            "summary": fields.get("summary"),
-                            "status": fields.get("status", {}).get("name"),
-                            "assignee": fields.get("assignee", {}).get("displayName") if fields.get("assignee") else "Unassigned",
-                            "priority": fields.get("priority", {}).get("name") if fields.get("priority") else "None",
-                            "issuetype": fields.get("issuetype", {}).get("name"),
-                            "created": fields.get("created"),
-                            "components": [c.get("name") for c in fields.get("components", [])]
-                        })
-                    return issues
-                return []
+                if response.status_code != 200:
+                    return None
+                s = response.json()
+                return {
+                    "id": s["id"],
+                    "name": s["name"],
+                    "state": s["state"],
+                    "startDate": s.get("startDate"),
+                    "endDate": s.get("endDate"),
+                    "completeDate": s.get("completeDate")
+                }
+            except Exception as e:
+                print(f"Sprint Error: {e}")
+                return None
+
+    async def get_sprint_issues_detailed(self, sprint_id: int) -> list:
+        """Fetch all issues in a specific sprint with full details"""
+        if not sprint_id:
+            return []
+        
+        async with self._client() as client:
+            try:
+                raw_issues = await self._get_all_issues(client, *self._sprint_issues_query(sprint_id))
+                return [self._sprint_issue_row(issue) for issue in raw_issues]
             except Exception as e:
                 print(f"Sprint Issues Error: {e}")
                 return []
 
+    def _sprint_issues_query(self, sprint_id):
+        url = f"{self.site_url}/rest/agile/1.0/sprint/{sprint_id}/issue"
+        return url, {"fields": "summary,status,assignee,priority,issuetype,created,components"}
+
+    @staticmethod
+    def _sprint_issue_row(issue):
+        return {
+            "key": issue.key,
+            "summary": issue.summary,
+            "status": issue.status,
+            "assignee": issue.assignee or "Unassigned",
+            "priority": issue.priority or "None",
+            "issuetype": issue.issuetype,
+            "created": issue.created,
+            "components": list(issue.components or ())
+        }
+
+    async def iter_sprint_issues(self, sprint_id: int):
+        """Yield pages of sprint issue rows as Jira returns them, for streaming exports"""
+        if not sprint_id or not self.token:
+            return
+        async with self._client() as client:
+            async for page in self._iter_issue_pages(client, *self._sprint_issues_query(sprint_id)):
+                yield [self._sprint_issue_row(issue) for issue in page]
+
+    async def iter_issue_changelogs(self, jql: str):
+        """Yield pages of issues with their status and sprint history, expanded in bulk.
+
+        One search with expand=changelog returns a page of issues together
+        with their histories, instead of a changelog call per issue. Only an
+        issue with more histories than the search embeds has its changelog
+        fetched on its own. Errors are raised so an incremental sync knows
+        not to advance its cursor.
+        """
+        if not self.token:
+            return
+        fields = ["status", "created", "updated", SPRINT_FIELD]
+        async for page in self._iter_search_pages(jql, fields, expand="changelog"):
+            truncated = [issue for issue in page if issue.changelog is None]
+            changelogs = await asyncio.gather(*(self.get_issue_changelog(issue.key) for issue in truncated))
+            for issue, changelog in zip(truncated, changelogs):
+                issue.changelog = changelog
+            yield page
+
+    async def get_issue_changelog(self, issue_key: str):
+        """One issue's status and sprint changes (see issues.transitions), from every page of its changelog"""
+        histories = []
+        async with self._client() as client:
+            url = self.base_url.replace("/api/2", "/api/3") + f"/issue/{issue_key}/changelog"
+            params = {"startAt": 0, "maxResults": 100}
+            while True:
+                response = await client.get(url, auth=self.auth, params=params, headers=self.headers, timeout=20.0)
+                if response.status_code != 200:
+                    print(f"Jira API Error ({response.status_code}): {response.text}")
+                    response.raise_for_status()
+                data = response.json()
+                values = data.get("values") or []
+                histories.extend(values)
+                params["startAt"] += len(values)
+                if not values or data.get("isLast", params["startAt"] >= data.get("total", 0)):
+                    break
+        return transitions({"histories": histories})
+
+    async def get_issue_details(self, issue_keys: list) -> dict:
+        """Fetch the heavy fields (description etc.) for a set of issues in one search.
+
+        Jira rejects a whole `key in (...)` search when any key does not exist
+        (deleted, or moved to another project), so the search is retried
+        without the keys its error names; those are left out of the result.
+        """
+        issue_keys = list(issue_keys)
+        while issue_keys:
+            jql = f"key in ({','.join(issue_keys)})"
+            try:
+                data = await self._search_jql(jql, fields=DETAIL_FIELDS, max_results=len(issue_keys), raise_errors=True)
+                break
+            except httpx.HTTPStatusError as e:
+                rejected = _rejected_keys(e.response, issue_keys)
+                if e.response.status_code != 400 or not rejected:
+                    raise
+                print(f"Jira rejected issue keys {', '.join(sorted(rejected))}; retrying without them")
+                issue_keys = [key for key in issue_keys if key not in rejected]
+        else:
+            return {}
+
+        details = {}
+        for issue in data.get("issues", []):
+            details[issue.key] = {
+                "key": issue.key,
+                "project": issue.project_key,
+                "description": issue.description or "",
+                "environment": issue.environment or "",
+                "labels": list(issue.labels or ()),
+                "components": list(issue.components or ()),
+                "fixVersions": list(issue.fix_versions or ()),
+                "assignee": issue.assignee or "Unassigned",
+                "reporter": issue.reporter or "Unknown",
+            }
+        return details
+
     async def get_recent_issues(self, project_id: int, days: int = 30, board_id: int = None, issue_type: str = "Bug") -> dict:
         """
         Fetch issues of a specific type created in the last X days.
@@ -320,41 +859,9 @@ class JiraClient:
         if not project_id:
             return {"total": 0, "issues": [], "timeline": []}
 
-        # Build JQL query
-        jql = f"issuetype = '{issue_type}' AND created >= -{days}d"
-        if not board_id:
-            jql = f"project = {project_id} AND {jql}"
-        
-        jql += " ORDER BY created DESC"
-
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
-                # Determine URL based on whether we have a board ID
-                if board_id:
-                    url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/issue"
-                else:
-                    # Standard API search has been moved/deprecated in favor of /search/jql
-                    url = f"https://{self.domain}/rest/api/3/search/jql"
-
-                params = {
-                    "jql": jql,
-                    "fields": "key,summary,created,reporter,priority,status,description,issuetype",
-                    "maxResults": 200
-                }
-
-                response = await client.get(
-                    url,
-                    auth=self.auth,
-                    params=params,
-                    headers=self.headers,
-                    timeout=20.0
-                )
-                
-                if response.status_code != 200:
-                    print(f"Jira API Error ({response.status_code}): {response.text}")
-                    return {"total": 0, "issues": [], "timeline": []}
-
-                data = response.json()
+                raw_issues = await self._get_all_issues(client, *self._recent_issues_query(project_id, days, board_id, issue_type))
             except Exception as e:
                 print(f"Error fetching issues: {e}")
                 return {"total": 0, "issues": [], "timeline": []}
@@ -362,45 +869,15 @@ class JiraClient:
         issues = []
         timeline_map = {}
 
-        for issue in data.get("issues", []):
-            fields = issue.get("fields", {})
-            issue_key = issue.get("key")
-            
-            created = fields.get("created", "")
-            created_date = created.split("T")[0] if created else ""
-            
-            # Safely extract description
-            description = fields.get("description", "")
-            if isinstance(description, dict):
-                # Handle ADF (Atlassian Document Format)
-                content = description.get("content", [])
-                text_content = []
-                for p in content:
-                    if p.get("type") == "paragraph":
-                        for t in p.get("content", []):
-                            if t.get("type") == "text":
-                                text_content.append(t.get("text", ""))
-                description = " ".join(text_content)[:200]
-            elif isinstance(description, str):
-                description = description[:200]
-            else:
-                description = ""
-            
-            issue_data = {
-                "key": issue_key,
-                "summary": fields.get("summary", ""),
-                "description": description,
-                "reporter": fields.get("reporter", {}).get("displayName", "Unknown") if fields.get("reporter") else "Unknown",
-                "priority": fields.get("priority", {}).get("name", "None") if fields.get("priority") else "None",
-                "status": fields.get("status", {}).get("name", "Unknown"),
-                "created": created,
-                "createdDate": created_date
-            }
-            issues.append(issue_data)
+        with tracing.span("aggregate", "get_recent_issues"):
+            for issue in raw_issues:
+                issue_data = self._recent_issue_row(issue)
+                issues.append(issue_data)
             
-            # Count issues per day for timeline
-            if created_date:
-                timeline_map[created_date] = timeline_map.get(created_date, 0) + 1
+                # Count issues per day for timeline
+                created_date = issue_data["createdDate"]
+                if created_date:
+                    timeline_map[created_date] = timeline_map.get(created_date, 0) + 1
         
         # Convert timeline map to sorted list
         timeline = [
@@ -410,6 +887,44 @@ class JiraClient:
         
         return {"total": len(issues), "issues": issues, "timeline": timeline}
         
+    def _recent_issues_query(self, project_id, days, board_id, issue_type):
+        """URL and params for get_recent_issues: the Agile board API with a board, else JQL search"""
+        jql = f"issuetype = '{issue_type}' AND created >= -{days}d"
+        if not board_id:
+            jql = f"project = {project_id} AND {jql}"
+        
+        # Key breaks ties so the order, and therefore list cursors, stay stable
+        jql += " ORDER BY created DESC, key DESC"
+
+        if board_id:
+            url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/issue"
+        else:
+            # Standard API search has been moved/deprecated in favor of /search/jql
+            url = f"{self.site_url}/rest/api/3/search/jql"
+        return url, {"jql": jql, "fields": "key,summary,created,reporter,priority,status,issuetype"}
+
+    @staticmethod
+    def _recent_issue_row(issue):
+        created = issue.created or ""
+        # Descriptions are not fetched here; see get_issue_details
+        return {
+            "key": issue.key,
+            "summary": issue.summary or "",
+            "reporter": issue.reporter or "Unknown",
+            "priority": issue.priority or "None",
+            "status": issue.status or "Unknown",
+            "created": created,
+            "createdDate": created.split("T")[0] if created else ""
+        }
+
+    async def iter_recent_issues(self, project_id: int, days: int = 30, board_id: int = None, issue_type: str = "Bug"):
+        """Yield pages of get_recent_issues rows as Jira returns them, for streaming exports"""
+        if not project_id or not self.token:
+            return
+        async with self._client() as client:
+            async for page in self._iter_issue_pages(client, *self._recent_issues_query(project_id, days, board_id, issue_type)):
+                yield [self._recent_issue_row(issue) for issue in page]
+
     async def get_bug_severity_stats(self, project_id: int, board_id: int = None, days: int = None, unresolved_only: bool = True) -> list:
         """
         Fetch bug counts grouped by severity (priority).
@@ -423,46 +938,22 @@ class JiraClient:
         jql = "issuetype = 'Bug'"
         if unresolved_only:
             jql += " AND statusCategory != Done"
-            
+
         if days:
             jql += f" AND created >= -{days}d"
-            
-        if not board_id:
-            jql = f"project = {project_id} AND {jql}"
-
-        async with httpx.AsyncClient() as client:
-            try:
-                if board_id:
-                    url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/issue"
-                else:
-                    url = f"https://{self.domain}/rest/api/3/search/jql"
-
-                params = {
-                    "jql": jql,
-                    "fields": "priority",
-                    "maxResults": 500
-                }
-
-                response = await client.get(
-                    url,
-                    auth=self.auth,
-                    params=params,
-                    headers=self.headers,
-                    timeout=20.0
-                )
-                
-                if response.status_code != 200:
-                    return []
-
-                data = response.json()
-            except Exception as e:
-                print(f"Error fetching severity stats: {e}")
-                return []
 
-        severity_counts = {}
-        for issue in data.get("issues", []):
-            priority = issue.get("fields", {}).get("priority", {}).get("name", "Medium")
-            severity_counts[priority] = severity_counts.get(priority, 0) + 1
+        if board_id:
+            severity = Count(key=_severity)
+            aggregation = Aggregation(severity=severity)
+            async with self._client() as client:
+                url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/issue"
+                # An error is raised rather than counted short, so the endpoint cache keeps its last good answer
+                async for page in self._iter_issue_pages(client, url, {"jql": jql, "fields": "priority"}, max_issues=AGGREGATE_MAX_ISSUES):
+                    aggregation.add_page(page)
+            severity_counts = dict(severity.result())
+        else:
+            aggregates = await self.aggregate_search(f"project = {project_id} AND {jql}", ["priority"], severity=Count(key=_severity))
+            severity_counts = dict(aggregates["severity"])
 
         # Map to standard Recharts format with colors
         priority_config = {
@@ -496,10 +987,10 @@ class JiraClient:
 
     async def get_sprints(self, board_id: int):
         if not board_id: return []
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             try:
                 # Fetch sprints for board (active and future usually, maybe closed if requested but let's stick to active/future for dashboard)
-                url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/sprint"
+                url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/sprint"
                 response = await client.get(
                     url, 
                     auth=self.auth, 
@@ -535,7 +1026,7 @@ class JiraClient:
         # If still 0, return 0
         if total == 0: return 0
         
-        done = sum(1 for i in data["issues"] if i["fields"]["status"]["statusCategory"]["name"] == "Done")
+        done = sum(1 for i in data["issues"] if i.status_category == "Done")
         return int((done / total) * 100)
 
     async def get_phase_progress(self, project_key: str, board_id: int = None, sprint_id: int = None):
@@ -574,28 +1065,29 @@ class JiraClient:
         data = await self._search_jql(jql, fields=["status"], max_results=1000)
         all_issues = data.get("issues", [])
         
-        # 3. Aggregate Counts
-        for issue in all_issues:
-            status_id = issue["fields"]["status"]["id"]
-            status_name = issue["fields"]["status"]["name"]
-            
-            match_found = False
-            for phase in phases_map.values():
-                # Match by ID if we have board config
-                if phase.get("status_ids") and status_id in phase["status_ids"]:
-                    phase["count"] += 1
-                    match_found = True
-                    break
+        with tracing.span("aggregate", "get_phase_progress"):
+            # 3. Aggregate Counts
+            for issue in all_issues:
+                status_id = issue.status_id
+                status_name = issue.status or ""
             
-            # Fallback to name matching if ID match failed or no board config
-            if not match_found:
-                # Basic heuristic
-                s_name_lower = status_name.lower()
+                match_found = False
                 for phase in phases_map.values():
-                    p_name_lower = phase["name"].lower()
-                    if p_name_lower in s_name_lower or s_name_lower in p_name_lower:
+                    # Match by ID if we have board config
+                    if phase.get("status_ids") and status_id in phase["status_ids"]:
                         phase["count"] += 1
+                        match_found = True
                         break
+            
+                # Fallback to name matching if ID match failed or no board config
+                if not match_found:
+                    # Basic heuristic
+                    s_name_lower = status_name.lower()
+                    for phase in phases_map.values():
+                        p_name_lower = phase["name"].lower()
+                        if p_name_lower in s_name_lower or s_name_lower in p_name_lower:
+                            phase["count"] += 1
+                            break
 
         # 4. Finalize Semantic Status
         result = []
@@ -620,19 +1112,11 @@ class JiraClient:
         if sprint_id:
              jql += f" AND sprint = {sprint_id}"
         
-        data = await self._search_jql(jql, fields=["components"], max_results=100)
-        
-        # ... logic ...
-        counts = {}
-        for issue in data.get("issues", []):
-            comps = issue["fields"].get("components", [])
-            if not comps:
-                counts["No Component"] = counts.get("No Component", 0) + 1
-            else:
-                for c in comps:
-                    counts[c["name"]] = counts.get(c["name"], 0) + 1
-        
-        return [{"component": k, "bugs": v} for k, v in counts.items()]
+        aggregates = await self.aggregate_search(
+            jql, ["components"],
+            components=Count(keys=lambda i: i.components or ("No Component",))
+        )
+        return [{"component": k, "bugs": v} for k, v in aggregates["components"]]
 
     async def get_open_issues_pending(self, project_key: str, sprint_id: int = None):
         jql = f"project = {project_key} AND statusCategory != Done ORDER BY created DESC"
@@ -644,11 +1128,11 @@ class JiraClient:
         issues = []
         for i in data.get("issues", []):
             issues.append({
-                "id": i["key"],
-                "assignee": i["fields"]["assignee"]["displayName"] if i["fields"]["assignee"] else "Unassigned",
-                "summary": i["fields"]["summary"],
-                "due": i["fields"]["duedate"] or "No Date",
-                "status": i["fields"]["status"]["name"]
+                "id": i.key,
+                "assignee": i.assignee or "Unassigned",
+                "summary": i.summary,
+                "due": i.duedate or "No Date",
+                "status": i.status
             })
         return issues
 
@@ -672,8 +1156,8 @@ class JiraClient:
         
         if data.get("issues"):
             issue = data["issues"][0]
-            project_name = issue["fields"]["project"]["name"]
-            last_activity = issue["fields"]["updated"][:10] # YYYY-MM-DD
+            project_name = issue.project_name
+            last_activity = issue.updated[:10] # YYYY-MM-DD
             
         # 2. Determine Health Status based on Critical Bugs
         # Reuse existing risk logic or simple count
@@ -699,18 +1183,14 @@ class JiraClient:
         if sprint_id:
             jql += f" AND sprint = {sprint_id}"
         
-        data = await self._search_jql(jql, fields=["assignee", "status"], max_results=200)
-        
+        aggregates = await self.aggregate_search(
+            jql, ["assignee", "status"],
+            workload=Count(key=lambda i: (i.assignee or "Unassigned", i.status))
+        )
+
         stats = {} # assignee -> {status -> count}
-        for issue in data.get("issues", []):
-            assignee = issue["fields"]["assignee"]["displayName"] if issue["fields"]["assignee"] else "Unassigned"
-            status = issue["fields"]["status"]["name"]
-            
-            if assignee not in stats:
-                stats[assignee] = {"name": assignee}
-            
-            stats[assignee][status] = stats[assignee].get(status, 0) + 1
-            
+        for (assignee, status), count in aggregates["workload"]:
+            stats.setdefault(assignee, {"name": assignee})[status] = count
         return list(stats.values())
 
     async def get_board_quality_stats(self, project_id: int):
@@ -718,12 +1198,12 @@ class JiraClient:
         boards = await self.get_boards_by_project_id(project_id)
         result = []
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             for board in boards:
                 board_id = board["id"]
                 # Fetch bugs for last 90 days to have enough volume
                 jql = f"issuetype = Bug AND created >= -90d"
-                url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/issue"
+                url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/issue"
                 params = {
                     "jql": jql,
                     "fields": "resolution,created,resolutiondate",
@@ -744,9 +1224,8 @@ class JiraClient:
                     
                     from datetime import datetime
                     
-                    for issue in data.get("issues", []):
-                        fields = issue.get("fields", {})
-                        res_name = fields.get("resolution", {}).get("name") if fields.get("resolution") else None
+                    for issue in map(Issue.from_jira, data.get("issues", [])):
+                        res_name = issue.resolution
                         
                         if res_name in not_bug_resolutions:
                             not_a_bug += 1
@@ -754,8 +1233,8 @@ class JiraClient:
                             actual_bugs += 1
                             
                         # Resolution Time
-                        res_date_str = fields.get("resolutiondate")
-                        created_str = fields.get("created")
+                        res_date_str = issue.resolutiondate
+                        created_str = issue.created
                         
                         if res_date_str and created_str:
                             try:
@@ -783,33 +1262,17 @@ class JiraClient:
 
     async def get_bug_flow_stats(self, project_id: int):
         """Aggregate Reporter -> Assignee mappings to see bug report patterns"""
-        # Search for bugs in the project
-        jql = f"project = {project_id} AND issuetype = Bug"
-        data = await self._search_jql(jql, fields=["reporter", "assignee"], max_results=300)
-        
-        flow = {} # (reporter, assignee) -> count
-        for issue in data.get("issues", []):
-            fields = issue.get("fields", {})
-            reporter = fields["reporter"]["displayName"] if fields.get("reporter") else "Unknown"
-            assignee = fields["assignee"]["displayName"] if fields.get("assignee") else "Unassigned"
-            
-            key = (reporter, assignee)
-            flow[key] = flow.get(key, 0) + 1
-            
-        # Convert to list for chart
-        result = [{"reporter": k[0], "assignee": k[1], "count": v} for k, v in flow.items()]
-        # Sort by count desc
-        result.sort(key=lambda x: x["count"], reverse=True)
-        return result[:10] # Top 10 flows
+        aggregates = await self.aggregate_search(
+            f"project = {project_id} AND issuetype = Bug",
+            ["reporter", "assignee"],
+            flow=TopK(10, key=lambda i: (i.reporter or "Unknown", i.assignee or "Unassigned")),
+        )
+        # Top 10 flows, largest first
+        return [{"reporter": k[0], "assignee": k[1], "count": v} for k, v in aggregates["flow"]]
 
     async def get_bug_stats_by_epics(self):
         """Fetch bug statistics for specific epics (App, Cloud, PCS) across projects"""
-        # Epic mappings based on user info
-        epic_map = {
-            "APP": [84757, 84760],
-            "CLOUD": [84756, 84759],
-            "PCS": [84758, 84793]
-        }
+        epic_map = self.EPIC_MAP
         
         all_ids = []
         for ids in epic_map.values():
@@ -825,71 +1288,61 @@ class JiraClient:
             "PCS": f"parent in (84758, 84793) AND issuetype = Bug AND createdDate >= '2024-01-01'"
         }
         
-        # Fetch data including status and priority
-        # We increase max_results just in case there are many bugs across history
-        data = await self._search_jql(main_jql, fields=["created", "resolutiondate", "parent", "status", "priority"], max_results=2000)
-        
-        timeline_data = {} # date -> {APP: 0, CLOUD: 0, PCS: 0}
-        totals = {"APP": 0, "CLOUD": 0, "PCS": 0}
-        
-        # breakdown: {category: {done: 0, open: 0, priorities: {}, total: 0, fix_time_total_hours: 0}}
-        breakdown = {cat: {"done": 0, "open": 0, "priorities": {}, "total": 0, "fix_time_total_hours": 0} for cat in epic_map.keys()}
-        
         from datetime import datetime, timedelta
-        
-        for issue in data.get("issues", []):
-            fields = issue.get("fields", {})
-            created = fields.get("created", "")
-            if not created: continue
-            
-            date_str = created.split("T")[0]
-            
-            # Identify category based on parent ID
-            parent = fields.get("parent", {})
-            parent_id = int(parent.get("id")) if parent.get("id") else None
-            
-            category = None
-            for cat, ids in epic_map.items():
-                if parent_id in ids:
-                    category = cat
-                    break
-            
-            if category:
-                # All-time totals and breakdown
-                totals[category] += 1
-                breakdown[category]["total"] += 1
-                
-                status_cat = fields.get("status", {}).get("statusCategory", {}).get("name", "To Do")
-                if status_cat == "Done":
-                    breakdown[category]["done"] += 1
-                    
-                    # Calculate fix time if resolved
-                    resolution = fields.get("resolutiondate")
-                    if resolution:
-                        try:
-                            created_dt = datetime.strptime(created[:19], "%Y-%m-%dT%H:%M:%S")
-                            resolved_dt = datetime.strptime(resolution[:19], "%Y-%m-%dT%H:%M:%S")
-                            diff = resolved_dt - created_dt
-                            hours = diff.total_seconds() / 3600
-                            if hours > 0:
-                                breakdown[category]["fix_time_total_hours"] += hours
-                        except Exception:
-                            pass
-                else:
-                    breakdown[category]["open"] += 1
-                    
-                priority = fields.get("priority", {}).get("name", "Medium")
-                breakdown[category]["priorities"][priority] = breakdown[category]["priorities"].get(priority, 0) + 1
-                
-                # Daily counts for timeline
-                if date_str not in timeline_data:
-                    timeline_data[date_str] = {"APP": 0, "CLOUD": 0, "PCS": 0}
-                timeline_data[date_str][category] += 1
-                
-        # Generate last 90 days timeline
+
+        category_of = {epic_id: cat for cat, ids in epic_map.items() for epic_id in ids}
+
+        def category(issue):
+            return category_of.get(int(issue.parent_id)) if issue.parent_id else None
+
+        def counted(issue):
+            return bool(issue.created) and category(issue) is not None
+
+        def fix_hours(issue):
+            """Hours from created to resolved, for resolved bugs"""
+            if issue.status_category != "Done" or not issue.resolutiondate:
+                return None
+            try:
+                created_dt = datetime.strptime(issue.created[:19], "%Y-%m-%dT%H:%M:%S")
+                resolved_dt = datetime.strptime(issue.resolutiondate[:19], "%Y-%m-%dT%H:%M:%S")
+            except ValueError:
+                return None
+            hours = (resolved_dt - created_dt).total_seconds() / 3600
+            return hours if hours > 0 else None
+
         today = datetime.now()
         start_date = today - timedelta(days=89)
-        
+        first_day = start_date.strftime("%Y-%m-%d")
+
+        # One streamed pass over the epic bugs feeds every number on the card
+        results = await self.aggregate_search(
+            main_jql,
+            ["created", "resolutiondate", "parent", "status", "priority"],
+            partitioned=True,
+            status=Count(key=lambda i: (category(i), (i.status_category or "To Do") == "Done"), where=counted),
+            priorities=Count(key=lambda i: (category(i), i.priority or "Medium"), where=counted),
+            fix_hours=Sum(fix_hours, key=category, where=counted),
+            daily=Count(key=lambda i: (i.created.split("T")[0], category(i)),
+                        where=lambda i: counted(i) and i.created[:10] >= first_day),
+        )
+
+        totals = {cat: 0 for cat in epic_map}
+        # breakdown: {category: {done: 0, open: 0, priorities: {}, total: 0, fix_time_total_hours: 0}}
+        breakdown = {cat: {"done": 0, "open": 0, "priorities": {}, "total": 0, "fix_time_total_hours": 0} for cat in epic_map.keys()}
+        for (cat, done), count in results["status"]:
+            breakdown[cat]["done" if done else "open"] += count
+            breakdown[cat]["total"] += count
+            totals[cat] += count
+        for (cat, priority), count in results["priorities"]:
+            breakdown[cat]["priorities"][priority] = count
+        for cat, hours in results["fix_hours"]:
+            breakdown[cat]["fix_time_total_hours"] = hours
+
+        timeline_data = {}  # date -> {APP: 0, CLOUD: 0, PCS: 0}
+        for (day, cat), count in results["daily"]:
+            timeline_data.setdefault(day, {"APP": 0, "CLOUD": 0, "PCS": 0})[cat] = count
+
+        # Generate last 90 days timeline
         timeline = []
         for i in range(90):
             d = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -912,11 +1365,11 @@ class JiraClient:
         """Fetch sprints for specific boards and format for timeline"""
         all_sprints = []
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             for board_id in board_ids:
                 try:
                     # Fetch Board Name first
-                    board_url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}"
+                    board_url = f"{self.site_url}/rest/agile/1.0/board/{board_id}"
                     board_res = await client.get(board_url, auth=self.auth, headers=self.headers, timeout=10.0)
                     board_name = "Unknown Board"
                     if board_res.status_code == 200:
@@ -930,7 +1383,7 @@ class JiraClient:
                             board_name = raw_name
 
                     # Fetch Sprints
-                    url = f"https://{self.domain}/rest/agile/1.0/board/{board_id}/sprint"
+                    url = f"{self.site_url}/rest/agile/1.0/board/{board_id}/sprint"
                     response = await client.get(
                         url,
                         auth=self.auth,
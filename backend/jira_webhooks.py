@@ -0,0 +1,154 @@
+import os
+import hmac
+import hashlib
+import asyncio
+import logging
+
+import admission
+import cache
+import metrics
+from issues import SPRINT_FIELD
+
+logger = logging.getLogger("SkyDashboard.Webhooks")
+
+# Shared secret configured on the Jira webhook; Jira signs each delivery with it
+WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+# Events arriving within this many seconds are applied as one refresh
+WEBHOOK_DEBOUNCE = float(os.getenv("JIRA_WEBHOOK_DEBOUNCE", 2))
+
+ISSUE_EVENTS = {"jira:issue_created", "jira:issue_updated", "jira:issue_deleted"}
+SPRINT_EVENTS = {"sprint_created", "sprint_updated", "sprint_started", "sprint_closed", "sprint_deleted"}
+# Changelog fields that move an issue between epics or sprints
+PARENT_FIELDS = {"IssueParentAssociation", "Parent", "Epic Link"}
+
+
+def verify_signature(body: bytes, signature: str) -> bool:
+    """Check Jira's `X-Hub-Signature: sha256=<hex>` header against the raw body"""
+    if not signature or not WEBHOOK_SECRET:
+        return False
+    method, _, digest = signature.partition("=")
+    if method.lower() != "sha256":
+        return False
+    expected = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def _ids(value):
+    """Sprint/parent IDs from a changelog "from"/"to" value such as "1003, 1004" """
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def tags_for_event(payload):
+    """Cache tags affected by one Jira webhook payload (empty for unhandled events)"""
+    event = payload.get("webhookEvent", "")
+    tags = set()
+
+    if event in ISSUE_EVENTS:
+        issue = payload.get("issue") or {}
+        if issue.get("key"):
+            tags.add(f"issue:{issue['key']}")
+        fields = issue.get("fields") or {}
+        project = fields.get("project") or {}
+        for value in (project.get("key"), project.get("id")):
+            if value:
+                tags.add(f"project:{value}")
+
+        parent = fields.get("parent") or {}
+        if parent.get("id"):
+            tags.add(f"epic:{parent['id']}")
+
+        for sprint in fields.get(SPRINT_FIELD) or []:
+            if isinstance(sprint, dict):
+                if sprint.get("id"):
+                    tags.add(f"sprint:{sprint['id']}")
+                if sprint.get("boardId"):
+                    tags.add(f"board:{sprint['boardId']}")
+
+        # Moves also touch the sprint or epic the issue left
+        for item in (payload.get("changelog") or {}).get("items") or []:
+            field = item.get("field")
+            if field == "Sprint":
+                for sprint_id in _ids(item.get("from")) + _ids(item.get("to")):
+                    tags.add(f"sprint:{sprint_id}")
+            elif field in PARENT_FIELDS:
+                for parent_id in _ids(item.get("from")) + _ids(item.get("to")):
+                    tags.add(f"epic:{parent_id}")
+
+    elif event in SPRINT_EVENTS:
+        sprint = payload.get("sprint") or {}
+        if sprint.get("id"):
+            tags.add(f"sprint:{sprint['id']}")
+        if sprint.get("originBoardId"):
+            tags.add(f"board:{sprint['originBoardId']}")
+        if event in ("sprint_started", "sprint_closed", "sprint_deleted"):
+            # Views of "the current sprint" are built from openSprints()
+            tags.add("sprint:open")
+
+    return tags
+
+
+class WebhookApplier:
+    """Collects tags from incoming events and refreshes the tagged cache entries.
+
+    A sprint close can fire hundreds of issue events in a second; debouncing
+    turns them into one refresh per affected entry instead of one per event.
+    """
+
+    def __init__(self, debounce=WEBHOOK_DEBOUNCE):
+        self.debounce = debounce
+        self._pending = set()
+        self._task = None
+        self._refreshing = None  # asyncio.Event set when the refresh in progress ends
+
+    def add(self, tags):
+        self._pending.update(tags)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._apply_later())
+
+    async def _apply_later(self):
+        # Tags that arrive while a refresh runs are applied after another debounce
+        while True:
+            await asyncio.sleep(self.debounce)
+            if not self._pending:
+                return
+            await self._apply()
+
+    async def _apply(self):
+        tags, self._pending = self._pending, set()
+        self._refreshing = asyncio.Event()
+        try:
+            # The task inherited the webhook request's lane; refreshes should not compete with users
+            with admission.lane("background", "webhook"):
+                await cache.refresh_tags(tags)
+        except Exception as e:
+            logger.error(f"Applying webhook tags {sorted(tags)} failed: {e}")
+        finally:
+            self._refreshing.set()
+            self._refreshing = None
+
+    async def flush(self):
+        """Apply pending tags now instead of after the debounce, e.g. on shutdown.
+
+        A refresh already running is waited for, not cut off.
+        """
+        if self._task is not None and not self._task.done():
+            if self._refreshing is not None:
+                await self._refreshing.wait()
+            # The task is back in its debounce sleep, so stopping it loses nothing
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._pending:
+            await self._apply()
+
+    def handle(self, payload):
+        """Queue the cache updates for one payload; returns the tags it affects"""
+        event = payload.get("webhookEvent", "unknown")
+        tags = tags_for_event(payload)
+        metrics.jira_webhook_events.inc(event, "applied" if tags else "ignored")
+        if tags:
+            logger.info(f"Jira {event}: refreshing {sorted(tags)}")
+            self.add(tags)
+        return tags
@@ -1,13 +1,30 @@
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Depends, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
 from jira_client import JiraClient
-from gsheets_client import gsheets
+from gsheets_client import get_gsheets
+from http_client import close_http_client
+import cache
+from cache import async_cache
+from warmer import CacheWarmer, CACHE_WARM_ENABLED
+from jira_webhooks import WebhookApplier, verify_signature, WEBHOOK_SECRET
+from pagination import paginate, parse_fields, InvalidPage
+import admission
+import changelog
+import deltas
+import metrics
+import timeseries
+import tracing
 
 import os
+import re
+import hmac
+import json
 import time
 import logging
-from functools import wraps
+from contextlib import asynccontextmanager
 
 # Configure Logging
 logging.basicConfig(
@@ -16,7 +33,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger("SkyDashboard")
 
-app = FastAPI(title="SkyDashboard API v2")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Precompute the default dashboard views ahead of their TTL expiry
+    warmer = CacheWarmer() if CACHE_WARM_ENABLED else None
+    if warmer:
+        warmer.start()
+    # Backfill and then follow issue histories for burndowns off the request path
+    if changelog.CHANGELOG_SYNC_ENABLED:
+        changelog.store.start(get_jira())
+    yield
+    if warmer:
+        await warmer.stop()
+    await changelog.store.stop()
+    # Apply webhook changes still waiting out their debounce
+    await webhook_applier.flush()
+    await close_http_client()
+
+app = FastAPI(title="SkyDashboard API v2", lifespan=lifespan)
 
 # Configure CORS
 allowed_origins = [
@@ -32,29 +66,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-jira = JiraClient()
-
-# Simple In-Memory Cache
-_cache = {}
-CACHE_TTL = int(os.getenv("CACHE_TTL", 300)) # Default 5 minutes
-
-def async_cache(ttl=CACHE_TTL):
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            cache_key = f"{func.__name__}:{args}:{kwargs}"
-            if cache_key in _cache:
-                timestamp, result = _cache[cache_key]
-                if time.time() - timestamp < ttl:
-                    logger.debug(f"Cache hit for {func.__name__}")
-                    return result
-            
-            logger.info(f"Fetching fresh data for {func.__name__}")
-            result = await func(*args, **kwargs)
-            _cache[cache_key] = (time.time(), result)
-            return result
-        return wrapper
-    return decorator
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    started = time.perf_counter()
+    trace, token = tracing.start_trace()
+    # User requests go first; a client may send X-SkyDash-Priority to queue non-urgent calls behind them
+    priority = request.headers.get("X-SkyDash-Priority", "").lower()
+    status = "500"
+    try:
+        with admission.lane(priority if priority in admission.CLIENT_LANES else "interactive", request.scope):
+            response = await call_next(request)
+        status = str(response.status_code)
+        if tracing.SERVER_TIMING_ENABLED:
+            # Upstream calls, cache lookups and aggregation phases, visible in browser devtools
+            response.headers["Server-Timing"] = trace.server_timing()
+            response.headers["Timing-Allow-Origin"] = "*" if os.getenv("ENVIRONMENT") != "production" else allowed_origins[0]
+        return response
+    finally:
+        tracing.end_trace(token)
+        # Label by route template, not raw path, to keep the label set bounded
+        route = request.scope.get("route")
+        metrics.http_request_duration.observe(
+            time.perf_counter() - started,
+            request.method,
+            route.path if route else "unmatched",
+            status
+        )
+        if tracing.TRACE_LOG_ENABLED:
+            tracing.log_trace(trace, request.method, request.url.path, status)
+
+_jira = None
+
+def get_jira():
+    """Shared JiraClient, created on first use rather than at import time"""
+    global _jira
+    if _jira is None:
+        _jira = JiraClient()
+    return _jira
 
 @app.get("/")
 async def root():
@@ -64,128 +112,258 @@ async def root():
 async def health_check():
     return {"status": "ok", "timestamp": time.time()}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of request, upstream and cache metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/projects")
-@async_cache(ttl=600)
+@async_cache(ttl=600, tags=("jira:projects",))
 async def get_projects():
-    return await jira.get_projects()
+    return await get_jira().get_projects()
 
 @app.get("/api/boards")
-@async_cache(ttl=300)
+@async_cache(ttl=300, tags=("project:{project}",))
 async def get_boards(project: str):
-    return await jira.get_boards(project)
+    return await get_jira().get_boards(project)
 
 @app.get("/api/sprints")
-@async_cache(ttl=120)
+@async_cache(ttl=120, tags=("board:{board_id}",))
 async def get_sprints(board_id: int):
-    return await jira.get_sprints(board_id)
+    return await get_jira().get_sprints(board_id)
 
 @app.get("/api/dashboard/progress")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}", "sprint:{sprint_id}", "sprint:open"))
 async def get_dashboard_progress(project: str = "SSSS,JI", sprint_id: int = None):
-    return await jira.get_sprint_progress(project, sprint_id)
+    return await get_jira().get_sprint_progress(project, sprint_id)
 
 @app.get("/api/dashboard/phase-status")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}", "board:{board_id}", "sprint:{sprint_id}", "sprint:open"))
 async def get_phase_status(project: str = "SSSS,JI", board_id: int = None, sprint_id: int = None):
-    return await jira.get_phase_progress(project, board_id, sprint_id)
+    return await get_jira().get_phase_progress(project, board_id, sprint_id)
 
 @app.get("/api/dashboard/summary")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}",))
 async def get_project_summary(project: str = "SSSS,JI"):
-    return await jira.get_project_summary(project)
+    return await get_jira().get_project_summary(project)
 
 @app.get("/api/dashboard/bugs-by-component")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}", "sprint:{sprint_id}"))
 async def get_bugs_by_component(project: str = "SSSS,JI", sprint_id: int = None):
-    return await jira.get_unresolved_bugs_by_component(project, sprint_id)
+    return await get_jira().get_unresolved_bugs_by_component(project, sprint_id)
 
 @app.get("/api/dashboard/open-issues")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}", "sprint:{sprint_id}"))
 async def get_open_issues(project: str = "SSSS,JI", sprint_id: int = None):
-    return await jira.get_open_issues_pending(project, sprint_id)
+    return await get_jira().get_open_issues_pending(project, sprint_id)
 
 @app.get("/api/dashboard/qa-risks")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}",))
 async def get_qa_risks(project: str = "SSSS,JI"):
-    return await jira.get_qa_risks(project)
+    return await get_jira().get_qa_risks(project)
 
 # ============================================================================
 # NEW DATA FLOW ENDPOINTS: Project ID → Boards → Sprints → Issues
 # ============================================================================
 
 @app.get("/api/project/{project_key}/id")
-@async_cache(ttl=3600)
+@async_cache(ttl=3600, tags=("project:{project_key}",))
 async def get_project_id(project_key: str):
     """Get project ID and metadata from project key"""
-    return await jira.get_project_id(project_key)
+    return await get_jira().get_project_id(project_key)
 
 @app.get("/api/project/{project_id}/boards")
-@async_cache(ttl=300)
+@async_cache(ttl=300, tags=("project:{project_id}",))
 async def get_boards_by_project(project_id: int):
     """Get all boards for a project using project ID"""
-    return await jira.get_boards_by_project_id(project_id)
+    return await get_jira().get_boards_by_project_id(project_id)
 
 @app.get("/api/board/{board_id}/sprints")
-@async_cache(ttl=120)
+@async_cache(ttl=120, tags=("board:{board_id}",))
 async def get_board_sprints(board_id: int, state: str = "active,future,closed"):
     """Get sprints for a board with optional state filtering"""
-    return await jira.get_sprints_by_board(board_id, state)
+    return await get_jira().get_sprints_by_board(board_id, state)
 
-@app.get("/api/sprint/{sprint_id}/issues")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("sprint:{sprint_id}",))
 async def get_sprint_issues(sprint_id: int):
-    """Get all issues in a specific sprint"""
-    return await jira.get_sprint_issues_detailed(sprint_id)
+    return await get_jira().get_sprint_issues_detailed(sprint_id)
 
-@app.get("/api/issues/recent")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project_id}", "board:{board_id}"))
 async def get_recent_issues(project_id: int, days: int = 30, board_id: int = None, issue_type: str = "Bug"):
-    """Get issues of a specific type created in the last X days, optionally filtered by board"""
-    return await jira.get_recent_issues(project_id, days, board_id, issue_type)
+    return await get_jira().get_recent_issues(project_id, days, board_id, issue_type)
+
+# Requests without limit/cursor/fields get at most what these endpoints returned before they were paged
+UNPAGED_SPRINT_ISSUES = 100
+UNPAGED_RECENT_ISSUES = 200
+
+def get_page(items, limit, cursor, fields):
+    """Slice a cached issue list for a `limit`/`cursor`/`fields` request"""
+    try:
+        return paginate(items, cursor=cursor, limit=limit, fields=fields)
+    except InvalidPage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/sprint/{sprint_id}/issues")
+async def list_sprint_issues(sprint_id: int, limit: int = None, cursor: str = None, fields: str = None):
+    """Get all issues in a specific sprint.
+
+    With any of limit/cursor/fields the response is one page:
+    {"issues", "total", "next_cursor"}; pass next_cursor back for the next page.
+    Without them it is a plain list of the first UNPAGED_SPRINT_ISSUES issues.
+    """
+    issues = await get_sprint_issues(sprint_id)
+    if limit is None and cursor is None and fields is None:
+        return issues[:UNPAGED_SPRINT_ISSUES]
+    return get_page(issues, limit, cursor, fields)
+
+@app.get("/api/issues/recent")
+async def list_recent_issues(project_id: int, days: int = 30, board_id: int = None, issue_type: str = "Bug",
+                             limit: int = None, cursor: str = None, fields: str = None):
+    """Get issues of a specific type created in the last X days, optionally filtered by board.
+
+    Paged like /api/sprint/{sprint_id}/issues; unpaged, only the first
+    UNPAGED_RECENT_ISSUES issues are listed. The timeline and total always
+    cover every issue.
+    """
+    data = await get_recent_issues(project_id, days, board_id, issue_type)
+    if limit is None and cursor is None and fields is None:
+        return {**data, "issues": data["issues"][:UNPAGED_RECENT_ISSUES]}
+    return {**get_page(data["issues"], limit, cursor, fields), "timeline": data["timeline"]}
+
+# Details change rarely and webhooks refresh them, so they can live much longer than list views
+ISSUE_DETAIL_TTL = int(os.getenv("ISSUE_DETAIL_TTL", 1800))
+MAX_DETAIL_KEYS = 100
+ISSUE_KEY_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+async def _single_page(items):
+    yield items
+
+async def ndjson_lines(pages, fields):
+    """Serialize pages of issues as one JSON object per line"""
+    try:
+        async for page in pages:
+            if fields is not None:
+                page = [{name: issue.get(name) for name in fields} for issue in page]
+            yield "".join(json.dumps(issue, separators=(",", ":")) + "\n" for issue in page)
+    except Exception as e:
+        # Headers are long gone; tell the client the export is incomplete in-band
+        logger.error(f"Issue export stream failed: {e}")
+        yield json.dumps({"error": "Upstream failed before the export completed"}) + "\n"
+
+def stream_issues(cached_issues, fetch_pages, fields):
+    """NDJSON response served from the cached list if it is fresh, else from Jira page by page"""
+    try:
+        selected = parse_fields(fields)
+    except InvalidPage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    pages = _single_page(cached_issues) if cached_issues is not None else fetch_pages()
+    return StreamingResponse(ndjson_lines(pages, selected), media_type="application/x-ndjson")
+
+@app.get("/api/sprint/{sprint_id}/issues/stream")
+async def stream_sprint_issues(sprint_id: int, fields: str = None):
+    """Stream every issue in a sprint as newline-delimited JSON, as Jira pages arrive"""
+    return stream_issues(
+        get_sprint_issues.peek(sprint_id),
+        lambda: get_jira().iter_sprint_issues(sprint_id),
+        fields
+    )
+
+@app.get("/api/sprint/{sprint_id}/burndown")
+@async_cache(ttl=300, tags=("sprint:{sprint_id}",))
+async def get_sprint_burndown(sprint_id: int):
+    """Daily scope, completed and remaining issues over a sprint, from locally stored changelogs"""
+    jira = get_jira()
+    sprint = await jira.get_sprint(sprint_id)
+    if not sprint:
+        raise HTTPException(status_code=404, detail=f"Sprint {sprint_id} not found")
+    if changelog.store.backfilling:
+        raise HTTPException(status_code=503, detail="Sprint history is still loading", headers={"Retry-After": "30"})
+    # Only what changed since the last sync, and skipped if the background sync ran moments ago.
+    # Without the background sync (CHANGELOG_SYNC_ENABLED=false) the first request backfills.
+    await changelog.store.sync(jira)
+    return changelog.store.burndown(sprint)
+
+@app.get("/api/issues/recent/stream")
+async def stream_recent_issues(project_id: int, days: int = 30, board_id: int = None, issue_type: str = "Bug", fields: str = None):
+    """Stream recent issues as newline-delimited JSON without building the whole list in memory"""
+    cached = get_recent_issues.peek(project_id, days, board_id, issue_type)
+    return stream_issues(
+        cached["issues"] if cached else None,
+        lambda: get_jira().iter_recent_issues(project_id, days, board_id, issue_type),
+        fields
+    )
+
+@app.get("/api/issues/details")
+async def get_issue_details(keys: str):
+    """Get description and other heavy fields for a comma-separated list of issue keys"""
+    issue_keys = list(dict.fromkeys(k.strip().upper() for k in keys.split(",") if k.strip()))
+    invalid = [k for k in issue_keys if not ISSUE_KEY_PATTERN.match(k)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid issue keys: {', '.join(invalid)}")
+    if len(issue_keys) > MAX_DETAIL_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DETAIL_KEYS} issue keys per request")
+
+    details = await cache.cached_batch(
+        "issue_details",
+        issue_keys,
+        get_jira().get_issue_details,
+        ttl=ISSUE_DETAIL_TTL,
+        tags=lambda key, detail: (f"issue:{key}", f"project:{detail['project']}")
+    )
+    return {
+        "issues": [details[k] for k in issue_keys if k in details],
+        "missing": [k for k in issue_keys if k not in details]
+    }
 
 @app.get("/api/bugs/severity-stats")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project_id}", "board:{board_id}"))
 async def get_bug_severity_stats(project_id: int, board_id: int = None, days: int = None, unresolved_only: bool = True):
     """Get bug counts grouped by severity (priority) for a project and board"""
-    return await jira.get_bug_severity_stats(project_id, board_id, days, unresolved_only)
+    return await get_jira().get_bug_severity_stats(project_id, board_id, days, unresolved_only)
 
-@app.get("/api/dashboard/developer-stats")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("project:{project}", "sprint:{sprint_id}"))
 async def get_developer_stats(project: str = "SSSS,JI", sprint_id: int = None):
     """Get unresolved issues aggregated by developer and status"""
-    return await jira.get_developer_stats(project, sprint_id)
+    return await get_jira().get_developer_stats(project, sprint_id)
+
+@app.get("/api/dashboard/developer-stats")
+async def read_developer_stats(project: str = "SSSS,JI", sprint_id: int = None, since: str = None):
+    """Developer stats; with `since` (the last version seen, or empty) a {"version", "patch" or "document"} envelope"""
+    stats = await get_developer_stats(project, sprint_id)
+    if since is None:
+        return stats
+    return deltas.respond(get_developer_stats.cache_key(project, sprint_id), stats, since)
 
 @app.get("/api/dashboard/board-quality")
-@async_cache(ttl=300)
+@async_cache(ttl=300, tags=("project:{project_id}",))
 async def get_board_quality(project_id: int):
     """Get Actual vs Not a Bug stats and Avg Resolution Time per board"""
-    return await jira.get_board_quality_stats(project_id)
+    return await get_jira().get_board_quality_stats(project_id)
 
 @app.get("/api/dashboard/bug-flow")
-@async_cache(ttl=300)
+@async_cache(ttl=300, tags=("project:{project_id}",))
 async def get_bug_flow(project_id: int):
     """Get bug reporting flow (Reporter -> Assignee)"""
-    return await jira.get_bug_flow_stats(project_id)
+    return await get_jira().get_bug_flow_stats(project_id)
 
 @app.get("/api/dashboard/sheet-progress")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("sheet:progress",))
 async def get_sheet_progress():
     """Get progress averages from Google Sheets (Phase 2)"""
-    return await gsheets.get_sheet_data()
+    return await get_gsheets().get_sheet_data()
 
 @app.get("/api/dashboard/sprint-timeline")
-@async_cache(ttl=300)
+@async_cache(ttl=300, tags=("board:{board_ids}",))
 async def get_sprint_timeline(board_ids: str = "50,140"):
     """Get sprint timeline data for specific boards"""
     ids = [int(i.strip()) for i in board_ids.split(",") if i.strip()]
-    return await jira.get_sprint_timeline(ids)
+    return await get_jira().get_sprint_timeline(ids)
 
-@app.get("/api/bugs/epic-stats")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("jira:epics", "sheet:coverage", *(f"epic:{i}" for ids in JiraClient.EPIC_MAP.values() for i in ids)))
 async def get_bug_epic_stats():
     """Get bug counts and timeline for specific App, Cloud, and PCS epics, including QA timeline from sheets"""
-    jira_stats = await jira.get_bug_stats_by_epics()
-    qa_timeline = await gsheets.get_qa_timeline()
+    jira_stats = await get_jira().get_bug_stats_by_epics()
+    qa_timeline = await get_gsheets().get_qa_timeline()
     
     # Inject sheet data into each squad's breakdown so the frontend can access it easily
     if "breakdown" in jira_stats:
@@ -194,8 +372,107 @@ async def get_bug_epic_stats():
             
     jira_stats["qa_timeline"] = qa_timeline
     return jira_stats
+
+@app.get("/api/bugs/epic-stats")
+async def read_bug_epic_stats(since: str = None):
+    """Epic bug stats; with `since` (the last version seen, or empty) a {"version", "patch" or "document"} envelope"""
+    stats = await get_bug_epic_stats()
+    if since is None:
+        return stats
+    return deltas.respond(get_bug_epic_stats.cache_key(), stats, since)
+
 @app.get("/api/dashboard/test-coverage")
-@async_cache(ttl=60)
+@async_cache(ttl=60, tags=("sheet:coverage",))
 async def get_test_coverage():
     """Get test coverage status from Google Sheets (Sheet 2)"""
-    return await gsheets.get_test_coverage()
+    return await get_gsheets().get_test_coverage()
+
+# ============================================================================
+# TRENDS: snapshots of key metrics taken at every refresh, read without Jira
+# ============================================================================
+
+cache.on_refresh(timeseries.record_refresh)
+
+def read_trend(group: str, days: float):
+    end = time.time()
+    start = end - days * 86400
+    return {"from": int(start), "to": int(end), "series": timeseries.store.read(group, start, end)}
+
+@app.get("/api/trends/progress")
+async def get_progress_trend(project: str = "SSSS,JI", sprint_id: int = None, days: float = 7):
+    """Sprint completion percentage over time, as recorded at each refresh of /api/dashboard/progress"""
+    return read_trend(timeseries.group_name("progress", project, sprint_id), days)
+
+@app.get("/api/trends/phases")
+async def get_phase_trend(project: str = "SSSS,JI", board_id: int = None, sprint_id: int = None, days: float = 7):
+    """Issue count per board column over time"""
+    return read_trend(timeseries.group_name("phases", project, board_id, sprint_id), days)
+
+@app.get("/api/trends/developers")
+async def get_developer_trend(project: str = "SSSS,JI", sprint_id: int = None, days: float = 7):
+    """Open issues per assignee over time"""
+    return read_trend(timeseries.group_name("developers", project, sprint_id), days)
+
+@app.get("/api/trends/epics")
+async def get_epic_trend(days: float = 30):
+    """Open, done and total bugs per squad ("APP:open", ...) over time"""
+    return read_trend("epics", days)
+
+# ============================================================================
+# ADMIN: targeted cache invalidation, e.g. right after a sprint closes
+# ============================================================================
+
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+def require_admin(authorization: str = Header(None)):
+    """Accept only `Authorization: Bearer <ADMIN_API_TOKEN>`; the admin API is off without a token"""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled; set ADMIN_API_TOKEN")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+class CacheInvalidation(BaseModel):
+    # e.g. ["board:50", "sprint:1004", "project:SSSS", "project:84742", "sheet:progress", "fn:get_sprint_timeline"]
+    tags: list[str]
+    # Rebuild the entries now and keep serving the old values until then, instead of dropping them
+    refresh: bool = False
+
+@app.get("/api/admin/cache/tags", dependencies=[Depends(require_admin)])
+async def get_cache_tags():
+    """Live cache entries per tag"""
+    return {tag: len(cache.keys_for_tags([tag])) for tag in sorted(cache._tag_index)}
+
+@app.post("/api/admin/cache/invalidate", dependencies=[Depends(require_admin)])
+async def invalidate_cache(request: CacheInvalidation):
+    """Invalidate or refresh every cached response tagged with any of the given tags"""
+    if any(tag.startswith("sheet:") for tag in request.tags):
+        # The sheet snapshot sits under the response cache; drop it too so the edit is picked up
+        get_gsheets().invalidate_snapshot()
+    if request.refresh:
+        refreshed, failed = await cache.refresh_tags(request.tags)
+        return {"refreshed": refreshed, "failed": failed}
+    return {"invalidated": cache.invalidate(request.tags)}
+
+# ============================================================================
+# WEBHOOKS: Jira pushes issue and sprint changes instead of us polling for them
+# ============================================================================
+
+webhook_applier = WebhookApplier()
+
+@app.post("/webhooks/jira")
+async def jira_webhook(request: Request, x_hub_signature: str = Header(None)):
+    """Refresh the cache entries affected by a Jira issue or sprint event"""
+    body = await request.body()
+    if WEBHOOK_SECRET:
+        if not verify_signature(body, x_hub_signature):
+            raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    elif os.getenv("ENVIRONMENT") == "production":
+        raise HTTPException(status_code=403, detail="Jira webhooks are disabled; set JIRA_WEBHOOK_SECRET")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body is not JSON")
+    tags = webhook_applier.handle(payload)
+    return {"event": payload.get("webhookEvent"), "tags": sorted(tags)}
@@ -0,0 +1,147 @@
+import bisect
+from collections import defaultdict
+
+# Prometheus-style metrics without the prometheus_client dependency.
+# Everything runs on the event loop thread, so plain dict updates are safe
+# and the hot path never takes a lock.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = defaultdict(float)
+        _registry.append(self)
+
+    def inc(self, *label_values, amount=1):
+        self.values[label_values] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *label_values, amount=1):
+        self.values[label_values] -= amount
+
+    def set(self, *label_values, value):
+        self.values[label_values] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        _registry.append(self)
+
+    def observe(self, value, *label_values):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, ('le', f'{bound:g}'))} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, ('le', '+Inf'))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = Histogram(
+    "skydash_http_request_duration_seconds",
+    "Dashboard API request latency by route",
+    labels=("method", "route", "status")
+)
+upstream_requests = Counter(
+    "skydash_upstream_requests_total",
+    "Upstream API calls by service, path and status",
+    labels=("upstream", "method", "path", "status")
+)
+upstream_request_duration = Histogram(
+    "skydash_upstream_request_duration_seconds",
+    "Upstream API call latency by service and path",
+    labels=("upstream", "method", "path")
+)
+upstream_in_flight = Gauge(
+    "skydash_upstream_in_flight",
+    "Upstream API calls currently in flight",
+    labels=("upstream",)
+)
+cache_events = Counter(
+    "skydash_cache_events_total",
+    "Cache hits, misses, stale serves, evictions, invalidations and changed/unchanged refreshes per cached function",
+    labels=("function", "event")
+)
+cache_ttl = Gauge(
+    "skydash_cache_ttl_seconds",
+    "Adaptive TTL of the most recently refreshed entry per cached function",
+    labels=("function",)
+)
+jira_search_pages = Histogram(
+    "skydash_jira_search_pages",
+    "Pages fetched per _search_jql call",
+    buckets=(1, 2, 3, 5, 10, 20, 50)
+)
+jira_webhook_events = Counter(
+    "skydash_jira_webhook_events_total",
+    "Jira webhook deliveries by event and whether they touched any cache entry",
+    labels=("event", "outcome")
+)
+upstream_queue_depth = Gauge(
+    "skydash_upstream_queue_depth",
+    "Upstream calls waiting for an admission slot by lane and endpoint",
+    labels=("lane", "endpoint")
+)
+upstream_queue_wait = Histogram(
+    "skydash_upstream_queue_wait_seconds",
+    "Time upstream calls waited for an admission slot by lane",
+    labels=("lane",)
+)
+delta_responses = Counter(
+    "skydash_delta_responses_total",
+    "Polling responses by whether a patch or the full document was sent",
+    labels=("outcome",)
+)
@@ -0,0 +1,72 @@
+import os
+import json
+import base64
+
+# Page size when a client asks for pages without saying how big
+DEFAULT_PAGE_SIZE = int(os.getenv("LIST_DEFAULT_PAGE_SIZE", 100))
+MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", 500))
+
+
+class InvalidPage(ValueError):
+    """A malformed cursor, page size or field list"""
+
+
+def encode_cursor(offset, last_key):
+    payload = json.dumps({"o": offset, "k": last_key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(data["o"]), data["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidPage(f"Invalid cursor: {e}")
+
+
+def parse_fields(fields):
+    """Split a `fields=key,summary` parameter; None means every field"""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names:
+        raise InvalidPage("fields must name at least one field")
+    return names
+
+
+def _resume_at(items, offset, last_key, key):
+    """Where the next page starts, even if the cached list was refreshed in between"""
+    if 0 < offset <= len(items) and items[offset - 1].get(key) == last_key:
+        return offset
+    # The list changed under the cursor: continue after the last item the client saw
+    for index, item in enumerate(items):
+        if item.get(key) == last_key:
+            return index + 1
+    raise InvalidPage("Cursor no longer matches the list; start again without a cursor")
+
+
+def paginate(items, cursor=None, limit=None, fields=None, key="key"):
+    """One page of an ordered list of dicts.
+
+    The cursor is opaque to clients. It records the offset and the key of the
+    last item served, so a page costs O(limit) while the cached list is
+    unchanged and still resumes at the right item after it is refreshed.
+    Returns {"issues": [...], "total": n, "next_cursor": str or None}.
+    """
+    limit = DEFAULT_PAGE_SIZE if limit is None else limit
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise InvalidPage(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    selected = parse_fields(fields)
+
+    start = _resume_at(items, *decode_cursor(cursor), key) if cursor else 0
+    page = items[start:start + limit]
+    end = start + len(page)
+    if selected is not None:
+        page = [{name: item.get(name) for name in selected} for item in page]
+
+    return {
+        "issues": page,
+        "total": len(items),
+        "next_cursor": encode_cursor(end, items[end - 1].get(key)) if end < len(items) else None
+    }
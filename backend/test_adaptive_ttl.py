@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import cache
+from cache import async_cache
+
+results = []
+
+
+@async_cache(ttl=100, min_ttl=25, max_ttl=300)
+async def volatile_stats():
+    return results[-1]
+
+
+class TestAdaptiveTTL(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        results.clear()
+
+    def refresh_with(self, *values):
+        async def scenario():
+            for value in values:
+                results.append(value)
+                await volatile_stats.refresh()
+        asyncio.run(scenario())
+        return cache._ttls[volatile_stats.cache_key()]
+
+    def test_first_refresh_uses_the_declared_ttl(self):
+        self.assertEqual(self.refresh_with({"open": 3}), 100)
+
+    def test_unchanged_results_stretch_the_ttl_up_to_the_bound(self):
+        self.assertEqual(self.refresh_with({"open": 3}, {"open": 3}), 150)
+        self.assertEqual(self.refresh_with({"open": 3}, {"open": 3}, {"open": 3}, {"open": 3}, {"open": 3}), 300)
+
+    def test_changed_results_shorten_the_ttl_down_to_the_bound(self):
+        self.assertEqual(self.refresh_with({"open": 1}, {"open": 2}), 50)
+        self.assertEqual(self.refresh_with({"open": 1}, {"open": 2}, {"open": 3}, {"open": 4}), 25)
+
+    def test_key_order_does_not_count_as_a_change(self):
+        self.assertEqual(self.refresh_with({"a": 1, "b": 2}, {"b": 2, "a": 1}), 150)
+
+    def test_invalidation_forgets_the_history(self):
+        self.refresh_with({"open": 3}, {"open": 3})
+        cache.invalidate(["fn:volatile_stats"])
+        self.assertNotIn(volatile_stats.cache_key(), cache._ttls)
+
+
+class TestBudgetStretch(unittest.TestCase):
+    def stretch_at(self, rate):
+        with patch.object(cache, "JIRA_CALL_BUDGET", 100), \
+                patch.object(cache, "CACHE_TTL_MAX_STRETCH", 4), \
+                patch.object(cache.http_client, "upstream_call_rate", return_value=rate):
+            return cache.budget_stretch()
+
+    def test_no_stretch_below_the_headroom(self):
+        self.assertEqual(self.stretch_at(50), 1.0)
+        self.assertEqual(self.stretch_at(80), 1.0)
+
+    def test_stretch_grows_towards_the_budget(self):
+        self.assertAlmostEqual(self.stretch_at(90), 2.5)
+        self.assertEqual(self.stretch_at(100), 4.0)
+        self.assertEqual(self.stretch_at(500), 4.0)
+
+    def test_no_budget_means_no_stretch(self):
+        with patch.object(cache.http_client, "upstream_call_rate", return_value=10_000):
+            self.assertEqual(cache.budget_stretch(), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
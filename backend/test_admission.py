@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+
+import httpx
+
+import admission
+from admission import AdmissionController, AdmissionTransport
+
+
+class TestAdmissionController(unittest.TestCase):
+    def run_in_order(self, controller, requests):
+        """Queue (lane, endpoint, label) requests behind a held slot; returns the order they ran in"""
+        order = []
+
+        async def call(name, endpoint, label):
+            async with controller.slot(name, endpoint):
+                order.append(label)
+                await asyncio.sleep(0)
+
+        async def scenario():
+            await controller.acquire("interactive", "holder")
+            tasks = []
+            for request in requests:
+                tasks.append(asyncio.create_task(call(*request)))
+                await asyncio.sleep(0)
+            self.assertEqual(controller.waiting(), len(requests))
+            controller.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(scenario())
+        self.assertEqual(controller.active, 0)
+        return order
+
+    def test_higher_lanes_go_first(self):
+        order = self.run_in_order(AdmissionController(limit=1), [
+            ("background", "warm", "b1"),
+            ("prefetch", "/api/a", "p1"),
+            ("interactive", "/api/b", "i1"),
+            ("background", "warm", "b2"),
+            ("interactive", "/api/b", "i2"),
+        ])
+        self.assertEqual(order, ["i1", "i2", "p1", "b1", "b2"])
+
+    def test_endpoints_share_a_lane_round_robin(self):
+        fan_out = [("interactive", "/api/boards/quality", f"q{n}") for n in range(4)]
+        order = self.run_in_order(AdmissionController(limit=1), fan_out + [("interactive", "/api/projects", "p")])
+        # The single projects call does not wait behind the whole fan-out
+        self.assertEqual(order, ["q0", "p", "q1", "q2", "q3"])
+
+    def test_concurrency_never_exceeds_the_limit(self):
+        controller = AdmissionController(limit=3)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with controller.slot("interactive", "/api/x"):
+                peak = max(peak, controller.active)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(*(call() for _ in range(10)))
+
+        asyncio.run(scenario())
+        self.assertEqual(peak, 3)
+        self.assertEqual(controller.active, 0)
+
+    def test_cancelled_waiters_give_up_their_place(self):
+        controller = AdmissionController(limit=1)
+
+        async def scenario():
+            await controller.acquire()
+            waiter = asyncio.create_task(controller.acquire("interactive", "/api/x"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            self.assertEqual(controller.waiting(), 0)
+            controller.release()
+
+        asyncio.run(scenario())
+        self.assertEqual(controller.active, 0)
+
+
+class TestAdmissionTransport(unittest.TestCase):
+    def test_requests_are_admitted_in_their_context_lane(self):
+        seen = []
+
+        class Controller(AdmissionController):
+            async def acquire(self, name="background", endpoint="-"):
+                seen.append((name, endpoint))
+                await super().acquire(name, endpoint)
+
+        transport = AdmissionTransport(httpx.MockTransport(lambda request: httpx.Response(200)), Controller(limit=2))
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("https://jira.example/rest/api/3/myself")
+                with admission.lane("interactive", {"route": None}):
+                    await client.get("https://jira.example/rest/api/3/myself")
+
+        asyncio.run(scenario())
+        self.assertEqual(seen, [("background", "-"), ("interactive", "unmatched")])
+
+
+if __name__ == "__main__":
+    unittest.main()
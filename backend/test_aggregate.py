@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from aggregate import Aggregation, Count, Sum, TopK
+from issues import Issue
+from jira_client import JiraClient
+
+ISSUES = [
+    Issue(key="SSSS-1", assignee="Ayesha", status="To Do", priority="High", components=("API",)),
+    Issue(key="SSSS-2", assignee="Bilal", status="Done", priority=None, components=()),
+    Issue(key="SSSS-3", assignee="Ayesha", status="In Progress", priority="High", components=("API", "Firmware")),
+    Issue(key="SSSS-4", assignee=None, status="To Do", priority="Low", components=("Firmware",)),
+    Issue(key="SSSS-5", assignee="Bilal", status="To Do", priority="Low", components=("API",)),
+]
+
+
+class TestAggregates(unittest.TestCase):
+    def test_count_keeps_first_seen_order(self):
+        count = Count(key=lambda i: i.assignee or "Unassigned")
+        for issue in ISSUES:
+            count.add(issue)
+        self.assertEqual(count.result(), [("Ayesha", 2), ("Bilal", 2), ("Unassigned", 1)])
+
+    def test_count_with_several_keys_per_issue(self):
+        count = Count(keys=lambda i: i.components or ("No Component",))
+        for issue in ISSUES:
+            count.add(issue)
+        self.assertEqual(count.result(), [("API", 3), ("No Component", 1), ("Firmware", 2)])
+
+    def test_where_skips_issues(self):
+        count = Count(key=lambda i: i.status, where=lambda i: i.status != "Done")
+        for issue in ISSUES:
+            count.add(issue)
+        self.assertEqual(dict(count.result()), {"To Do": 3, "In Progress": 1})
+
+    def test_top_k_is_largest_first_and_stable_on_ties(self):
+        top = TopK(2, key=lambda i: i.priority or "Medium")
+        for issue in ISSUES:
+            top.add(issue)
+        self.assertEqual(top.result(), [("High", 2), ("Low", 2)])
+
+    def test_sum_adds_values_per_group_and_skips_none(self):
+        points = {"High": 3, "Low": None}
+        total = Sum(lambda i: points.get(i.priority, 1), key=lambda i: i.assignee or "Unassigned")
+        for issue in ISSUES:
+            total.add(issue)
+        self.assertEqual(total.result(), [("Ayesha", 6), ("Bilal", 1)])
+
+    def test_key_and_keys_are_exclusive(self):
+        with self.assertRaises(ValueError):
+            Count()
+        with self.assertRaises(ValueError):
+            Count(key=len, keys=list)
+
+    def test_one_pass_feeds_every_aggregate(self):
+        aggregation = Aggregation(
+            people=Count(key=lambda i: i.assignee),
+            statuses=Count(key=lambda i: i.status),
+        )
+        aggregation.add_page(ISSUES[:2])
+        aggregation.add_page(ISSUES[2:])
+        results = aggregation.results()
+        self.assertEqual(aggregation.issues, 5)
+        self.assertEqual(dict(results["people"]), {"Ayesha": 2, "Bilal": 2, None: 1})
+        self.assertEqual(dict(results["statuses"]), {"To Do": 3, "Done": 1, "In Progress": 1})
+
+
+class TestAggregateSearch(unittest.TestCase):
+    def setUp(self):
+        self.client = JiraClient()
+        self.client.token = "test-token"
+        self.queries = []
+        self.fail_at = None
+
+    async def fake_pages(self, jql, fields=None, max_results=None):
+        self.queries.append((jql, max_results))
+        for start in range(0, len(ISSUES), 2):
+            if start == self.fail_at:
+                raise RuntimeError("Jira API Error (503)")
+            yield ISSUES[start:start + 2]
+
+    def aggregate(self, jql, max_results, **aggregates):
+        async def scenario():
+            with patch.object(self.client, "_iter_search_pages", self.fake_pages):
+                return await self.client.aggregate_search(jql, ["assignee"], max_results, **aggregates)
+        return asyncio.run(scenario())
+
+    def test_pages_stream_through_the_aggregates(self):
+        results = self.aggregate("project = SSSS", 100, people=Count(key=lambda i: i.assignee or "Unassigned"))
+        self.assertEqual(results["people"], [("Ayesha", 2), ("Bilal", 2), ("Unassigned", 1)])
+        self.assertEqual(self.queries, [("project = SSSS", 100)])
+
+    def test_projects_are_streamed_in_turn_within_one_cap(self):
+        results = self.aggregate("project = 'SSSS,JI' AND statusCategory != Done", 100, total=Count(key=lambda i: "all"))
+        self.assertEqual(results["total"], [("all", 10)])
+        self.assertEqual(self.queries, [
+            ("project = 'SSSS' AND statusCategory != Done", 100),
+            ("project = 'JI' AND statusCategory != Done", 95),
+        ])
+
+    def test_an_error_part_way_raises_instead_of_returning_partial_counts(self):
+        self.fail_at = 2
+        with self.assertRaises(RuntimeError):
+            self.aggregate("project = SSSS", 100, people=Count(key=lambda i: i.assignee))
+
+
+if __name__ == "__main__":
+    unittest.main()
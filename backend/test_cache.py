@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import cache
+from cache import async_cache
+
+upstream = {"version": 1, "failing": False}
+
+
+@async_cache(ttl=0, tags=("project:{project}",))
+async def project_stats(project: str = "SSSS"):
+    if upstream["failing"]:
+        raise RuntimeError("Jira API Error (503)")
+    return {"project": project, "version": upstream["version"]}
+
+
+class TestStaleOnError(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        upstream.update(version=1, failing=False)
+
+    def test_expired_result_is_served_while_refreshes_fail(self):
+        asyncio.run(project_stats())
+        upstream.update(version=2, failing=True)
+        self.assertEqual(asyncio.run(project_stats()), {"project": "SSSS", "version": 1})
+
+        # The entry is not extended, so the next request tries upstream again
+        upstream["failing"] = False
+        self.assertEqual(asyncio.run(project_stats()), {"project": "SSSS", "version": 2})
+
+    def test_error_is_raised_when_nothing_is_cached(self):
+        upstream["failing"] = True
+        with self.assertRaises(RuntimeError):
+            asyncio.run(project_stats())
+
+
+class TestEviction(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        upstream.update(version=1, failing=False)
+
+    def test_least_recently_refreshed_entries_go_first(self):
+        with patch.object(cache, "CACHE_MAX_ENTRIES", 2):
+            for project in ("A", "B"):
+                asyncio.run(project_stats.refresh(project))
+            asyncio.run(project_stats.refresh("A"))
+            asyncio.run(project_stats.refresh("C"))
+
+        self.assertEqual(set(cache._cache), {project_stats.cache_key("A"), project_stats.cache_key("C")})
+        # An evicted entry leaves no tag behind for invalidate() or refresh_tags() to find
+        self.assertNotIn("project:B", cache._tag_index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import cache
+import main
+from cache import async_cache
+
+version = {"n": 1}
+
+
+@async_cache(ttl=600, tags=("project:{project}", "sprint:{sprint_id}"))
+async def tagged_progress(project: str = "SSSS,JI", sprint_id: int = None):
+    return {"project": project, "sprint_id": sprint_id, "version": version["n"]}
+
+
+@async_cache(ttl=600, tags=("board:{board_ids}",))
+async def tagged_timeline(board_ids: str = "50,140"):
+    return {"boards": board_ids, "version": version["n"]}
+
+
+class TestCacheTags(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        version["n"] = 1
+
+    def fill(self):
+        async def scenario():
+            await tagged_progress()
+            await tagged_progress("SSSS", 1004)
+            await tagged_timeline()
+        asyncio.run(scenario())
+
+    def test_comma_separated_arguments_get_one_tag_each(self):
+        self.fill()
+        self.assertEqual(cache.keys_for_tags(["board:140"]), {tagged_timeline.cache_key()})
+        self.assertEqual(len(cache.keys_for_tags(["project:SSSS"])), 2)
+        self.assertEqual(len(cache.keys_for_tags(["fn:tagged_progress"])), 2)
+
+    def test_invalidate_drops_only_matching_entries(self):
+        self.fill()
+        self.assertEqual(cache.invalidate(["sprint:1004"]), 1)
+
+        self.assertNotIn(tagged_progress.cache_key("SSSS", 1004), cache._cache)
+        self.assertIn(tagged_progress.cache_key(), cache._cache)
+        self.assertIn(tagged_timeline.cache_key(), cache._cache)
+        self.assertEqual(cache.keys_for_tags(["sprint:1004"]), set())
+
+    def test_refresh_rebuilds_entries_in_place(self):
+        self.fill()
+        version["n"] = 2
+        self.assertEqual(asyncio.run(cache.refresh_tags(["board:50"])), (1, 0))
+
+        self.assertEqual(asyncio.run(tagged_timeline())["version"], 2)
+        self.assertEqual(asyncio.run(tagged_progress())["version"], 1)
+
+
+class TestAdminCacheApi(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = TestClient(main.app)
+
+    def test_admin_api_is_disabled_without_a_token(self):
+        with patch.object(main, "ADMIN_API_TOKEN", None):
+            response = self.client.post("/api/admin/cache/invalidate", json={"tags": ["board:50"]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_wrong_token_is_rejected(self):
+        with patch.object(main, "ADMIN_API_TOKEN", "s3cret"):
+            response = self.client.post("/api/admin/cache/invalidate", json={"tags": ["board:50"]},
+                                        headers={"Authorization": "Bearer wrong"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_invalidate_by_tag(self):
+        asyncio.run(tagged_timeline())
+        with patch.object(main, "ADMIN_API_TOKEN", "s3cret"):
+            response = self.client.post("/api/admin/cache/invalidate", json={"tags": ["board:50"]},
+                                        headers={"Authorization": "Bearer s3cret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"invalidated": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
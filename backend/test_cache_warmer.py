@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import admission
+import cache
+import warmer
+from cache import async_cache, cached_functions
+from warmer import CacheWarmer
+
+calls = []
+lanes = []
+
+
+@async_cache(ttl=0.3)
+async def warm_me(project: str = "SSSS,JI", sprint_id: int = None):
+    calls.append((project, sprint_id))
+    lanes.append(admission.current_lane()[0])
+    return len(calls)
+
+
+class TestAsyncCacheKeys(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_defaults_and_explicit_arguments_share_an_entry(self):
+        async def scenario():
+            await warm_me.refresh()
+            return await warm_me(project="SSSS,JI", sprint_id=None)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(calls), 1)
+        self.assertIs(cached_functions["warm_me"], warm_me)
+
+
+class TestCacheWarmer(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        cache.clear()
+
+    def test_entries_are_refreshed_before_they_expire(self):
+        async def scenario():
+            cache_warmer = CacheWarmer(targets=[{"endpoint": "warm_me", "params": {}}], lead=0.1, stagger=0)
+            cache_warmer.start()
+            await asyncio.sleep(0.05)
+            first_expiry = warm_me.expires_at()
+            await asyncio.sleep(0.4)
+            await cache_warmer.stop()
+            return first_expiry
+
+        with patch.object(warmer, "MIN_REFRESH_INTERVAL", 0.01):
+            first_expiry = asyncio.run(scenario())
+
+        self.assertGreater(first_expiry, 0)
+        # Refreshed at start and again ~0.2s later, before the 0.3s TTL ran out
+        self.assertGreaterEqual(len(calls), 2)
+        self.assertGreater(warm_me.expires_at(), first_expiry)
+
+    def test_refreshes_run_in_the_prefetch_lane(self):
+        lanes.clear()
+        asyncio.run(CacheWarmer()._refresh(warm_me, {}))
+        # Below user requests, above webhook refreshes in the background lane
+        self.assertEqual(lanes, ["prefetch"])
+
+    def test_unknown_targets_are_skipped(self):
+        async def scenario():
+            cache_warmer = CacheWarmer(targets=[{"endpoint": "not_cached", "params": {}}])
+            cache_warmer.start()
+            count = len(cache_warmer._tasks)
+            await cache_warmer.stop()
+            return count
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import httpx
+
+import cassette
+
+
+def fake_upstream(request):
+    fake_upstream.calls += 1
+    if request.url.path == "/token":
+        return httpx.Response(200, json={"access_token": "secret", "expires_in": 3600})
+    body = json.loads(request.content) if request.content else {}
+    return httpx.Response(200, json={"path": request.url.path, "jql": body.get("jql")}, headers={"x-request-id": "abc"})
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        fake_upstream.calls = 0
+        self.path = os.path.join(tempfile.mkdtemp(), "upstream.json.gz")
+
+    def client(self, mode):
+        transport = cassette.CassetteTransport(httpx.MockTransport(fake_upstream), mode=mode, path=self.path)
+        return httpx.AsyncClient(transport=transport)
+
+    def test_recorded_responses_replay_without_the_network(self):
+        async def record():
+            async with self.client("record") as client:
+                await client.post("https://site.atlassian.net/rest/api/3/search/jql", json={"jql": "project = SSSS", "maxResults": 100})
+                await client.get("https://sheets.googleapis.com/v4/spreadsheets/abc/values:batchGet", params=[("ranges", "Sheet1"), ("ranges", "Sheet2!A1:G7")])
+
+        async def replay():
+            async with self.client("replay") as client:
+                # Different host and key order still match the recording
+                search = await client.post("http://127.0.0.1:9000/rest/api/3/search/jql", json={"maxResults": 100, "jql": "project = SSSS"})
+                sheet = await client.get("http://127.0.0.1:9000/v4/spreadsheets/abc/values:batchGet", params=[("ranges", "Sheet1"), ("ranges", "Sheet2!A1:G7")])
+                return search.json(), sheet.status_code
+
+        asyncio.run(record())
+        self.assertEqual(fake_upstream.calls, 2)
+
+        search, sheet_status = asyncio.run(replay())
+        self.assertEqual(fake_upstream.calls, 2)
+        self.assertEqual(search, {"path": "/rest/api/3/search/jql", "jql": "project = SSSS"})
+        self.assertEqual(sheet_status, 200)
+
+    def test_unrecorded_request_fails_in_replay(self):
+        async def replay():
+            async with self.client("replay") as client:
+                await client.post("https://site.atlassian.net/rest/api/3/search/jql", json={"jql": "project = JI"})
+
+        with self.assertRaises(cassette.CassetteMiss):
+            asyncio.run(replay())
+        self.assertEqual(fake_upstream.calls, 0)
+
+    def test_tokens_are_redacted_and_only_useful_headers_kept(self):
+        async def record():
+            async with self.client("record") as client:
+                token = await client.post("https://oauth2.googleapis.com/token", data={"assertion": "signed-now"})
+                await client.get("https://site.atlassian.net/rest/api/3/project/SSSS")
+                return token.json()["access_token"]
+
+        self.assertEqual(asyncio.run(record()), "secret")
+
+        entries = cassette.load(self.path)
+        self.assertEqual(json.loads(entries["POST /token"]["text"])["access_token"], "recorded-token")
+        self.assertEqual(entries["GET /rest/api/3/project/SSSS"]["headers"], {"content-type": "application/json"})
+
+
+if __name__ == "__main__":
+    unittest.main()
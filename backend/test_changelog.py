@@ -0,0 +1,253 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+import cache
+import changelog
+import main
+from changelog import ChangelogStore, CHANGELOG_BACKFILL_DAYS
+from issues import Issue, SPRINT_FIELD, timestamp
+from jira_client import JiraClient
+
+SPRINT = {"id": 7, "name": "Sprint 7", "state": "closed",
+          "startDate": "2026-09-01T00:00:00.000Z", "endDate": "2026-09-04T00:00:00.000Z"}
+STATUS = {
+    "todo": {"id": "1", "name": "To Do", "statusCategory": {"name": "To Do"}},
+    "done": {"id": "3", "name": "Done", "statusCategory": {"name": "Done"}},
+}
+
+
+def _issue(key, created, status, sprints, histories=()):
+    return Issue.from_jira({
+        "key": key,
+        "fields": {"created": created, "status": STATUS[status], SPRINT_FIELD: [{"id": s} for s in sprints]},
+        "changelog": {"histories": [
+            {"created": at, "items": [{"field": field, "from": old, "to": new}]} for at, field, old, new in histories
+        ]},
+    })
+
+
+ISSUES = [
+    # In the sprint from the start, done on day 2
+    _issue("SSSS-1", "2026-08-20T10:00:00.000+0000", "done", [7], [
+        ("2026-09-02T15:00:00.000+0000", "status", "1", "3"),
+    ]),
+    # Open throughout
+    _issue("SSSS-2", "2026-08-25T10:00:00.000+0000", "todo", [7]),
+    # Pulled into the sprint on day 1
+    _issue("SSSS-3", "2026-08-25T10:00:00.000+0000", "todo", [7], [
+        ("2026-09-01T09:00:00.000+0000", "Sprint", "", "7"),
+    ]),
+    # Moved out to the next sprint on day 3
+    _issue("SSSS-4", "2026-08-25T10:00:00.000+0000", "todo", [8], [
+        ("2026-09-03T09:00:00.000+0000", "Sprint", "7", "8"),
+    ]),
+    # Never in the sprint
+    _issue("SSSS-5", "2026-08-25T10:00:00.000+0000", "done", [6]),
+]
+
+
+class FakeJira:
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.queries = []
+
+    async def iter_issue_changelogs(self, jql):
+        self.queries.append(jql)
+        for n, page in enumerate(self.pages):
+            if n == self.fail_after:
+                raise RuntimeError("upstream went away")
+            yield page
+
+
+class TestIssueChangelog(unittest.TestCase):
+    def test_status_and_sprint_changes_are_kept_oldest_first(self):
+        issue = _issue("SSSS-9", "2026-08-25T10:00:00.000+0000", "done", [8], [
+            ("2026-09-03T09:00:00.000+0000", "Sprint", "7", "7, 8"),
+            ("2026-09-02T09:00:00.000+0000", "status", "1", "3"),
+        ])
+        self.assertEqual(issue.sprint_ids, (8,))
+        self.assertEqual(issue.changelog, (
+            (timestamp("2026-09-02T09:00:00.000+0000"), "status", "1", "3"),
+            (timestamp("2026-09-03T09:00:00.000+0000"), "sprint", (7,), (7, 8)),
+        ))
+
+    def test_changelog_is_none_unless_expanded(self):
+        self.assertIsNone(Issue.from_jira({"key": "SSSS-1", "fields": {}}).changelog)
+
+    def test_truncated_changelog_is_none(self):
+        history = {"created": "2026-09-02T09:00:00.000+0000", "items": [{"field": "status", "from": "1", "to": "3"}]}
+        issue = Issue.from_jira({"key": "SSSS-1", "fields": {}, "changelog": {"total": 101, "histories": [history] * 100}})
+        self.assertIsNone(issue.changelog)
+
+
+class TestIssueChangelogFetch(unittest.TestCase):
+    """A search embeds at most 100 histories; the rest come from the issue's changelog API"""
+
+    def setUp(self):
+        self.client = JiraClient()
+        self.client.token = "test-token"
+        self.client.auth = ("dashboard@example.com", "test-token")
+        self.client.base_url = "https://jira.test/rest/api/2"
+        self.histories = [
+            {"created": f"2026-09-01T{n // 60:02d}:{n % 60:02d}:00.000+0000",
+             "items": [{"field": "status", "from": str(n), "to": str(n + 1)}]}
+            for n in range(150)
+        ]
+        self.requests = []
+
+    def handler(self, request):
+        self.requests.append(request.url.path)
+        start = int(request.url.params["startAt"])
+        values = self.histories[start:start + 100]
+        return httpx.Response(200, json={"startAt": start, "total": len(self.histories),
+                                         "isLast": start + len(values) >= len(self.histories), "values": values})
+
+    @asynccontextmanager
+    async def mock_client(self):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(self.handler)) as client:
+            yield client
+
+    async def search_pages(self, jql, fields=None, max_results=None, expand=None):
+        yield [
+            Issue.from_jira({"key": "SSSS-1", "fields": {}, "changelog": {"total": 150, "histories": self.histories[:100]}}),
+            Issue.from_jira({"key": "SSSS-2", "fields": {}, "changelog": {"total": 0, "histories": []}}),
+        ]
+
+    def test_only_truncated_changelogs_are_fetched_in_full(self):
+        async def scenario():
+            with patch.object(self.client, "_iter_search_pages", self.search_pages), \
+                    patch.object(self.client, "_client", self.mock_client):
+                return [issue async for page in self.client.iter_issue_changelogs("project = SSSS") for issue in page]
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(self.requests, ["/rest/api/3/issue/SSSS-1/changelog"] * 2)
+        self.assertEqual(len(first.changelog), 150)
+        self.assertEqual(first.changelog[-1][3], "150")
+        self.assertEqual(second.changelog, ())
+
+
+class TestChangelogSync(unittest.TestCase):
+    def test_first_sync_backfills_then_advances_the_cursor(self):
+        store = ChangelogStore(["SSSS", "JI"])
+        jira = FakeJira([ISSUES[:2], ISSUES[2:]])
+        asyncio.run(store.sync(jira))
+
+        self.assertEqual(jira.queries, [f"project in ('SSSS','JI') AND updated >= -{CHANGELOG_BACKFILL_DAYS}d ORDER BY updated ASC"])
+        self.assertEqual(len(store.histories), 5)
+        self.assertEqual(store.status_categories, {"1": "To Do", "3": "Done"})
+        # Ten minutes on, only the last ten minutes (plus overlap) are asked for
+        self.assertEqual(store.sync_jql(store.cursor + 600), "project in ('SSSS','JI') AND updated >= -12m ORDER BY updated ASC")
+
+    def test_a_failed_sync_raises_and_keeps_the_cursor(self):
+        store = ChangelogStore(["SSSS"])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(store.sync(FakeJira([ISSUES[:2], ISSUES[2:]], fail_after=1)))
+        self.assertIsNone(store.cursor)
+        self.assertEqual(len(store.histories), 2)
+
+    def test_recent_sync_is_not_repeated(self):
+        store = ChangelogStore(["SSSS"])
+        jira = FakeJira([ISSUES])
+        asyncio.run(store.sync(jira))
+        asyncio.run(store.sync(jira))
+        self.assertEqual(len(jira.queries), 1)
+
+
+class TestBackgroundSync(unittest.TestCase):
+    def test_backfill_runs_in_the_background(self):
+        store = ChangelogStore(["SSSS"])
+        jira = FakeJira([ISSUES])
+
+        async def scenario():
+            store.start(jira)
+            backfilling = store.backfilling
+            for _ in range(10):
+                await asyncio.sleep(0)
+            synced = store.backfilling
+            await store.stop()
+            return backfilling, synced
+        self.assertEqual(asyncio.run(scenario()), (True, False))
+        self.assertEqual(len(store.histories), 5)
+        self.assertEqual(len(jira.queries), 1)
+
+    def test_failed_backfill_is_retried_by_the_next_round(self):
+        store = ChangelogStore(["SSSS"])
+
+        jira = FakeJira([ISSUES], fail_after=0)
+
+        async def scenario():
+            with patch("changelog.CHANGELOG_SYNC_INTERVAL", 0):
+                store.start(jira)
+                while len(jira.queries) < 1:
+                    await asyncio.sleep(0)
+                jira.fail_after = None  # upstream is back
+                while store.backfilling:
+                    await asyncio.sleep(0)
+            await store.stop()
+        asyncio.run(scenario())
+        self.assertEqual(len(jira.queries), 2)
+        self.assertEqual(len(store.histories), 5)
+
+
+class TestBurndownEndpoint(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_request_during_the_backfill_is_told_to_retry(self):
+        class SprintJira(FakeJira):
+            async def get_sprint(self, sprint_id):
+                return SPRINT
+
+        store = ChangelogStore(["SSSS"])
+        store._task = object()  # a background sync that has not finished
+        with patch.object(main, "get_jira", lambda: SprintJira([ISSUES])), patch.object(changelog, "store", store):
+            response = TestClient(main.app).get("/api/sprint/7/burndown")
+            self.assertEqual((response.status_code, response.headers.get("Retry-After")), (503, "30"))
+
+            store._task = None  # no background sync: the request syncs, here the first time
+            response = TestClient(main.app).get("/api/sprint/7/burndown")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["days"]), 4)
+
+
+class TestBurndown(unittest.TestCase):
+    def setUp(self):
+        self.store = ChangelogStore(["SSSS"])
+        for issue in ISSUES:
+            self.store.add(issue)
+
+    def test_daily_series(self):
+        now = datetime(2026, 10, 1, tzinfo=timezone.utc).timestamp()
+        days = self.store.burndown(SPRINT, now)["days"]
+
+        self.assertEqual(
+            [(d["date"], d["scope"], d["completed"], d["remaining"], d["added"], d["removed"]) for d in days],
+            [
+                ("2026-09-01", 4, 0, 4, 1, 0),
+                ("2026-09-02", 4, 1, 3, 0, 0),
+                ("2026-09-03", 3, 1, 2, 0, 1),
+                ("2026-09-04", 3, 1, 2, 0, 0),
+            ]
+        )
+        # Three issues at the start, down to none at the end
+        self.assertEqual([d["ideal"] for d in days], [2.0, 1.0, 0.0, 0.0])
+
+    def test_active_sprint_stops_at_now(self):
+        now = datetime(2026, 9, 2, 12, tzinfo=timezone.utc).timestamp()
+        days = self.store.burndown(SPRINT, now)["days"]
+        self.assertEqual([d["date"] for d in days], ["2026-09-01", "2026-09-02"])
+        self.assertEqual(days[-1]["completed"], 0)
+
+    def test_future_sprint_has_no_days(self):
+        self.assertEqual(self.store.burndown({"id": 9, "name": "Sprint 9", "state": "future"})["days"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
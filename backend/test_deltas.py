@@ -0,0 +1,111 @@
+import copy
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import cache
+import deltas
+import main
+from deltas import json_patch
+
+TIMELINE = {
+    "total": 42,
+    "timeline": [{"date": f"2025-01-{d:02d}", "count": d} for d in range(1, 31)],
+    "breakdown": {"APP": {"total": 20}, "CLOUD": {"total": 22}},
+}
+
+
+def apply_patch(document, ops):
+    """Minimal RFC 6902 applier for the operations json_patch emits"""
+    document = copy.deepcopy(document)
+    for op in ops:
+        tokens = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        if not tokens:
+            document = op["value"]
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            if op["op"] == "remove":
+                parent.pop(int(last))
+            elif last == "-":
+                parent.append(op["value"])
+            else:
+                parent[int(last)] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return document
+
+
+class TestJsonPatch(unittest.TestCase):
+    def test_one_changed_point_is_one_replace(self):
+        new = copy.deepcopy(TIMELINE)
+        new["timeline"][17]["count"] = 99
+        self.assertEqual(json_patch(TIMELINE, new), [{"op": "replace", "path": "/timeline/17/count", "value": 99}])
+
+    def test_patches_round_trip(self):
+        new = copy.deepcopy(TIMELINE)
+        new["timeline"] = new["timeline"][:25] + [{"date": "2025-02-01", "count": 0}]
+        del new["breakdown"]["CLOUD"]
+        new["breakdown"]["PCS/Edge"] = {"total": 1}
+        new["total"] = None
+        self.assertEqual(apply_patch(TIMELINE, json_patch(TIMELINE, new)), new)
+
+    def test_keys_are_escaped(self):
+        self.assertEqual(json_patch({}, {"a/b~c": 1}), [{"op": "add", "path": "/a~1b~0c", "value": 1}])
+
+
+class TestRespond(unittest.TestCase):
+    def setUp(self):
+        deltas._history.clear()
+
+    def test_clients_get_a_patch_from_a_known_version(self):
+        first = deltas.respond("stats", TIMELINE, "")
+        self.assertEqual(first["document"], TIMELINE)
+
+        new = copy.deepcopy(TIMELINE)
+        new["total"] = 43
+        second = deltas.respond("stats", new, first["version"])
+        self.assertEqual(second["patch"], [{"op": "replace", "path": "/total", "value": 43}])
+        self.assertNotEqual(second["version"], first["version"])
+
+        self.assertEqual(deltas.respond("stats", new, second["version"]), {"version": second["version"], "patch": []})
+
+    def test_unknown_or_evicted_versions_get_the_full_document(self):
+        self.assertIn("document", deltas.respond("stats", TIMELINE, "not-a-version"))
+
+        documents = [dict(TIMELINE, total=n) for n in range(5)]
+        with patch.object(deltas, "DELTA_HISTORY", 3):
+            deltas._history.clear()
+            versions = [deltas.respond("stats", document, "")["version"] for document in documents[:4]]
+        # Storing the fifth version pushes out the second; the first is long gone
+        self.assertIn("document", deltas.respond("stats", documents[4], versions[0]))
+        self.assertIn("document", deltas.respond("stats", documents[4], versions[1]))
+        self.assertIn("patch", deltas.respond("stats", documents[4], versions[2]))
+
+
+class TestDeltaEndpoint(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        deltas._history.clear()
+
+    def test_plain_requests_keep_the_old_shape(self):
+        async def stats(*args):
+            return [{"name": "Ayesha", "In Progress": 2}]
+
+        with patch.object(main.get_jira(), "get_developer_stats", stats):
+            client = TestClient(main.app)
+            self.assertEqual(client.get("/api/dashboard/developer-stats").json(), [{"name": "Ayesha", "In Progress": 2}])
+            envelope = client.get("/api/dashboard/developer-stats", params={"since": ""}).json()
+
+        self.assertEqual(envelope["document"], [{"name": "Ayesha", "In Progress": 2}])
+        self.assertTrue(envelope["version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+import asyncio
+import base64
+import json
+import time
+import unittest
+import urllib.parse
+
+import httpx
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from gsheets_client import GSheetsClient, parse_section_averages
+
+PROGRESS_ROWS = [
+    ["PCS", "", ""],
+    ["Module", "Dev", "QA"],
+    ["Firmware", "80", "60"],
+    ["Average", "80", "60"],
+    ["", "", ""],
+    ["Cloud", "", ""],
+    ["Module", "Dev", "QA"],
+    ["API", "90", "70"],
+    ["Average", "90", "70"],
+    ["", "", ""],
+    ["APP", "", ""],
+    ["Module", "Dev", "QA"],
+    ["Average", "50.5", ""],
+]
+
+COVERAGE_ROWS = [
+    ["Test Type", "PCS", "Cloud", "APP", "", "", ""],
+    ["Unit", "10%", "20%", "30%", "", "QA", "12 days"],
+    ["Integration", "5%", "15%", "25%", "", "APP", "8 days"],
+    ["E2E", "1%", "2%", "3%", "", "PCS", "4 days"],
+]
+
+
+def _make_service_account():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode("utf-8")
+    creds = {
+        "type": "service_account",
+        "client_email": "dashboard@example.iam.gserviceaccount.com",
+        "private_key_id": "key-1",
+        "private_key": pem,
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    return creds, key.public_key()
+
+
+SERVICE_ACCOUNT, PUBLIC_KEY = _make_service_account()
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class FakeGoogleApi:
+    """Local stand-in for the OAuth, Drive and Sheets endpoints, counting each call"""
+
+    def __init__(self):
+        self.token_calls = 0
+        self.lookup_calls = 0
+        self.version_calls = 0
+        self.batch_calls = []
+        self.assertions = []
+        self.modified_time = "2026-01-01T00:00:00.000Z"
+
+    def handler(self, request):
+        url = request.url
+        if url.host == "oauth2.googleapis.com":
+            self.token_calls += 1
+            self.assertions.append(dict(urllib.parse.parse_qsl(request.content.decode()))["assertion"])
+            return httpx.Response(200, json={"access_token": f"token-{self.token_calls}", "expires_in": 3600})
+
+        if request.headers.get("Authorization") != f"Bearer token-{self.token_calls}":
+            return httpx.Response(401, json={"error": "unauthenticated"})
+
+        if url.path == "/drive/v3/files":
+            self.lookup_calls += 1
+            return httpx.Response(200, json={"files": [{"id": "sheet-1"}]})
+        if url.path == "/drive/v3/files/sheet-1":
+            self.version_calls += 1
+            return httpx.Response(200, json={"modifiedTime": self.modified_time})
+        if url.path == "/v4/spreadsheets/sheet-1/values:batchGet":
+            ranges = url.params.get_list("ranges")
+            self.batch_calls.append(ranges)
+            return httpx.Response(200, json={
+                "spreadsheetId": "sheet-1",
+                "valueRanges": [
+                    {"range": ranges[0], "values": PROGRESS_ROWS},
+                    # The Sheets API trims trailing empty cells
+                    {"range": ranges[1], "values": [row[:4] if i == 0 else row for i, row in enumerate(COVERAGE_ROWS)]},
+                ]
+            })
+        return httpx.Response(404)
+
+
+def make_client():
+    api = FakeGoogleApi()
+    client = GSheetsClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)))
+    client.creds = dict(SERVICE_ACCOUNT)
+    return client, api
+
+
+class TestSheetSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.client, self.fake = make_client()
+
+    def test_all_sheet_endpoints_share_one_batch_get(self):
+        async def load_dashboard():
+            return await asyncio.gather(
+                self.client.get_sheet_data(),
+                self.client.get_test_coverage(),
+                self.client.get_qa_timeline(),
+            )
+
+        progress, coverage, timeline = asyncio.run(load_dashboard())
+
+        self.assertEqual(self.fake.lookup_calls, 1)
+        self.assertEqual(len(self.fake.batch_calls), 1)
+        self.assertEqual(self.fake.batch_calls[0], ["Sheet1", "Sheet2!A1:G7"])
+        self.assertEqual(progress["pcs"], {"development": 80.0, "qa": 60.0})
+        self.assertEqual(progress["app"], {"development": 50.5, "qa": 0.0})
+        self.assertEqual(len(coverage["data"]), 3)
+        self.assertEqual(timeline, {"QA": "12 days", "APP": "8 days", "PCS": "4 days"})
+
+
+class TestChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.client, self.fake = make_client()
+
+    def expire_snapshot(self):
+        self.client._snapshot_at = 0.0
+
+    def test_unchanged_sheet_skips_download_and_parse(self):
+        first = asyncio.run(self.client.get_sheet_data())
+        parsed = self.client._parsed["sections"]
+
+        self.expire_snapshot()
+        second = asyncio.run(self.client.get_sheet_data())
+
+        self.assertEqual(self.fake.version_calls, 2)
+        self.assertEqual(len(self.fake.batch_calls), 1)
+        self.assertIs(self.client._parsed["sections"], parsed)
+        self.assertEqual(first, second)
+
+    def test_modified_sheet_is_downloaded_again(self):
+        asyncio.run(self.client.get_sheet_data())
+
+        self.fake.modified_time = "2026-01-01T09:30:00.000Z"
+        self.expire_snapshot()
+        asyncio.run(self.client.get_sheet_data())
+
+        self.assertEqual(len(self.fake.batch_calls), 2)
+
+    def test_fresh_snapshot_needs_no_version_check(self):
+        asyncio.run(self.client.get_sheet_data())
+        asyncio.run(self.client.get_test_coverage())
+
+        self.assertEqual(self.fake.version_calls, 1)
+
+
+class TestAccessToken(unittest.TestCase):
+    def setUp(self):
+        self.client, self.fake = make_client()
+
+    def test_assertion_is_signed_with_the_service_account_key(self):
+        asyncio.run(self.client._get_access_token())
+
+        header, claims, signature = self.fake.assertions[0].split(".")
+        PUBLIC_KEY.verify(_b64decode(signature), f"{header}.{claims}".encode(), padding.PKCS1v15(), hashes.SHA256())
+        claims = json.loads(_b64decode(claims))
+        self.assertEqual(json.loads(_b64decode(header))["kid"], "key-1")
+        self.assertEqual(claims["iss"], SERVICE_ACCOUNT["client_email"])
+        self.assertEqual(claims["aud"], SERVICE_ACCOUNT["token_uri"])
+
+    def test_token_is_reused_until_close_to_expiry(self):
+        asyncio.run(self.client.get_sheet_data())
+        self.client._snapshot_at = 0.0
+        asyncio.run(self.client.get_sheet_data())
+        self.assertEqual(self.fake.token_calls, 1)
+
+        self.client._token_expiry = time.time() + 30
+        self.client._snapshot_at = 0.0
+        asyncio.run(self.client.get_sheet_data())
+        self.assertEqual(self.fake.token_calls, 2)
+
+    def test_rejected_token_is_refreshed_once(self):
+        asyncio.run(self.client._get_access_token())
+        self.client._token = "revoked"
+
+        result = asyncio.run(self.client.get_sheet_data())
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(self.fake.token_calls, 2)
+
+
+class TestSectionParser(unittest.TestCase):
+    def test_parses_every_section_in_one_pass(self):
+        sections = parse_section_averages(PROGRESS_ROWS)
+        self.assertEqual(sections, {"PCS": (80.0, 60.0), "Cloud": (90.0, 70.0), "APP": (50.5, 0.0)})
+
+    def test_average_row_must_be_inside_the_section(self):
+        rows = [
+            [" PCS ", "", ""],
+            ["Module", "Dev", "QA"],
+            ["", "", ""],
+            ["Average", "99", "99"],
+        ]
+        sections = parse_section_averages(rows)
+        self.assertEqual(sections["PCS"], (0.0, 0.0))
+        self.assertEqual(sections["Cloud"], (0.0, 0.0))
+
+    def test_bad_number_only_zeroes_its_own_section(self):
+        rows = [row[:] for row in PROGRESS_ROWS]
+        rows[3][1] = "n/a"
+        sections = parse_section_averages(rows)
+        self.assertEqual(sections["PCS"], (0.0, 0.0))
+        self.assertEqual(sections["Cloud"], (90.0, 70.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import re
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+import cache
+import main
+from jira_client import JiraClient, adf_to_text
+
+DESCRIPTION = {
+    "type": "doc",
+    "content": [
+        {"type": "paragraph", "content": [{"type": "text", "text": "Inverter "}, {"type": "text", "text": "reboots"}]},
+        {"type": "bulletList", "content": [
+            {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Open app"}]}]},
+            {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Tap sync"}]}]},
+        ]},
+    ],
+}
+
+
+class TestAdfToText(unittest.TestCase):
+    def test_paragraphs_and_list_items_become_lines(self):
+        self.assertEqual(adf_to_text(DESCRIPTION), "Inverter reboots\nOpen app\nTap sync")
+
+    def test_plain_and_missing_descriptions(self):
+        self.assertEqual(adf_to_text("Already plain"), "Already plain")
+        self.assertEqual(adf_to_text(None), "")
+
+
+class TestCachedBatch(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        self.requested = []
+
+    async def fetch(self, keys):
+        self.requested.append(list(keys))
+        return {key: {"key": key, "project": key.split("-")[0]} for key in keys if key != "SSSS-404"}
+
+    def lookup(self, keys):
+        return asyncio.run(cache.cached_batch("details_test", keys, self.fetch, ttl=600,
+                                              tags=lambda key, d: (f"issue:{key}",)))
+
+    def test_only_missing_items_are_fetched_in_one_call(self):
+        self.lookup(["SSSS-1", "SSSS-2"])
+        result = self.lookup(["SSSS-2", "SSSS-3", "SSSS-404"])
+
+        self.assertEqual(self.requested, [["SSSS-1", "SSSS-2"], ["SSSS-3", "SSSS-404"]])
+        self.assertEqual(sorted(result), ["SSSS-2", "SSSS-3"])
+
+    def test_tag_refresh_drops_items_so_they_are_refetched(self):
+        self.lookup(["SSSS-1", "SSSS-2"])
+        self.assertEqual(asyncio.run(cache.refresh_tags(["issue:SSSS-1"])), (0, 0))
+
+        self.lookup(["SSSS-1", "SSSS-2"])
+        self.assertEqual(self.requested[-1], ["SSSS-1"])
+
+
+class TestIssueDetailsEndpoint(unittest.TestCase):
+    def test_malformed_keys_are_rejected_before_reaching_jira(self):
+        response = TestClient(main.app).get("/api/issues/details", params={"keys": "SSSS-1,1) OR (1=1"})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestIssueDetailsSearch(unittest.TestCase):
+    """Jira fails a whole `key in (...)` search if one key does not exist"""
+
+    def setUp(self):
+        self.client = JiraClient()
+        self.client.token = "test-token"
+        self.client.auth = ("dashboard@example.com", "test-token")
+        self.client.base_url = "https://jira.test/rest/api/2"
+        self.existing = {"SSSS-1", "SSSS-2"}
+        self.searches = []
+
+    def handler(self, request):
+        jql = json.loads(request.content)["jql"]
+        keys = re.search(r"key in \(([^)]*)\)", jql).group(1).split(",")
+        self.searches.append(keys)
+        missing = [k for k in keys if k not in self.existing]
+        if missing:
+            return httpx.Response(400, json={"errorMessages": [
+                f"An issue with key '{k}' does not exist for field 'key'." for k in missing]})
+        return httpx.Response(200, json={"isLast": True, "issues": [
+            {"key": k, "fields": {"project": {"key": "SSSS"}, "description": f"About {k}"}} for k in keys]})
+
+    @asynccontextmanager
+    async def mock_client(self):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(self.handler)) as client:
+            yield client
+
+    def details(self, keys):
+        async def scenario():
+            with patch.object(self.client, "_client", self.mock_client):
+                return await self.client.get_issue_details(keys)
+        return asyncio.run(scenario())
+
+    def test_missing_key_does_not_hide_the_others(self):
+        details = self.details(["SSSS-1", "SSSS-404", "SSSS-2"])
+        self.assertEqual(sorted(details), ["SSSS-1", "SSSS-2"])
+        self.assertEqual(details["SSSS-2"]["description"], "About SSSS-2")
+        self.assertEqual(self.searches, [["SSSS-1", "SSSS-404", "SSSS-2"], ["SSSS-1", "SSSS-2"]])
+
+    def test_only_missing_keys_is_an_empty_result(self):
+        self.assertEqual(self.details(["SSSS-404"]), {})
+
+    def test_other_errors_are_raised(self):
+        self.existing = set()
+        self.handler = lambda request: httpx.Response(503, text="Service Unavailable")
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.details(["SSSS-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
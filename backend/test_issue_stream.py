@@ -0,0 +1,61 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import cache
+import main
+
+PAGES = [
+    [{"key": "SSSS-3", "summary": "Three", "status": "To Do"}, {"key": "SSSS-2", "summary": "Two", "status": "Done"}],
+    [{"key": "SSSS-1", "summary": "One", "status": "Done"}],
+]
+
+
+class FakeJira:
+    fail_after_first_page = False
+
+    async def iter_sprint_issues(self, sprint_id):
+        for i, page in enumerate(PAGES):
+            if i and self.fail_after_first_page:
+                raise RuntimeError("Jira went away")
+            yield page
+
+    async def get_sprint_issues_detailed(self, sprint_id):
+        return [issue for page in PAGES for issue in page]
+
+
+class TestIssueStream(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        FakeJira.fail_after_first_page = False
+        self.client = TestClient(main.app)
+
+    def stream(self, **params):
+        with patch.object(main, "get_jira", FakeJira):
+            response = self.client.get("/api/sprint/1004/issues/stream", params=params)
+        return response, [json.loads(line) for line in response.text.splitlines()]
+
+    def test_every_page_becomes_ndjson_lines(self):
+        response, lines = self.stream(fields="key,status")
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(lines, [{"key": "SSSS-3", "status": "To Do"}, {"key": "SSSS-2", "status": "Done"},
+                                 {"key": "SSSS-1", "status": "Done"}])
+
+    def test_fresh_cached_list_is_streamed_without_jira(self):
+        with patch.object(main, "get_jira", FakeJira):
+            self.client.get("/api/sprint/1004/issues")
+        with patch.object(FakeJira, "iter_sprint_issues", side_effect=AssertionError("should use the cache")):
+            _, lines = self.stream()
+        self.assertEqual(len(lines), 3)
+
+    def test_upstream_failure_mid_stream_ends_with_an_error_line(self):
+        FakeJira.fail_after_first_page = True
+        _, lines = self.stream()
+        self.assertEqual([line.get("key") for line in lines[:2]], ["SSSS-3", "SSSS-2"])
+        self.assertIn("error", lines[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from issues import Issue
+
+RAW = {
+    "id": "100001",
+    "self": "https://example.atlassian.net/rest/api/3/issue/100001",
+    "key": "SSSS-2",
+    "fields": {
+        "summary": "Inverter reboots",
+        "issuetype": {"id": "1", "name": "Bug", "iconUrl": "https://example.atlassian.net/bug.svg"},
+        "status": {"id": "3", "name": "In Progress", "statusCategory": {"id": 4, "name": "In Progress"}},
+        "priority": {"id": "2", "name": "High"},
+        "assignee": {"displayName": "Ayesha Khan", "avatarUrls": {"48x48": "https://avatar.example.com/a.png"}},
+        "reporter": None,
+        "project": {"id": "84742", "key": "SSSS", "name": "Sky Smart Solar"},
+        "parent": {"id": "84757", "key": "SSSS-E1"},
+        "created": "2025-03-01T10:00:00.000+0500",
+        "components": [{"name": "Firmware"}, {"name": "API"}],
+        "description": {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Steps"}]}]},
+    },
+}
+
+
+class TestIssue(unittest.TestCase):
+    def test_nested_fields_are_flattened(self):
+        issue = Issue.from_jira(RAW)
+        self.assertEqual(
+            (issue.key, issue.issuetype, issue.status, issue.status_id, issue.status_category, issue.priority),
+            ("SSSS-2", "Bug", "In Progress", "3", "In Progress", "High")
+        )
+        self.assertEqual((issue.assignee, issue.reporter), ("Ayesha Khan", None))
+        self.assertEqual((issue.project_key, issue.project_id, issue.parent_id), ("SSSS", "84742", "84757"))
+        self.assertEqual(issue.components, ("Firmware", "API"))
+        self.assertEqual(issue.description, "Steps")
+
+    def test_fields_not_requested_are_none(self):
+        issue = Issue.from_jira({"key": "SSSS-3", "fields": {"status": {"name": "Done"}}})
+        self.assertEqual(issue.status, "Done")
+        self.assertIsNone(issue.created)
+        self.assertIsNone(issue.components)
+        self.assertIsNone(issue.description)
+
+    def test_repeated_names_share_one_string(self):
+        first = Issue.from_jira(RAW)
+        # Build the second from freshly decoded strings, as a new page would be
+        second = Issue.from_jira({**RAW, "fields": {**RAW["fields"], "status": {"name": "".join(["In ", "Progress"])}}})
+        self.assertIs(first.status, second.status)
+
+    def test_records_have_no_instance_dict(self):
+        self.assertFalse(hasattr(Issue.from_jira(RAW), "__dict__"))
+
+    def test_field_lookup_by_jql_name(self):
+        issue = Issue.from_jira(RAW)
+        self.assertEqual(issue.field("created"), "2025-03-01T10:00:00.000+0500")
+        self.assertEqual(issue.field("issuekey"), "SSSS-2")
+        self.assertIsNone(issue.field("duedate"))
+
+
+if __name__ == "__main__":
+    unittest.main()
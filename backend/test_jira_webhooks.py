@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import admission
+import cache
+import jira_webhooks
+import main
+from cache import async_cache
+from jira_webhooks import WebhookApplier, tags_for_event
+
+ISSUE_MOVED = {
+    "webhookEvent": "jira:issue_updated",
+    "issue": {
+        "key": "SSSS-101",
+        "fields": {
+            "project": {"id": "84742", "key": "SSSS"},
+            "parent": {"id": "84757"},
+            "customfield_10020": [{"id": 1004, "boardId": 50, "state": "active"}],
+        },
+    },
+    "changelog": {"items": [{"field": "Sprint", "from": "1003", "to": "1004"}]},
+}
+
+SPRINT_CLOSED = {
+    "webhookEvent": "sprint_closed",
+    "sprint": {"id": 1004, "originBoardId": 50, "state": "closed"},
+}
+
+version = {"n": 1}
+
+
+@async_cache(ttl=3600, tags=("board:{board_id}",))
+async def hooked_sprints(board_id: int = 50):
+    return version["n"]
+
+
+class TestEventTags(unittest.TestCase):
+    def test_issue_update_touches_project_epic_sprints_and_board(self):
+        self.assertEqual(tags_for_event(ISSUE_MOVED), {
+            "issue:SSSS-101", "project:SSSS", "project:84742", "epic:84757", "sprint:1003", "sprint:1004", "board:50"
+        })
+
+    def test_sprint_close_also_refreshes_current_sprint_views(self):
+        self.assertEqual(tags_for_event(SPRINT_CLOSED), {"sprint:1004", "board:50", "sprint:open"})
+
+    def test_unknown_events_are_ignored(self):
+        self.assertEqual(tags_for_event({"webhookEvent": "comment_created"}), set())
+
+
+class TestWebhookApplier(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        version["n"] = 1
+
+    def test_events_are_batched_into_one_refresh(self):
+        async def scenario():
+            await hooked_sprints()
+            version["n"] = 2
+            applier = WebhookApplier(debounce=3600)
+            applier.handle(SPRINT_CLOSED)
+            applier.handle(ISSUE_MOVED)
+            with patch.object(cache, "refresh_tags", wraps=cache.refresh_tags) as refresh:
+                await applier.flush()
+            return refresh.call_count, await hooked_sprints()
+
+        refreshes, value = asyncio.run(scenario())
+        self.assertEqual(refreshes, 1)
+        self.assertEqual(value, 2)
+
+    def slow_refreshes(self, applied, release, finished=None):
+        async def refresh_tags(tags):
+            applied.append((set(tags), admission.current_lane()[0]))
+            await release.wait()
+            if finished is not None:
+                finished.append(set(tags))
+            return len(tags), 0
+        return patch.object(cache, "refresh_tags", refresh_tags)
+
+    def test_event_during_a_slow_refresh_is_applied_after_it(self):
+        async def scenario():
+            applied, release = [], asyncio.Event()
+            with self.slow_refreshes(applied, release):
+                applier = WebhookApplier(debounce=0.01)
+                applier.add({"sprint:1"})
+                while not applied:
+                    await asyncio.sleep(0.01)
+                applier.add({"sprint:2"})
+                release.set()
+                for _ in range(100):
+                    if len(applied) == 2:
+                        break
+                    await asyncio.sleep(0.01)
+            return applied
+
+        self.assertEqual(asyncio.run(scenario()), [({"sprint:1"}, "background"), ({"sprint:2"}, "background")])
+
+    def test_flush_waits_for_the_running_refresh(self):
+        async def scenario():
+            applied, release, finished = [], asyncio.Event(), []
+            with self.slow_refreshes(applied, release, finished):
+                applier = WebhookApplier(debounce=0.01)
+                applier.add({"sprint:1"})
+                while not applied:
+                    await asyncio.sleep(0.01)
+                applier.add({"sprint:2"})
+                flush = asyncio.create_task(applier.flush())
+                await asyncio.sleep(0.05)
+                # Still waiting for the first refresh rather than cancelling it
+                self.assertFalse(flush.done())
+                release.set()
+                await flush
+            return applied, finished
+
+        applied, finished = asyncio.run(scenario())
+        self.assertEqual(applied, [({"sprint:1"}, "background"), ({"sprint:2"}, "background")])
+        self.assertEqual(finished, [{"sprint:1"}, {"sprint:2"}])
+
+
+class TestWebhookEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.body = json.dumps(SPRINT_CLOSED).encode()
+
+    def post(self, headers=None):
+        with patch.object(main.webhook_applier, "add") as add:
+            response = self.client.post("/webhooks/jira", content=self.body, headers=headers or {})
+        return response, add
+
+    def test_signed_delivery_is_applied(self):
+        signature = "sha256=" + hmac.new(b"hook-secret", self.body, hashlib.sha256).hexdigest()
+        with patch.object(main, "WEBHOOK_SECRET", "hook-secret"), patch.object(jira_webhooks, "WEBHOOK_SECRET", "hook-secret"):
+            response, add = self.post({"X-Hub-Signature": signature})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["tags"], ["board:50", "sprint:1004", "sprint:open"])
+        add.assert_called_once()
+
+    def test_bad_signature_is_rejected(self):
+        with patch.object(main, "WEBHOOK_SECRET", "hook-secret"), patch.object(jira_webhooks, "WEBHOOK_SECRET", "hook-secret"):
+            response, add = self.post({"X-Hub-Signature": "sha256=deadbeef"})
+
+        self.assertEqual(response.status_code, 401)
+        add.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import cache
+import metrics
+from cache import async_cache
+from http_client import upstream_label
+
+failing = {"on": False}
+
+
+@async_cache(ttl=0)
+async def flaky_stats(project: str = "SSSS,JI"):
+    if failing["on"]:
+        raise RuntimeError("Jira is down")
+    return {"project": project}
+
+
+class TestMetricsRendering(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("test_latency_seconds", "Test latency", labels=("route",), buckets=(0.1, 1.0))
+        metrics._registry.remove(histogram)
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+
+        lines = histogram.render()
+        self.assertIn('test_latency_seconds_bucket{route="/a",le="0.1"} 1', lines)
+        self.assertIn('test_latency_seconds_bucket{route="/a",le="1"} 2', lines)
+        self.assertIn('test_latency_seconds_bucket{route="/a",le="+Inf"} 3', lines)
+        self.assertIn('test_latency_seconds_count{route="/a"} 3', lines)
+
+    def test_upstream_paths_are_normalized(self):
+        self.assertEqual(upstream_label("/rest/agile/1.0/board/50/sprint"), ("jira", "/rest/agile/1.0/board/{id}/sprint"))
+        self.assertEqual(upstream_label("/rest/api/3/project/SSSS"), ("jira", "/rest/api/3/project/{key}"))
+        self.assertEqual(upstream_label("/rest/api/3/issue/SSSS-12/changelog"), ("jira", "/rest/api/3/issue/{key}/changelog"))
+        self.assertEqual(upstream_label("/v4/spreadsheets/abc123/values:batchGet"), ("sheets", "/v4/spreadsheets/{id}/values:batchGet"))
+
+
+class TestCacheEvents(unittest.TestCase):
+    def setUp(self):
+        cache._cache.clear()
+        failing["on"] = False
+
+    def events(self, event):
+        return metrics.cache_events.values.get(("flaky_stats", event), 0)
+
+    def test_expired_entry_is_served_when_refresh_fails(self):
+        asyncio.run(flaky_stats())
+        stale_before = self.events("stale")
+
+        failing["on"] = True
+        result = asyncio.run(flaky_stats())
+
+        self.assertEqual(result, {"project": "SSSS,JI"})
+        self.assertEqual(self.events("stale"), stale_before + 1)
+
+    def test_oldest_entries_are_evicted_beyond_the_bound(self):
+        evictions_before = self.events("eviction")
+        with patch.object(cache, "CACHE_MAX_ENTRIES", 2):
+            for project in ("A", "B", "C"):
+                asyncio.run(flaky_stats(project))
+
+        self.assertEqual(len(cache._cache), 2)
+        self.assertEqual(self.events("eviction"), evictions_before + 1)
+        self.assertNotIn(flaky_stats.cache_key("A"), cache._cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import cache
+import main
+from pagination import InvalidPage, paginate
+
+ISSUES = [{"key": f"SSSS-{n}", "summary": f"Issue {n}", "status": "To Do"} for n in range(250, 0, -1)]
+
+
+class TestPaginate(unittest.TestCase):
+    def test_cursors_walk_the_whole_list_once(self):
+        seen, cursor = [], None
+        while True:
+            page = paginate(ISSUES, cursor=cursor, limit=100)
+            seen.extend(issue["key"] for issue in page["issues"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [issue["key"] for issue in ISSUES])
+        self.assertEqual(page["total"], 250)
+
+    def test_cursor_resumes_after_the_last_seen_item_when_the_list_changes(self):
+        first = paginate(ISSUES, limit=10)
+        refreshed = [{"key": "SSSS-251", "summary": "New", "status": "To Do"}] + ISSUES
+        second = paginate(refreshed, cursor=first["next_cursor"], limit=10)
+        self.assertEqual(second["issues"][0]["key"], "SSSS-240")
+
+    def test_fields_limit_the_columns(self):
+        page = paginate(ISSUES, limit=2, fields="key,summary")
+        self.assertEqual(page["issues"], [{"key": "SSSS-250", "summary": "Issue 250"}, {"key": "SSSS-249", "summary": "Issue 249"}])
+
+    def test_bad_cursor_and_limit_are_rejected(self):
+        with self.assertRaises(InvalidPage):
+            paginate(ISSUES, cursor="not-a-cursor")
+        with self.assertRaises(InvalidPage):
+            paginate(ISSUES, limit=0)
+
+
+class FakeJira:
+    async def get_sprint_issues_detailed(self, sprint_id):
+        return ISSUES
+
+    async def get_recent_issues(self, project_id, days=30, board_id=None, issue_type="Bug"):
+        return {"total": len(ISSUES), "issues": ISSUES, "timeline": [{"date": "2026-09-01", "count": len(ISSUES)}]}
+
+
+class TestSprintIssuesEndpoint(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = TestClient(main.app)
+
+    def test_unpaged_request_keeps_the_plain_list_and_its_old_cap(self):
+        with patch.object(main, "get_jira", FakeJira):
+            response = self.client.get("/api/sprint/1004/issues")
+        self.assertEqual([i["key"] for i in response.json()], [i["key"] for i in ISSUES[:100]])
+
+    def test_unpaged_recent_issues_keep_their_old_cap(self):
+        with patch.object(main, "get_jira", FakeJira):
+            body = self.client.get("/api/issues/recent", params={"project_id": 1}).json()
+            paged = self.client.get("/api/issues/recent", params={"project_id": 1, "limit": 300}).json()
+        self.assertEqual(len(body["issues"]), 200)
+        self.assertEqual((body["total"], body["timeline"][0]["count"]), (250, 250))
+        self.assertEqual(len(paged["issues"]), 250)
+
+    def test_paged_request(self):
+        with patch.object(main, "get_jira", FakeJira):
+            response = self.client.get("/api/sprint/1004/issues", params={"limit": 50, "fields": "key"})
+            body = response.json()
+            following = self.client.get("/api/sprint/1004/issues", params={"cursor": body["next_cursor"], "limit": 50})
+        self.assertEqual(body["issues"][0], {"key": "SSSS-250"})
+        self.assertEqual(following.json()["issues"][0]["key"], "SSSS-200")
+
+    def test_invalid_cursor_is_a_client_error(self):
+        with patch.object(main, "get_jira", FakeJira):
+            response = self.client.get("/api/sprint/1004/issues", params={"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
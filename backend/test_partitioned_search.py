@@ -0,0 +1,169 @@
+import re
+import asyncio
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import jira_client
+from aggregate import Count
+from issues import Issue
+from jira_client import JiraClient, _created_lower_bound, _window_jql
+
+TODAY = date.today()
+# Two issues a day over the last 60 days, newest first
+ISSUES = [
+    {"key": f"SSSS-{n}", "fields": {"created": (TODAY - timedelta(days=n // 2)).isoformat()}}
+    for n in range(120)
+]
+
+
+def _in_window(issue, jql):
+    created = date.fromisoformat(issue["fields"]["created"])
+    for op, day in re.findall(r"created\s*(>=|<)\s*'(\d{4}-\d{2}-\d{2})'", jql):
+        bound = date.fromisoformat(day)
+        if (op == ">=" and created < bound) or (op == "<" and created >= bound):
+            return False
+    return True
+
+
+class TestPartitionHelpers(unittest.TestCase):
+    def test_created_lower_bound(self):
+        self.assertEqual(_created_lower_bound("project = SSSS AND created >= '2025-01-31'"), date(2025, 1, 31))
+        self.assertEqual(_created_lower_bound("createdDate >= -30d"), TODAY - timedelta(days=30))
+        self.assertIsNone(_created_lower_bound("project = SSSS"))
+
+    def test_window_jql(self):
+        self.assertEqual(
+            _window_jql("project = SSSS", date(2025, 1, 1), date(2025, 2, 1)),
+            "(project = SSSS) AND created >= '2025-01-01' AND created < '2025-02-01'"
+        )
+        self.assertEqual(_window_jql("project = SSSS", None, None), "(project = SSSS)")
+
+
+def _days_later(days):
+    """A stand-in for jira_client.date whose today() is `days` after the real one"""
+    class LaterDate(date):
+        @classmethod
+        def today(cls):
+            return TODAY + timedelta(days=days)
+    return LaterDate
+
+
+class TestPartitionedSearch(unittest.TestCase):
+    def setUp(self):
+        self.client = JiraClient()
+        self.client.token = "test-token"
+        self.queries = []
+        self.counts = []
+        self.failing = None
+        # Small pages so the 120 test issues are worth partitioning
+        page_size = patch.object(jira_client, "SEARCH_PAGE_SIZE", 5)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+
+    async def fake_count(self, jql):
+        self.counts.append(jql)
+        if self.failing == "count" and len(self.counts) > 1:
+            return None
+        return sum(1 for i in ISSUES if _in_window(i, jql))
+
+    async def fake_search(self, jql, fields=None, max_results=50, raise_errors=False):
+        self.queries.append(jql)
+        if self.failing == "window" and "created <" in jql and raise_errors:
+            raise RuntimeError("Jira API Error (503)")
+        issues = [Issue.from_jira(i) for i in ISSUES if _in_window(i, jql)]
+        return {"issues": issues[:max_results], "total": len(issues)}
+
+    def search(self, jql, max_results, today=None):
+        async def scenario():
+            with patch.object(self.client, "_approximate_count", self.fake_count), \
+                    patch.object(self.client, "_search_jql", self.fake_search), \
+                    patch.object(jira_client, "date", today or date):
+                return await self.client._search_jql_partitioned(jql, ["summary"], max_results)
+        return asyncio.run(scenario())
+
+    def test_windows_cover_every_issue_once(self):
+        result = self.search("project = SSSS AND created >= -60d", max_results=1000)
+
+        self.assertGreater(len(self.queries), 1)
+        self.assertEqual(sorted(i.key for i in result["issues"]), sorted(i["key"] for i in ISSUES))
+        self.assertEqual(result["total"], len(ISSUES))
+
+    def test_newest_first_stops_once_max_results_is_covered(self):
+        result = self.search("project = SSSS AND created >= -60d ORDER BY created DESC", max_results=10)
+
+        self.assertEqual([i.key for i in result["issues"]], [f"SSSS-{n}" for n in range(10)])
+        # Only the newest windows were fetched
+        self.assertLess(len(self.queries), 4)
+
+    def test_without_a_lower_bound_falls_back_to_serial(self):
+        self.search("project = SSSS", max_results=500)
+        self.assertEqual(self.queries, ["project = SSSS"])
+
+    def test_search_that_fits_in_a_few_pages_stays_serial(self):
+        self.search("project = SSSS AND created >= -60d", max_results=30)
+        self.assertEqual(self.queries, ["project = SSSS AND created >= -60d"])
+        self.assertEqual(len(self.counts), 1)
+
+    def test_window_queries_do_not_change_from_one_day_to_the_next(self):
+        jql = f"project = SSSS AND created >= '{(TODAY - timedelta(days=59)).isoformat()}'"
+        # 60 days in 8 partitions is an 8-day grid; pick two days inside one grid cell
+        day = -1 if (TODAY - jira_client.GRID_EPOCH).days % 8 == 7 else 0
+        self.search(jql, max_results=1000, today=_days_later(day))
+        first_day = (sorted(self.queries), sorted(self.counts))
+        self.queries, self.counts = [], []
+        self.search(jql, max_results=1000, today=_days_later(day + 1))
+        self.assertEqual((sorted(self.queries), sorted(self.counts)), first_day)
+        self.assertFalse(any(f"'{(TODAY + timedelta(days=day + 1)).isoformat()}'" in q for q in self.queries))
+
+    def test_failed_window_raises(self):
+        self.failing = "window"
+        with self.assertRaises(RuntimeError):
+            self.search("project = SSSS AND created >= -60d", max_results=1000)
+
+    def test_failed_planning_count_falls_back_to_serial(self):
+        self.failing = "count"
+        result = self.search("project = SSSS AND created >= -60d", max_results=1000)
+        self.assertEqual(self.queries, ["project = SSSS AND created >= -60d"])
+        self.assertEqual(result["total"], len(ISSUES))
+
+
+class TestPartitionedAggregate(unittest.TestCase):
+    setUp = TestPartitionedSearch.setUp
+    fake_count = TestPartitionedSearch.fake_count
+
+    async def fake_pages(self, jql, fields=None, max_results=None):
+        self.queries.append(jql)
+        if self.failing == "window" and "created <" in jql:
+            raise RuntimeError("Jira API Error (503)")
+        issues = [Issue.from_jira(i) for i in ISSUES if _in_window(i, jql)][:max_results]
+        for start in range(0, len(issues), 5):
+            yield issues[start:start + 5]
+
+    def aggregate(self, jql, max_results, **aggregates):
+        async def scenario():
+            with patch.object(self.client, "_approximate_count", self.fake_count), \
+                    patch.object(self.client, "_iter_search_pages", self.fake_pages):
+                return await self.client.aggregate_search(jql, ["created"], max_results, partitioned=True, **aggregates)
+        return asyncio.run(scenario())
+
+    def test_windows_feed_the_aggregates_oldest_first(self):
+        results = self.aggregate("project = SSSS AND created >= -60d", 1000,
+                                 total=Count(key=lambda i: "all"), days=Count(key=lambda i: i.created))
+        self.assertGreater(len(self.queries), 1)
+        self.assertEqual(results["total"], [("all", len(ISSUES))])
+        days = [day for day, _ in results["days"]]
+        self.assertLess(days.index(min(days)), days.index(max(days)))
+
+    def test_failed_window_raises_instead_of_returning_partial_counts(self):
+        self.failing = "window"
+        with self.assertRaises(RuntimeError):
+            self.aggregate("project = SSSS AND created >= -60d", 1000, total=Count(key=lambda i: "all"))
+
+    def test_small_aggregate_streams_serially(self):
+        self.aggregate("project = SSSS AND created >= -60d", 30, total=Count(key=lambda i: "all"))
+        self.assertEqual(self.queries, ["project = SSSS AND created >= -60d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import cache
+from issues import Issue
+from jira_client import JiraClient
+
+ISSUES = {
+    "SSSS": [{"key": "SSSS-3", "fields": {"created": "2025-03-03"}}, {"key": "SSSS-1", "fields": {"created": "2025-01-01"}}],
+    "JI": [{"key": "JI-4", "fields": {"created": "2025-04-04"}}, {"key": "JI-2", "fields": {"created": "2025-02-02"}}],
+}
+
+
+class TestProjectSplit(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+        self.queries = []
+        self.failing = set()
+        self.client = JiraClient()
+
+    async def fake_search(self, jql, fields=None, max_results=50, raise_errors=False):
+        self.queries.append((jql, fields))
+        project = "JI" if "'JI'" in jql else "SSSS"
+        if project in self.failing:
+            raise RuntimeError("Jira API Error (503)")
+        issues = [Issue.from_jira(issue) for issue in ISSUES[project][:max_results]]
+        return {"issues": issues, "total": len(issues)}
+
+    def search(self, jql, fields=None, max_results=50):
+        async def scenario():
+            with patch.object(self.client, "_search_jql", self.fake_search):
+                return await self.client._search_jql_per_project(jql, "project = SSSS,JI", ["SSSS", "JI"], fields, max_results)
+        return asyncio.run(scenario())
+
+    def test_each_project_is_queried_and_results_follow_order_by(self):
+        result = self.search("project = SSSS,JI ORDER BY created DESC", fields=["summary"], max_results=3)
+
+        self.assertEqual(sorted(q for q, _ in self.queries), ["project = 'JI' ORDER BY created DESC", "project = 'SSSS' ORDER BY created DESC"])
+        # The sort field is requested even though the caller only asked for summary
+        self.assertTrue(all(fields == ["summary", "created"] for _, fields in self.queries))
+        self.assertEqual([i.key for i in result["issues"]], ["JI-4", "SSSS-3", "JI-2"])
+        self.assertEqual(result["total"], 3)
+
+    def test_unordered_queries_keep_project_order(self):
+        result = self.search("project = SSSS,JI AND issuetype = Bug")
+        self.assertEqual([i.key for i in result["issues"]], ["SSSS-3", "SSSS-1", "JI-4", "JI-2"])
+
+    def test_short_project_leaves_its_share_to_the_others(self):
+        many = [{"key": f"JI-{n}", "fields": {}} for n in range(10, 0, -1)]
+        with patch.dict(ISSUES, {"SSSS": ISSUES["SSSS"][:1], "JI": many}):
+            result = self.search("project = SSSS,JI AND issuetype = Bug", max_results=6)
+
+        self.assertEqual([i.key for i in result["issues"]], ["SSSS-3", "JI-10", "JI-9", "JI-8", "JI-7", "JI-6"])
+        self.assertEqual(len(self.queries), 3)
+
+    def test_change_in_one_project_refetches_only_that_project(self):
+        self.search("project = SSSS,JI AND issuetype = Bug")
+        cache.invalidate(["project:JI"])
+        self.queries.clear()
+
+        self.search("project = SSSS,JI AND issuetype = Bug")
+        self.assertEqual([q for q, _ in self.queries], ["project = 'JI' AND issuetype = Bug"])
+
+    def test_refresh_does_not_reuse_project_results_from_before_it(self):
+        @cache.async_cache(ttl=60, tags=("sprint:open",))
+        async def open_sprint_bugs():
+            return await self.client._search_jql_per_project(
+                "project = SSSS,JI AND sprint in openSprints()", "project = SSSS,JI", ["SSSS", "JI"], None, 50)
+
+        async def scenario():
+            with patch.object(self.client, "_search_jql", self.fake_search):
+                await open_sprint_bugs()
+                self.queries.clear()
+                await open_sprint_bugs()
+                cached = len(self.queries)
+                await cache.refresh_tags(["sprint:open"])
+                return cached
+        self.assertEqual(asyncio.run(scenario()), 0)
+        self.assertEqual(len(self.queries), 2)
+
+    def test_failed_project_search_raises_and_is_not_cached(self):
+        self.failing.add("JI")
+        with self.assertRaises(RuntimeError):
+            self.search("project = SSSS,JI AND issuetype = Bug")
+
+        self.failing.clear()
+        self.queries.clear()
+        result = self.search("project = SSSS,JI AND issuetype = Bug")
+        self.assertIn("project = 'JI' AND issuetype = Bug", [q for q, _ in self.queries])
+        self.assertEqual(result["total"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
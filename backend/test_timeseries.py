@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import cache
+import timeseries
+from timeseries import Series, TrendStore, HOUR, DAY
+
+T0 = 1_790_000_000 - 1_790_000_000 % DAY  # a UTC midnight
+
+
+class TestSeries(unittest.TestCase):
+    def test_recent_points_are_kept_as_recorded(self):
+        series = Series()
+        for n in range(5):
+            series.append(T0 + n * 60, n)
+        self.assertEqual(series.between(T0 + 60, T0 + 180), [[T0 + 60, 1.0], [T0 + 120, 2.0], [T0 + 180, 3.0]])
+
+    def test_old_points_are_averaged_into_hourly_then_daily_buckets(self):
+        series = Series()
+        # A point every 10 minutes for 60 days
+        for n in range(60 * 144):
+            series.append(T0 + n * 600, n % 6)
+        raw, hourly, daily = series.tiers
+        now = T0 + 60 * DAY
+
+        self.assertGreaterEqual(raw.times[0], now - raw.keep * 1.2)
+        self.assertTrue(all(t % HOUR == 0 for t in hourly.times))
+        self.assertTrue(all(t % DAY == 0 for t in daily.times))
+        # Six points 0..5 per hour average to 2.5, and so do the days made of them
+        self.assertEqual(set(hourly.values), {2.5})
+        self.assertEqual(set(daily.values), {2.5})
+
+        points = series.between(T0, now)
+        times = [t for t, _ in points]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(points[0], [T0, 2.5])
+        # Two days of raw points, a month of hourly ones, daily before that
+        self.assertEqual(len(points), len(raw.times) + len(hourly.times) + len(daily.times))
+        self.assertLess(len(points), 60 * 144 / 5)
+
+    def test_late_points_do_not_go_back_in_time(self):
+        series = Series()
+        series.append(T0 + 100, 1)
+        series.append(T0 + 50, 2)
+        self.assertEqual(series.between(T0, T0 + 200), [[T0 + 100, 1.0], [T0 + 100, 2.0]])
+
+
+class TestTrendStore(unittest.TestCase):
+    def test_read_returns_every_label_of_a_group(self):
+        store = TrendStore()
+        store.record("phases:SSSS:-:-", {"To Do": 4, "Done": 1}, at=T0)
+        store.record("phases:SSSS:-:-", {"To Do": 3, "Done": 2}, at=T0 + 60)
+        self.assertEqual(store.read("phases:SSSS:-:-", T0, T0 + 60), {
+            "To Do": [[T0, 4.0], [T0 + 60, 3.0]],
+            "Done": [[T0, 1.0], [T0 + 60, 2.0]],
+        })
+        self.assertEqual(store.read("phases:JI:-:-", T0, T0 + 60), {})
+
+    def test_least_recently_written_series_are_dropped(self):
+        store = TrendStore(max_series=2)
+        store.record("a", {"x": 1}, at=T0)
+        store.record("b", {"y": 1}, at=T0)
+        store.record("a", {"x": 2}, at=T0 + 1)
+        store.record("c", {"z": 1}, at=T0 + 2)
+        self.assertEqual(sorted(store.groups), ["a", "c"])
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_refresh_records_the_key_metrics(self):
+        store = TrendStore()
+
+        @cache.async_cache(ttl=60)
+        async def get_developer_stats(project: str = "SSSS,JI", sprint_id: int = None):
+            return [{"name": "Ayesha", "To Do": 2, "In QA": 1}, {"name": "Unassigned", "To Do": 4}]
+
+        with patch.object(timeseries, "store", store), patch.object(cache, "_refresh_listeners", [timeseries.record_refresh]):
+            asyncio.run(get_developer_stats.refresh())
+
+        series = store.read("developers:SSSS,JI:-", 0)
+        self.assertEqual({label: points[0][1] for label, points in series.items()}, {"Ayesha": 3.0, "Unassigned": 4.0})
+
+    def test_epic_totals(self):
+        group, values = timeseries.SNAPSHOTS["get_bug_epic_stats"]({}, {
+            "breakdown": {"APP": {"open": 5, "done": 2, "total": 7}},
+        })
+        self.assertEqual((group, values), ("epics", {"APP:open": 5, "APP:done": 2, "APP:total": 7}))
+
+
+if __name__ == "__main__":
+    unittest.main()
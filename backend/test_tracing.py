@@ -0,0 +1,39 @@
+import unittest
+
+import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def test_spans_are_collected_into_server_timing(self):
+        trace, token = tracing.start_trace()
+        try:
+            tracing.record("jira", 41.26, "POST /rest/api/3/search/jql 200")
+            with tracing.span("aggregate", "get_developer_stats"):
+                pass
+        finally:
+            tracing.end_trace(token)
+
+        header = trace.server_timing()
+        self.assertTrue(header.startswith('jira;dur=41.3;desc="POST /rest/api/3/search/jql 200", aggregate;dur='))
+        self.assertIn(", total;dur=", header)
+        self.assertIsNone(tracing.current_trace())
+
+    def test_recording_outside_a_request_is_a_no_op(self):
+        tracing.record("jira", 10.0)
+        with tracing.span("aggregate"):
+            pass
+        self.assertIsNone(tracing.current_trace())
+
+    def test_long_traces_are_truncated(self):
+        trace, token = tracing.start_trace()
+        tracing.end_trace(token)
+        for _ in range(tracing.MAX_HEADER_SPANS + 5):
+            trace.add("jira", 1.0)
+
+        header = trace.server_timing()
+        self.assertEqual(header.count("jira;"), tracing.MAX_HEADER_SPANS)
+        self.assertIn('more;desc="5 more spans"', header)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Every refresh is kept for TRENDS_RAW_HOURS, then averaged into hourly points
+# kept for TRENDS_HOURLY_DAYS, then into daily points kept for TRENDS_DAILY_DAYS
+TRENDS_RAW_HOURS = float(os.getenv("TRENDS_RAW_HOURS", 48))
+TRENDS_HOURLY_DAYS = float(os.getenv("TRENDS_HOURLY_DAYS", 30))
+TRENDS_DAILY_DAYS = float(os.getenv("TRENDS_DAILY_DAYS", 730))
+# Upper bound on series kept; the least recently written are dropped first
+TRENDS_MAX_SERIES = int(os.getenv("TRENDS_MAX_SERIES", 5000))
+# A tier is compacted once its oldest point is this far (as a fraction of its
+# retention) past the cut-off, so the array shift is paid rarely
+COMPACT_SLACK = 0.1
+
+HOUR = 3600
+DAY = 86400
+
+
+class _Tier:
+    """Points of one resolution in parallel arrays, oldest first.
+
+    A tier with a bucket `width` merges points falling in the same bucket
+    into their running mean, stamped with the bucket start.
+    """
+
+    __slots__ = ("width", "keep", "times", "values", "counts")
+
+    def __init__(self, width, keep):
+        self.width = width
+        self.keep = keep
+        self.times = array("d")
+        self.values = array("d")
+        self.counts = array("L")
+
+    def add(self, at, value, count=1):
+        if self.width:
+            at -= at % self.width
+            if self.times and self.times[-1] == at:
+                total = self.counts[-1] + count
+                self.values[-1] += (value - self.values[-1]) * count / total
+                self.counts[-1] = total
+                return
+        self.times.append(at)
+        self.values.append(value)
+        self.counts.append(count)
+
+    def expired(self, now):
+        return bool(self.times) and self.times[0] < now - self.keep * (1 + COMPACT_SLACK)
+
+    def cut(self, before):
+        """Remove and return the (time, value, count) points older than `before`"""
+        end = bisect_left(self.times, before)
+        points = list(zip(self.times[:end], self.values[:end], self.counts[:end]))
+        del self.times[:end], self.values[:end], self.counts[:end]
+        return points
+
+    def between(self, start, end):
+        lo, hi = bisect_left(self.times, start), bisect_right(self.times, end)
+        return [[int(t), v] for t, v in zip(self.times[lo:hi], self.values[lo:hi])]
+
+
+class Series:
+    """Append-only points of one metric, averaged into coarser buckets as they age.
+
+    Tiers cover consecutive, non-overlapping stretches of time (daily for the
+    oldest, raw for the newest), so a range read is a bisect per tier plus
+    a copy of the points in range.
+    """
+
+    __slots__ = ("tiers",)
+
+    def __init__(self):
+        self.tiers = (
+            _Tier(0, TRENDS_RAW_HOURS * HOUR),
+            _Tier(HOUR, TRENDS_HOURLY_DAYS * DAY),
+            _Tier(DAY, TRENDS_DAILY_DAYS * DAY),
+        )
+
+    def append(self, at, value):
+        raw = self.tiers[0]
+        # Append-only: a late point is stamped at the newest time instead of being inserted
+        raw.add(max(at, raw.times[-1]) if raw.times else at, float(value))
+        for tier, coarser in zip(self.tiers, self.tiers[1:] + (None,)):
+            if tier.expired(at):
+                before = at - tier.keep
+                if coarser is not None:
+                    # Cut on a bucket boundary so every coarser bucket is made whole at once
+                    before -= before % coarser.width
+                for t, v, count in tier.cut(before):
+                    if coarser is not None:
+                        coarser.add(t, v, count)
+
+    def between(self, start, end):
+        points = []
+        for tier in reversed(self.tiers):
+            points.extend(tier.between(start, end))
+        return points
+
+
+class TrendStore:
+    """Series grouped by what they measure, e.g. group "phases:SSSS,JI:-:-" with one label per column"""
+
+    def __init__(self, max_series=TRENDS_MAX_SERIES):
+        self.max_series = max_series
+        self.groups = {}  # group -> {label: Series}
+        self._written = {}  # (group, label) -> None, least recently written first
+
+    def record(self, group, values, at=None):
+        """Append one point per label of `values` ({label: number}) to the group's series"""
+        at = time.time() if at is None else at
+        series = self.groups.setdefault(group, {})
+        for label, value in values.items():
+            if value is None:
+                continue
+            if label not in series:
+                series[label] = Series()
+            series[label].append(at, value)
+            self._written.pop((group, label), None)
+            self._written[(group, label)] = None
+        while len(self._written) > self.max_series:
+            old_group, old_label = next(iter(self._written))
+            del self._written[(old_group, old_label)]
+            del self.groups[old_group][old_label]
+            if not self.groups[old_group]:
+                del self.groups[old_group]
+
+    def read(self, group, start, end=None):
+        """{label: [[epoch seconds, value], ...]} for the group's series between start and end"""
+        end = time.time() if end is None else end
+        return {label: series.between(start, end) for label, series in self.groups.get(group, {}).items()}
+
+
+def group_name(*parts):
+    """Group for a metric and the arguments it was computed for, e.g. ("progress", "SSSS,JI", None) -> "progress:SSSS,JI:-" """
+    return ":".join("-" if part is None else str(part) for part in parts)
+
+
+def _progress(arguments, result):
+    return group_name("progress", arguments["project"], arguments["sprint_id"]), {"percent": result}
+
+
+def _phases(arguments, result):
+    group = group_name("phases", arguments["project"], arguments["board_id"], arguments["sprint_id"])
+    return group, {phase["name"]: phase["count"] for phase in result}
+
+
+def _developers(arguments, result):
+    group = group_name("developers", arguments["project"], arguments["sprint_id"])
+    return group, {row["name"]: sum(v for k, v in row.items() if k != "name") for row in result}
+
+
+def _epics(arguments, result):
+    values = {}
+    for squad, stats in (result.get("breakdown") or {}).items():
+        for measure in ("open", "done", "total"):
+            values[f"{squad}:{measure}"] = stats.get(measure)
+    return "epics", values
+
+
+# Cached function name -> snapshot(arguments, result) returning (group, {label: value})
+SNAPSHOTS = {
+    "get_dashboard_progress": _progress,
+    "get_phase_status": _phases,
+    "get_developer_stats": _developers,
+    "get_bug_epic_stats": _epics,
+}
+
+
+def record_refresh(name, arguments, result):
+    """cache.on_refresh listener: snapshot the key metrics from each fresh result"""
+    snapshot = SNAPSHOTS.get(name)
+    if snapshot is None or result is None:
+        return
+    group, values = snapshot(arguments, result)
+    store.record(group, values)
+
+
+store = TrendStore()
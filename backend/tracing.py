@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger("SkyDashboard.Trace")
+
+# Emit a Server-Timing header with the per-request breakdown
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+# Also log every request's trace as one JSON line
+TRACE_LOG_ENABLED = os.getenv("TRACE_LOG_ENABLED", "false").lower() == "true"
+# Keep the header small; a 20-page Jira search should not produce a 4KB header
+MAX_HEADER_SPANS = int(os.getenv("SERVER_TIMING_MAX_SPANS", 40))
+
+_current = contextvars.ContextVar("skydash_trace", default=None)
+
+
+class Trace:
+    """Spans recorded while serving one request.
+
+    Tasks spawned by the request (asyncio.gather fan-outs) inherit the context
+    and append to the same Trace.
+    """
+
+    __slots__ = ("started", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []  # (name, duration_ms, description)
+
+    def add(self, name, duration_ms, description=""):
+        self.spans.append((name, duration_ms, description))
+
+    def server_timing(self):
+        entries = []
+        for name, duration_ms, description in self.spans[:MAX_HEADER_SPANS]:
+            entry = f"{name};dur={duration_ms:.1f}"
+            if description:
+                entry += f';desc="{description.replace(chr(34), "")}"'
+            entries.append(entry)
+        dropped = len(self.spans) - MAX_HEADER_SPANS
+        if dropped > 0:
+            entries.append(f'more;desc="{dropped} more spans"')
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self):
+        return {
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "spans": [{"name": n, "duration_ms": round(d, 2), "desc": desc} for n, d, desc in self.spans],
+        }
+
+
+def start_trace():
+    """Begin a trace for the current request; returns (trace, token for end_trace)"""
+    trace = Trace()
+    return trace, _current.set(trace)
+
+
+def end_trace(token):
+    _current.reset(token)
+
+
+def current_trace():
+    return _current.get()
+
+
+def record(name, duration_ms, description=""):
+    """Add a span to the active trace, if any (a no-op outside requests)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, duration_ms, description)
+
+
+@contextmanager
+def span(name, description=""):
+    """Time a block, e.g. an aggregation phase, as a span of the active trace"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - started) * 1000, description)
+
+
+def log_trace(trace, method, path, status):
+    logger.info(json.dumps({"method": method, "path": path, "status": status, **trace.to_dict()}))
@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import asyncio
+import logging
+
+import admission
+from cache import cached_functions
+
+logger = logging.getLogger("SkyDashboard.Warmer")
+
+CACHE_WARM_ENABLED = os.getenv("CACHE_WARM_ENABLED", "true").lower() == "true"
+# Refresh an entry this many seconds before its TTL runs out
+CACHE_WARM_LEAD = float(os.getenv("CACHE_WARM_LEAD", 10))
+# Seconds between the first refresh of consecutive targets, to spread upstream load
+CACHE_WARM_STAGGER = float(os.getenv("CACHE_WARM_STAGGER", 3))
+# Refreshes allowed to run at the same time
+CACHE_WARM_CONCURRENCY = int(os.getenv("CACHE_WARM_CONCURRENCY", 2))
+# Never refresh the same target more often than this
+MIN_REFRESH_INTERVAL = 5.0
+
+# SSSS project ID the frontend uses by default
+DEFAULT_PROJECT_ID = int(os.getenv("CACHE_WARM_PROJECT_ID", 84742))
+
+# What the dashboard requests on a normal load. Parameters left out use the
+# endpoint defaults (project=SSSS,JI, board_ids=50,140, ...).
+DEFAULT_TARGETS = [
+    {"endpoint": "get_project_id", "params": {"project_key": "SSSS"}},
+    {"endpoint": "get_sheet_progress", "params": {}},
+    {"endpoint": "get_test_coverage", "params": {}},
+    {"endpoint": "get_bug_epic_stats", "params": {}},
+    {"endpoint": "get_developer_stats", "params": {}},
+    {"endpoint": "get_sprint_timeline", "params": {}},
+    {"endpoint": "get_dashboard_progress", "params": {}},
+    {"endpoint": "get_phase_status", "params": {}},
+    {"endpoint": "get_board_quality", "params": {"project_id": DEFAULT_PROJECT_ID}},
+    {"endpoint": "get_bug_flow", "params": {"project_id": DEFAULT_PROJECT_ID}},
+]
+
+
+def load_targets():
+    """Targets from CACHE_WARM_TARGETS (a JSON list like DEFAULT_TARGETS), else the defaults"""
+    raw = os.getenv("CACHE_WARM_TARGETS")
+    if not raw:
+        return DEFAULT_TARGETS
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid CACHE_WARM_TARGETS, using defaults: {e}")
+        return DEFAULT_TARGETS
+
+
+class CacheWarmer:
+    """Keeps hot cache entries fresh so user polls do not hit a cold miss"""
+
+    def __init__(self, targets=None, lead=CACHE_WARM_LEAD, stagger=CACHE_WARM_STAGGER, concurrency=CACHE_WARM_CONCURRENCY):
+        self.targets = targets if targets is not None else load_targets()
+        self.lead = lead
+        self.stagger = stagger
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks = []
+
+    def start(self):
+        for i, target in enumerate(self.targets):
+            func = cached_functions.get(target["endpoint"])
+            if func is None:
+                logger.warning(f"Cache warm target {target['endpoint']} is not a cached endpoint, skipping")
+                continue
+            params = target.get("params", {})
+            self._tasks.append(asyncio.create_task(self._keep_warm(func, params, i * self.stagger)))
+        logger.info(f"Cache warmer started for {len(self._tasks)} targets")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _refresh(self, func, params):
+        async with self._semaphore:
+            try:
+                # Ahead of webhook refreshes (background), behind user requests
+                with admission.lane("prefetch", func.__name__):
+                    await func.refresh(**params)
+                return True
+            except Exception as e:
+                logger.error(f"Cache warm failed for {func.__name__} {params}: {e}")
+                return False
+
+    async def _keep_warm(self, func, params, initial_delay):
+        await asyncio.sleep(initial_delay)
+        while True:
+            # A user request may have refreshed the entry meanwhile, so always
+            # schedule from the entry's actual expiry
+            if func.expires_at(**params) - time.time() <= self.lead:
+                if not await self._refresh(func, params):
+                    # Back off instead of hammering a failing upstream
+                    await asyncio.sleep(max(MIN_REFRESH_INTERVAL, min(func.ttl, 60)))
+                    continue
+
+            delay = func.expires_at(**params) - self.lead - time.time()
+            await asyncio.sleep(max(delay, MIN_REFRESH_INTERVAL))
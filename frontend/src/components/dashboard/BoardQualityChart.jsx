@@ -1,33 +1,12 @@
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
-import { useEffect, useState } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { useQuery } from '@/lib/queryCache';
 import { ComposedChart, Bar, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { ShieldCheck, TrendingUp, TrendingDown, Clock, Search, CheckCircle2 } from 'lucide-react';
 
 export function BoardQualityChart({ projectId }) {
-    const [data, setData] = useState([]);
-    const [loading, setLoading] = useState(false);
-
-    const fetchData = (isSilent = false) => {
-        if (!projectId) return;
-        if (!isSilent) setLoading(true);
-        axios.get(`${API_URL}/api/dashboard/board-quality?project_id=${projectId}`)
-            .then(res => {
-                setData(res.data);
-            })
-            .catch(err => {
-                console.error(err);
-                setData([]);
-            })
-            .finally(() => setLoading(false));
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, [projectId]);
+    const { data: quality, loading } = useQuery(projectId ? `${API_URL}/api/dashboard/board-quality?project_id=${projectId}` : null);
+    const data = quality || [];
 
     const CustomTooltip = ({ active, payload, label }) => {
         if (active && payload && payload.length) {
@@ -1,36 +1,16 @@
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
-import { useEffect, useState, useMemo } from 'react';
-import axios from 'axios';
+import { useState, useMemo } from 'react';
 import API_URL from '../../config';
+import { useQuery } from '@/lib/queryCache';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Cell, LabelList } from 'recharts';
 import { GitPullRequest, LayoutDashboard, Users } from 'lucide-react';
 
 export function BugAssignmentFlow({ projectId, projectKey, defaultView = 'flow', hideToggle = false }) {
-    const [rawData, setRawData] = useState([]);
-    const [loading, setLoading] = useState(false);
+    const { data, loading } = useQuery(projectId ? `${API_URL}/api/dashboard/bug-flow?project_id=${projectId}` : null);
+    const rawData = useMemo(() => data || [], [data]);
     const [viewMode, setViewMode] = useState(defaultView); // 'flow' or 'reporter'
 
-    const fetchData = (isSilent = false) => {
-        if (!projectId) return;
-        if (!isSilent) setLoading(true);
-        axios.get(`${API_URL}/api/dashboard/bug-flow?project_id=${projectId}`)
-            .then(res => {
-                setRawData(res.data);
-            })
-            .catch(err => {
-                console.error(err);
-                setRawData([]);
-            })
-            .finally(() => setLoading(false));
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, [projectId]);
-
     const chartData = useMemo(() => {
         if (viewMode === 'flow') {
             return rawData.map(d => ({
@@ -1,7 +1,8 @@
 
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { getWithDelta } from '../../lib/delta';
+import { useQuery } from '../../lib/queryCache';
 import {
     AreaChart,
     Area,
@@ -16,26 +17,12 @@ import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Loader2, AlertCircle, Bug, ChevronDown } from 'lucide-react';
 
 export const BugMetricsChart = () => {
-    const [data, setData] = useState(null);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
+    const { data = null, loading, error: fetchError } = useQuery(`${API_URL}/api/bugs/epic-stats`, { fetcher: getWithDelta });
+    // A failed background refresh keeps showing the last good numbers
+    const error = fetchError && !data ? 'Failed to sync metrics' : null;
     const [isDarkMode, setIsDarkMode] = useState(false);
     const [hoveredCategory, setHoveredCategory] = useState(null);
 
-    const fetchData = async (isSilent = false) => {
-        if (!isSilent) setLoading(true);
-        try {
-            const response = await axios.get(`${API_URL}/api/bugs/epic-stats`);
-            setData(response.data);
-            setError(null);
-        } catch (err) {
-            console.error('Error fetching bug stats:', err);
-            if (!isSilent) setError('Failed to sync metrics');
-        } finally {
-            setLoading(false);
-        }
-    };
-
     useEffect(() => {
         setIsDarkMode(document.documentElement.classList.contains('dark'));
         const observer = new MutationObserver(() => {
@@ -43,13 +30,7 @@ export const BugMetricsChart = () => {
         });
         observer.observe(document.documentElement, { attributes: true, attributeFilter: ['class'] });
 
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-
-        return () => {
-            observer.disconnect();
-            clearInterval(interval);
-        };
+        return () => observer.disconnect();
     }, []);
 
     if (loading && !data) {
@@ -1,29 +1,16 @@
 
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { getWithDelta } from '../../lib/delta';
+import { useQuery } from '../../lib/queryCache';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Loader2, AlertCircle, ShieldCheck } from 'lucide-react';
 
 export const CombinedQualityCard = () => {
-    const [data, setData] = useState(null);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
+    const { data = null, loading, error: fetchError } = useQuery(`${API_URL}/api/bugs/epic-stats`, { fetcher: getWithDelta });
+    const error = fetchError && !data ? 'Failed to sync quality metrics' : null;
     const [isDarkMode, setIsDarkMode] = useState(false);
 
-    const fetchData = async () => {
-        try {
-            const response = await axios.get(`${API_URL}/api/bugs/epic-stats`);
-            setData(response.data);
-            setError(null);
-        } catch (err) {
-            console.error('Error fetching quality stats:', err);
-            setError('Failed to sync quality metrics');
-        } finally {
-            setLoading(false);
-        }
-    };
-
     useEffect(() => {
         setIsDarkMode(document.documentElement.classList.contains('dark'));
         const observer = new MutationObserver(() => {
@@ -31,13 +18,7 @@ export const CombinedQualityCard = () => {
         });
         observer.observe(document.documentElement, { attributes: true, attributeFilter: ['class'] });
 
-        fetchData();
-        const interval = setInterval(fetchData, 60000);
-
-        return () => {
-            observer.disconnect();
-            clearInterval(interval);
-        };
+        return () => observer.disconnect();
     }, []);
 
     if (loading && !data) {
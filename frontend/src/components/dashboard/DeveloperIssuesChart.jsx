@@ -1,36 +1,15 @@
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
-import { useEffect, useState } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { getWithDelta } from '@/lib/delta';
+import { useQuery } from '@/lib/queryCache';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { Users } from 'lucide-react';
 
 export function DeveloperIssuesChart({ project, sprintId }) {
-    const [data, setData] = useState([]);
-    const [loading, setLoading] = useState(false);
-
-    const fetchData = (isSilent = false) => {
-        if (!project) return;
-        if (!isSilent) setLoading(true);
-        let url = `${API_URL}/api/dashboard/developer-stats?project=${project}`;
-        if (sprintId) url += `&sprint_id=${sprintId}`;
-
-        axios.get(url)
-            .then(res => {
-                setData(res.data);
-            })
-            .catch(err => {
-                console.error(err);
-                setData([]);
-            })
-            .finally(() => setLoading(false));
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, [project, sprintId]);
+    let url = project ? `${API_URL}/api/dashboard/developer-stats?project=${project}` : null;
+    if (url && sprintId) url += `&sprint_id=${sprintId}`;
+    const { data: stats, loading } = useQuery(url, { fetcher: getWithDelta });
+    const data = stats || [];
 
     // Extract unique status names for Bar elements
     const statuses = Array.from(new Set(data.flatMap(d => Object.keys(d).filter(k => k !== 'name'))));
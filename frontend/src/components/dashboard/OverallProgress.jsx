@@ -1,7 +1,7 @@
 
 import { useEffect, useState } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { useQuery } from '../../lib/queryCache';
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip } from 'recharts';
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Loader2, AlertCircle, Target } from 'lucide-react';
@@ -15,9 +15,8 @@ const COLORS = {
 };
 
 export function OverallProgress() {
-    const [stats, setStats] = useState({ dev: 0, qa: 0 });
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
+    // Shares one request and one poll with SheetPieCharts
+    const { data: sheet, loading, error: fetchError } = useQuery(`${API_URL}/api/dashboard/sheet-progress`);
     const [isDarkMode, setIsDarkMode] = useState(false);
 
     useEffect(() => {
@@ -26,38 +25,22 @@ export function OverallProgress() {
             setIsDarkMode(document.documentElement.classList.contains('dark'));
         });
         observer.observe(document.documentElement, { attributes: true, attributeFilter: ['class'] });
+        return () => observer.disconnect();
+    }, []);
 
-        const fetchData = async (isSilent = false) => {
-            if (!isSilent) setLoading(true);
-            try {
-                const response = await axios.get(`${API_URL}/api/dashboard/sheet-progress`);
-                if (response.data.status === 'success') {
-                    const { pcs, cloud, app } = response.data;
-
-                    // Calculate overall averages
-                    const devAvg = (pcs.development + cloud.development + app.development) / 3;
-                    const qaAvg = (pcs.qa + cloud.qa + app.qa) / 3;
-
-                    setStats({ dev: devAvg, qa: qaAvg });
-                    setError(null);
-                } else {
-                    setError(response.data.error || 'Failed to fetch sheet data');
-                }
-            } catch (err) {
-                console.error('Error fetching sheet data for compliance:', err);
-                if (!isSilent) setError('Connection error');
-            } finally {
-                setLoading(false);
-            }
-        };
+    let stats = { dev: 0, qa: 0 };
+    let error = fetchError && !sheet ? 'Connection error' : null;
+    if (sheet?.status === 'success') {
+        const { pcs, cloud, app } = sheet;
 
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => {
-            observer.disconnect();
-            clearInterval(interval);
+        // Calculate overall averages
+        stats = {
+            dev: (pcs.development + cloud.development + app.development) / 3,
+            qa: (pcs.qa + cloud.qa + app.qa) / 3
         };
-    }, []);
+    } else if (sheet) {
+        error = sheet.error || 'Failed to fetch sheet data';
+    }
 
     const pendingQa = Math.max(0, stats.dev - stats.qa);
     const remaining = Math.max(0, 100 - stats.dev);
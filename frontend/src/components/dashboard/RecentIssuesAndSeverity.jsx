@@ -1,36 +1,49 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, Fragment } from 'react';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip as RechartsTooltip, ResponsiveContainer, PieChart, Pie, Cell, Legend } from 'recharts';
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Select, SelectItem } from "@/components/ui/select";
 import axios from 'axios';
 import API_URL from '../../config';
-import { Layers, Bug, Calendar, AlertCircle } from 'lucide-react';
+import { Layers, Bug, Calendar, AlertCircle, ChevronDown, ChevronRight } from 'lucide-react';
+
+// Only the columns the table renders; the backend pages the rest with cursors
+const ISSUE_FIELDS = 'key,summary,reporter,priority,created';
+const ISSUE_PAGE_SIZE = 100;
 
 export function RecentIssuesAndSeverity({ projectId, projectKey, boardId, sprintId, compact = false }) {
-    const [issueData, setIssueData] = useState({ total: 0, issues: [], timeline: [] });
+    const [issueData, setIssueData] = useState({ total: 0, issues: [], timeline: [], next_cursor: null });
+    const [loadingMore, setLoadingMore] = useState(false);
     const [severityData, setSeverityData] = useState([]);
     const [loading, setLoading] = useState(false);
     const [timePeriod, setTimePeriod] = useState(30);
     const [issueType, setIssueType] = useState("Bug");
     const [unresolvedOnly, setUnresolvedOnly] = useState(true);
+    // Descriptions are not in the list; they are fetched per issue when a row is expanded
+    const [expandedKey, setExpandedKey] = useState(null);
+    const [details, setDetails] = useState({});
 
     const issueTypes = ["Bug", "Task", "Sub-task", "Story", "Epic"];
 
+    const getIssuesUrl = (cursor) => {
+        let issuesUrl = `${API_URL}/api/issues/recent?project_id=${projectId}&days=${timePeriod}&issue_type=${issueType}`;
+        if (boardId) issuesUrl += `&board_id=${boardId}`;
+        if (sprintId) issuesUrl += `&sprint_id=${sprintId}`;
+        issuesUrl += `&limit=${ISSUE_PAGE_SIZE}&fields=${ISSUE_FIELDS}`;
+        if (cursor) issuesUrl += `&cursor=${encodeURIComponent(cursor)}`;
+        return issuesUrl;
+    };
+
     const fetchData = async (isSilent = false) => {
         if (!projectId) return;
         if (!isSilent) setLoading(true);
         try {
-            // Fetch Recent Issues
-            let issuesUrl = `${API_URL}/api/issues/recent?project_id=${projectId}&days=${timePeriod}&issue_type=${issueType}`;
-            if (boardId) issuesUrl += `&board_id=${boardId}`;
-            if (sprintId) issuesUrl += `&sprint_id=${sprintId}`;
-
-            const issuesRes = await axios.get(issuesUrl);
+            // Fetch Recent Issues (first page)
+            const issuesRes = await axios.get(getIssuesUrl());
             if (issuesRes.data && typeof issuesRes.data === 'object') {
                 setIssueData(issuesRes.data);
             } else {
-                setIssueData({ total: 0, issues: [], timeline: [] });
+                setIssueData({ total: 0, issues: [], timeline: [], next_cursor: null });
             }
 
             // Fetch Severity Stats
@@ -52,12 +65,40 @@ export function RecentIssuesAndSeverity({ projectId, projectKey, boardId, sprint
         }
     };
 
+    const loadMoreIssues = async () => {
+        if (!issueData.next_cursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const res = await axios.get(getIssuesUrl(issueData.next_cursor));
+            setIssueData(prev => ({ ...res.data, issues: [...prev.issues, ...res.data.issues] }));
+        } catch (err) {
+            console.error('Failed to load more issues:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchData();
         const interval = setInterval(() => fetchData(true), 60000);
         return () => clearInterval(interval);
     }, [projectId, boardId, sprintId, timePeriod, issueType, unresolvedOnly]);
 
+    const toggleDetails = async (event, issueKey) => {
+        event.stopPropagation();
+        const expanding = expandedKey !== issueKey;
+        setExpandedKey(expanding ? issueKey : null);
+        if (!expanding || details[issueKey]) return;
+        try {
+            const res = await axios.get(`${API_URL}/api/issues/details?keys=${encodeURIComponent(issueKey)}`);
+            const found = res.data.issues.find(d => d.key === issueKey);
+            setDetails(prev => ({ ...prev, [issueKey]: found || { missing: true } }));
+        } catch (err) {
+            console.error(`Failed to load details for ${issueKey}:`, err);
+            setDetails(prev => ({ ...prev, [issueKey]: { error: true } }));
+        }
+    };
+
     const handleIssueClick = (issueKey) => {
         const domain = 'skyelectric.atlassian.net';
         window.open(`https://${domain}/browse/${issueKey}`, '_blank');
@@ -323,12 +364,24 @@ export function RecentIssuesAndSeverity({ projectId, projectKey, boardId, sprint
                                         </thead>
                                         <tbody className="divide-y dark:divide-slate-800">
                                             {issueData.issues.map((issue) => (
+                                                <Fragment key={issue.key}>
                                                 <tr
-                                                    key={issue.key}
                                                     className="hover:bg-blue-50/30 dark:hover:bg-blue-900/10 cursor-pointer transition-colors group"
                                                     onClick={() => handleIssueClick(issue.key)}
                                                 >
-                                                    <td className="p-3 font-bold text-blue-600 dark:text-blue-400 group-hover:underline">{issue.key}</td>
+                                                    <td className="p-3 font-bold text-blue-600 dark:text-blue-400">
+                                                        <div className="flex items-center gap-1">
+                                                            <button
+                                                                type="button"
+                                                                onClick={(e) => toggleDetails(e, issue.key)}
+                                                                className="text-slate-400 hover:text-blue-600 dark:hover:text-blue-400"
+                                                                aria-label={`Show details of ${issue.key}`}
+                                                            >
+                                                                {expandedKey === issue.key ? <ChevronDown size={14} /> : <ChevronRight size={14} />}
+                                                            </button>
+                                                            <span className="group-hover:underline">{issue.key}</span>
+                                                        </div>
+                                                    </td>
                                                     <td className="p-3 text-black dark:text-white max-w-xs md:max-w-md">
                                                         <p className="font-bold truncate">{issue.summary}</p>
                                                         <p className="text-[10px] text-slate-600 dark:text-slate-500 font-medium truncate mt-0.5">{issue.reporter}</p>
@@ -347,9 +400,39 @@ export function RecentIssuesAndSeverity({ projectId, projectKey, boardId, sprint
                                                         {getRelativeTime(issue.created)}
                                                     </td>
                                                 </tr>
+                                                {expandedKey === issue.key && (
+                                                    <tr className="bg-slate-50/60 dark:bg-slate-900/40">
+                                                        <td colSpan={4} className="p-3 text-[11px] text-slate-700 dark:text-slate-300">
+                                                            {!details[issue.key] ? (
+                                                                <span className="italic text-slate-400">Loading details...</span>
+                                                            ) : details[issue.key].error ? (
+                                                                <span className="italic text-red-500">Could not load details.</span>
+                                                            ) : details[issue.key].missing ? (
+                                                                <span className="italic text-slate-400">This issue no longer exists in Jira.</span>
+                                                            ) : (
+                                                                <div className="space-y-1.5">
+                                                                    <p className="whitespace-pre-line max-h-40 overflow-y-auto">{details[issue.key].description || 'No description.'}</p>
+                                                                    <p className="text-[10px] text-slate-500 dark:text-slate-400 font-medium">
+                                                                        Assignee: {details[issue.key].assignee}
+                                                                        {details[issue.key].components.length > 0 && ` · Components: ${details[issue.key].components.join(', ')}`}
+                                                                        {details[issue.key].labels.length > 0 && ` · Labels: ${details[issue.key].labels.join(', ')}`}
+                                                                    </p>
+                                                                </div>
+                                                            )}
+                                                        </td>
+                                                    </tr>
+                                                )}
+                                                </Fragment>
                                             ))}
                                         </tbody>
                                     </table>
+                                    {issueData.next_cursor && (
+                                        <div className="p-3 text-center border-t border-slate-100 dark:border-slate-800">
+                                            <Button variant="outline" size="sm" onClick={loadMoreIssues} disabled={loadingMore}>
+                                                {loadingMore ? 'Loading...' : `Load more (${issueData.issues.length} of ${issueData.total})`}
+                                            </Button>
+                                        </div>
+                                    )}
                                 </div>
                             </div>
                         ) : (
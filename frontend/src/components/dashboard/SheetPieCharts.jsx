@@ -1,7 +1,7 @@
 
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
 import API_URL from '../../config';
+import { useQuery } from '../../lib/queryCache';
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip, Legend } from 'recharts';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Loader2, AlertCircle, Server, Cloud, Smartphone } from 'lucide-react';
@@ -15,9 +15,8 @@ const COLORS = {
 };
 
 export const SheetPieCharts = () => {
-    const [data, setData] = useState(null);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
+    // Shares one request and one poll with OverallProgress
+    const { data: sheet, loading, error: fetchError } = useQuery(`${API_URL}/api/dashboard/sheet-progress`);
     const [isDarkMode, setIsDarkMode] = useState(false);
 
     useEffect(() => {
@@ -26,33 +25,14 @@ export const SheetPieCharts = () => {
             setIsDarkMode(document.documentElement.classList.contains('dark'));
         });
         observer.observe(document.documentElement, { attributes: true, attributeFilter: ['class'] });
-
-        const fetchData = async (isSilent = false) => {
-            if (!isSilent) setLoading(true);
-            try {
-                const response = await axios.get(`${API_URL}/api/dashboard/sheet-progress`);
-                if (response.data.status === 'success') {
-                    setData(response.data);
-                    setError(null);
-                } else {
-                    setError(response.data.error || 'Failed to fetch sheet data');
-                }
-            } catch (err) {
-                console.error('Error fetching sheet data:', err);
-                if (!isSilent) setError('Connection error');
-            } finally {
-                setLoading(false);
-            }
-        };
-
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => {
-            observer.disconnect();
-            clearInterval(interval);
-        };
+        return () => observer.disconnect();
     }, []);
 
+    const data = sheet?.status === 'success' ? sheet : null;
+    const error = sheet && !data
+        ? sheet.error || 'Failed to fetch sheet data'
+        : fetchError && !sheet ? 'Connection error' : null;
+
     if (loading) {
         return (
             <Card className="h-full flex items-center justify-center bg-white/50 dark:bg-slate-900/50 backdrop-blur-sm border-slate-200 dark:border-slate-800 rounded-3xl">
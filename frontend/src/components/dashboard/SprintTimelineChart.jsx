@@ -1,6 +1,6 @@
-import React, { useEffect, useState } from 'react';
-import axios from 'axios';
+import React, { useMemo } from 'react';
 import API_URL from '../../config';
+import { useQuery } from '@/lib/queryCache';
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import {
     BarChart,
@@ -16,40 +16,21 @@ import { Calendar, Activity, Clock } from 'lucide-react';
 import { motion } from 'framer-motion';
 
 export function SprintTimelineChart() {
-    const [data, setData] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const { data: sprints, loading } = useQuery(`${API_URL}/api/dashboard/sprint-timeline?board_ids=50,140`);
 
-    const fetchData = async (isSilent = false) => {
-        if (!isSilent) setLoading(true);
-        try {
-            const response = await axios.get(`${API_URL}/api/dashboard/sprint-timeline?board_ids=50,140`);
-            const formatted = response.data
-                .map(item => {
-                    const start = new Date(item.startDate).getTime();
-                    const end = new Date(item.endDate).getTime();
-                    return {
-                        ...item,
-                        displayName: `${item.boardName}: ${item.sprintName}`,
-                        duration: [start, end],
-                        start,
-                        end
-                    };
-                })
-                .sort((a, b) => a.start - b.start);
-
-            setData(formatted);
-        } catch (error) {
-            console.error("Error fetching sprint timeline:", error);
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, []);
+    const data = useMemo(() => (sprints || [])
+        .map(item => {
+            const start = new Date(item.startDate).getTime();
+            const end = new Date(item.endDate).getTime();
+            return {
+                ...item,
+                displayName: `${item.boardName}: ${item.sprintName}`,
+                duration: [start, end],
+                start,
+                end
+            };
+        })
+        .sort((a, b) => a.start - b.start), [sprints]);
 
     const getStateColor = (state) => {
         switch (state) {
@@ -1,36 +1,17 @@
 
-import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import React from 'react';
 import API_URL from '../../config';
+import { getWithDelta } from '../../lib/delta';
+import { useQuery } from '../../lib/queryCache';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Loader2, AlertCircle, ShieldCheck, Bug } from 'lucide-react';
 import { motion } from 'framer-motion';
 
 export const SquadQualityCard = ({ squadName, colorClass, icon: Icon = Bug }) => {
-    const [data, setData] = useState(null);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
-
-    const fetchData = async (isSilent = false) => {
-        if (!isSilent) setLoading(true);
-        try {
-            const response = await axios.get(`${API_URL}/api/bugs/epic-stats`);
-            const squadData = response.data.breakdown[squadName.toUpperCase()];
-            setData(squadData);
-            setError(null);
-        } catch (err) {
-            console.error(`Error fetching ${squadName} quality stats:`, err);
-            if (!isSilent) setError('Failed to sync');
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, [squadName]);
+    // Shares one request and one poll with the other epic-stats cards
+    const { data: stats, loading, error: fetchError } = useQuery(`${API_URL}/api/bugs/epic-stats`, { fetcher: getWithDelta });
+    const data = stats?.breakdown?.[squadName.toUpperCase()] ?? null;
+    const error = fetchError && !stats ? 'Failed to sync' : null;
 
     if (loading && !data) {
         return (
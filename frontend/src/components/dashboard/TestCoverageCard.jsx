@@ -1,39 +1,17 @@
 
-import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import React from 'react';
 import API_URL from '../../config';
+import { useQuery } from '../../lib/queryCache';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Loader2, AlertCircle, ClipboardCheck, Activity } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 
 export const TestCoverageCard = () => {
-    const [data, setData] = useState([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState(null);
-
-    const fetchData = async (isSilent = false) => {
-        if (!isSilent) setLoading(true);
-        try {
-            const response = await axios.get(`${API_URL}/api/dashboard/test-coverage`);
-            if (response.data.status === 'success') {
-                setData(response.data.data);
-                setError(null);
-            } else {
-                setError(response.data.error || 'Failed to fetch');
-            }
-        } catch (err) {
-            console.error('Error fetching test coverage:', err);
-            if (!isSilent) setError('Sync failed');
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    useEffect(() => {
-        fetchData();
-        const interval = setInterval(() => fetchData(true), 60000);
-        return () => clearInterval(interval);
-    }, []);
+    const { data: coverage, loading, error: fetchError } = useQuery(`${API_URL}/api/dashboard/test-coverage`);
+    const data = coverage?.status === 'success' ? coverage.data : [];
+    const error = coverage && coverage.status !== 'success'
+        ? coverage.error || 'Failed to fetch'
+        : fetchError && !coverage ? 'Sync failed' : null;
 
     if (loading && data.length === 0) {
         return (
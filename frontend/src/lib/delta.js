@@ -0,0 +1,59 @@
+import axios from 'axios';
+
+// Last document and version seen per URL, shared by every component polling it
+const documents = new Map();
+
+const unescapeToken = (token) => token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+// Apply RFC 6902 add/remove/replace operations; returns a new object and leaves `document` untouched
+export function applyPatch(document, ops) {
+    if (!ops.length) return document;
+    let result = structuredClone(document);
+    for (const op of ops) {
+        const tokens = op.path.split('/').slice(1).map(unescapeToken);
+        if (!tokens.length) {
+            result = op.value;
+            continue;
+        }
+        let parent = result;
+        for (const token of tokens.slice(0, -1)) {
+            parent = parent[Array.isArray(parent) ? Number(token) : token];
+        }
+        const last = tokens[tokens.length - 1];
+        if (Array.isArray(parent)) {
+            if (op.op === 'remove') parent.splice(Number(last), 1);
+            else if (last === '-') parent.push(op.value);
+            else if (op.op === 'add') parent.splice(Number(last), 0, op.value);
+            else parent[Number(last)] = op.value;
+        } else if (op.op === 'remove') {
+            delete parent[last];
+        } else {
+            parent[last] = op.value;
+        }
+    }
+    return result;
+}
+
+// GET a delta-capable endpoint: the server sends a JSON Patch against the version we
+// already hold, or the full document when it no longer has that version
+export async function getWithDelta(url) {
+    const known = documents.get(url);
+    const separator = url.includes('?') ? '&' : '?';
+    const response = await axios.get(`${url}${separator}since=${known ? encodeURIComponent(known.version) : ''}`);
+    const { version, patch, document } = response.data;
+
+    let next;
+    if (document !== undefined) {
+        next = document;
+    } else {
+        try {
+            next = applyPatch(known.document, patch);
+        } catch {
+            // Out of sync with the server: start over from a full document
+            documents.delete(url);
+            return getWithDelta(url);
+        }
+    }
+    documents.set(url, { version, document: next });
+    return next;
+}
@@ -0,0 +1,113 @@
+import { useCallback, useSyncExternalStore } from 'react';
+import axios from 'axios';
+
+// Every mounted query refreshes on the same tick, so a dashboard polls in one burst per minute
+export const POLL_INTERVAL = 60000;
+
+const IDLE = { data: undefined, error: null, loading: false };
+
+// url -> { state, fetcher, promise, listeners, updatedAt }
+const queries = new Map();
+let timer = null;
+
+const defaultFetcher = (url) => axios.get(url).then(res => res.data);
+
+function getQuery(url, fetcher) {
+    let query = queries.get(url);
+    if (!query) {
+        query = {
+            state: { data: undefined, error: null, loading: true },
+            fetcher: fetcher || defaultFetcher,
+            promise: null,
+            listeners: new Set(),
+            updatedAt: 0,
+        };
+        queries.set(url, query);
+    }
+    return query;
+}
+
+function setState(query, changes) {
+    query.state = { ...query.state, ...changes };
+    query.listeners.forEach(listener => listener());
+}
+
+// Fetch a URL once for every component that wants it; concurrent callers share the request
+export function fetchQuery(url, fetcher) {
+    const query = getQuery(url, fetcher);
+    if (!query.promise) {
+        query.promise = query.fetcher(url)
+            .then(data => {
+                query.updatedAt = Date.now();
+                setState(query, { data, error: null, loading: false });
+                return data;
+            })
+            .catch(error => {
+                console.error(`Error fetching ${url}:`, error);
+                // Keep the last good data; components decide whether to show the error
+                setState(query, { error, loading: false });
+                throw error;
+            })
+            .finally(() => {
+                query.promise = null;
+            });
+    }
+    return query.promise;
+}
+
+function refreshMounted(onlyStale = false) {
+    for (const [url, query] of queries) {
+        if (!query.listeners.size) continue;
+        if (onlyStale && Date.now() - query.updatedAt < POLL_INTERVAL) continue;
+        fetchQuery(url).catch(() => {});
+    }
+}
+
+function startPolling() {
+    if (timer === null && !document.hidden) {
+        timer = setInterval(refreshMounted, POLL_INTERVAL);
+    }
+}
+
+function stopPolling() {
+    clearInterval(timer);
+    timer = null;
+}
+
+if (typeof document !== 'undefined') {
+    // Nobody is looking at a hidden tab; catch up once it is visible again
+    document.addEventListener('visibilitychange', () => {
+        if (document.hidden) {
+            stopPolling();
+        } else {
+            refreshMounted(true);
+            startPolling();
+        }
+    });
+}
+
+function subscribe(url, fetcher, listener) {
+    const query = getQuery(url, fetcher);
+    query.listeners.add(listener);
+    if (!query.promise && Date.now() - query.updatedAt >= POLL_INTERVAL) {
+        fetchQuery(url).catch(() => {});
+    }
+    startPolling();
+    return () => {
+        query.listeners.delete(listener);
+        if (![...queries.values()].some(q => q.listeners.size)) stopPolling();
+    };
+}
+
+// Shared, deduplicated, polled data for a URL: { data, error, loading, refetch }.
+// `fetcher(url)` overrides the plain GET, e.g. getWithDelta; a null url waits idle.
+export function useQuery(url, { fetcher } = {}) {
+    const subscribeToUrl = useCallback(
+        listener => (url ? subscribe(url, fetcher, listener) : () => {}),
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+        [url]
+    );
+    const state = useSyncExternalStore(subscribeToUrl, () => (url ? getQuery(url, fetcher).state : IDLE));
+    const refetch = useCallback(() => (url ? fetchQuery(url).catch(() => {}) : undefined), [url]);
+    return { ...state, refetch };
+}